@@ -0,0 +1,31 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import os
+import sys
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithTemplateBundle(build_py):
+    """Build the package and write its precompiled template bundle (templateBundle.json)."""
+
+    def run(self):
+        super().run()
+        if getattr(self, "editable_mode", False):
+            # editable installs use the source tree, which builds its bundle on first use
+            return
+        # the bundle is built from the template sources and then validated
+        # against the installed templates, which have the same content
+        source_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+        sys.path.insert(0, source_dir)
+        try:
+            from cmdpackage.defs.templateBundle import build_template_bundle
+            templates_base = os.path.join(source_dir, "cmdpackage", "templates")
+            bundle_path = os.path.join(os.path.abspath(self.build_lib), "cmdpackage", "templateBundle.json")
+            if not build_template_bundle(templates_base, bundle_path):
+                raise RuntimeError(f"Template bundle could not be written: {bundle_path}")
+        finally:
+            sys.path.remove(source_dir)
+
+
+setup(cmdclass={"build_py": BuildPyWithTemplateBundle})
@@ -0,0 +1,98 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import io
+import os
+import sys
+import time
+import importlib
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+from cmdpackage.defs.logIt import printIt, lable
+
+
+class SelfTestHarness:
+    """
+    Drive a generated package's main() inside the current interpreter.
+
+    Each step imports a fresh copy of the package from its src directory, runs
+    main() with a synthetic argv and stdin and captures stdout, stderr and the
+    exit code. Project modules are purged before every step so commands added
+    or removed by a previous step are picked up, just like a new process would.
+    """
+
+    def __init__(self, project_name: str, project_dir: str = "."):
+        """
+        Initialize the SelfTestHarness for a generated project.
+
+        Args:
+            project_name (str): Name of the generated project
+            project_dir (str): Directory holding the project's src directory
+        """
+        self.project_name = project_name
+        self.src_dir = os.path.abspath(os.path.join(project_dir, "src"))
+        self.timings: dict[str, float] = {}
+
+    def run(self, step: str, argv: list[str], stdin_text: str = "") -> dict:
+        """
+        Run the generated main() once.
+
+        Args:
+            step (str): Step name used for the timing report
+            argv (list): Arguments after the program name
+            stdin_text (str): Text read by input() calls
+
+        Returns:
+            dict: 'stdout', 'stderr', 'returncode' and 'seconds' of the step
+        """
+        saved_argv, saved_stdin, saved_path = sys.argv, sys.stdin, list(sys.path)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        returncode = 0
+        start = time.perf_counter()
+        try:
+            self._purge_project_modules()
+            sys.path.insert(0, self.src_dir)
+            sys.argv = [self.project_name] + argv
+            sys.stdin = io.StringIO(stdin_text)
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    main_module = importlib.import_module(f"{self.project_name}.main")
+                    main_module.main()
+                except SystemExit as e:
+                    if isinstance(e.code, int):
+                        returncode = e.code
+                    elif e.code is not None:
+                        print(e.code, file=sys.stderr)
+                        returncode = 1
+                except Exception:
+                    traceback.print_exc()
+                    returncode = 1
+        finally:
+            sys.argv, sys.stdin, sys.path[:] = saved_argv, saved_stdin, saved_path
+            self._flush_option_store()
+            self._purge_project_modules()
+        seconds = time.perf_counter() - start
+        self.timings[step] = self.timings.get(step, 0.0) + seconds
+        return {
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+            "returncode": returncode,
+            "seconds": seconds
+        }
+
+    def report_timings(self) -> None:
+        """Print the duration of every step run so far."""
+        for step, seconds in self.timings.items():
+            printIt(f"{step}: {seconds:.2f}s", lable.INFO)
+
+    def _flush_option_store(self) -> None:
+        """Write the .cmdrc edits of the step before its modules are dropped."""
+        opt_switches = sys.modules.get(f"{self.project_name}.classes.optSwitches")
+        if opt_switches is not None:
+            opt_switches.optionStore.flush()
+
+    def _purge_project_modules(self) -> None:
+        """Drop the generated package from sys.modules so the next import is fresh."""
+        prefix = f"{self.project_name}."
+        for module_name in [m for m in sys.modules if m == self.project_name or m.startswith(prefix)]:
+            del sys.modules[module_name]
+        importlib.invalidate_caches()
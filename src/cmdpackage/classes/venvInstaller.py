@@ -0,0 +1,119 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import os
+import time
+import subprocess
+from cmdpackage.defs.logIt import printIt, lable
+from cmdpackage.defs.venvCache import VENV_DEPENDENCIES, get_wheelhouse, has_wheelhouse
+
+
+class VenvInstaller:
+    """
+    Install into and run programs from a project virtual environment.
+
+    The environment's interpreter and scripts are invoked directly, so no shell
+    is started and bin/activate is never sourced. Every call is timed and the
+    durations are kept per phase in self.timings.
+    """
+
+    def __init__(self, project_name: str, env_dir: str | None = None):
+        """
+        Initialize the VenvInstaller for a project environment.
+
+        Args:
+            project_name (str): Name of the generated project
+            env_dir (str): Virtual environment directory, defaults to env/<project_name>
+        """
+        self.project_name = project_name
+        self.env_dir = os.path.abspath(env_dir or os.path.join("env", project_name))
+        self.bin_dir = os.path.join(self.env_dir, "bin")
+        self.python = os.path.join(self.bin_dir, "python")
+        self.timings: dict[str, float] = {}
+
+    def exists(self) -> bool:
+        """Return True if the environment has an interpreter."""
+        return os.path.exists(self.python)
+
+    def install(self, requirements: list[str] | None = None) -> subprocess.CompletedProcess:
+        """
+        Install the project in editable mode together with its dependencies.
+
+        Everything is installed by a single pip process so the resolver runs once.
+        The wheelhouse of the virtual environment cache is tried offline first.
+
+        Args:
+            requirements (list): pip requirement arguments, defaults to the
+                project itself plus VENV_DEPENDENCIES
+
+        Returns:
+            CompletedProcess: Result of the last pip run
+        """
+        if requirements is None:
+            requirements = ["-e", "."] + VENV_DEPENDENCIES
+        pip_install = ["-m", "pip", "install", "--quiet", "--disable-pip-version-check"]
+        result = None
+        find_links = has_wheelhouse()
+        if find_links:
+            result = self.run_python(pip_install + ["--no-index", "--find-links", get_wheelhouse()] + requirements,
+                                     phase="install-offline")
+        if result is None or result.returncode != 0:
+            extra = ["--find-links", get_wheelhouse()] if find_links else []
+            result = self.run_python(pip_install + extra + requirements, phase="install")
+        return result
+
+    def verify(self) -> bool:
+        """Return True if the installed project can be imported from the environment."""
+        result = self.run_python(["-c", f"import {self.project_name}.main"], phase="verify")
+        return result.returncode == 0
+
+    def run_python(self, args: list[str], input_text: str | None = None,
+                   phase: str | None = None) -> subprocess.CompletedProcess:
+        """
+        Run the environment's interpreter.
+
+        Args:
+            args (list): Interpreter arguments
+            input_text (str): Text passed on stdin
+            phase (str): Timing name, defaults to the first argument
+
+        Returns:
+            CompletedProcess: Captured result
+        """
+        return self._run([self.python] + args, input_text, phase or " ".join(args[:2]))
+
+    def run_script(self, script: str, args: list[str] | None = None, input_text: str | None = None,
+                   phase: str | None = None) -> subprocess.CompletedProcess:
+        """
+        Run a console script installed in the environment's bin directory.
+
+        Args:
+            script (str): Script name, e.g. the project command
+            args (list): Script arguments
+            input_text (str): Text passed on stdin
+            phase (str): Timing name, defaults to the script and its first argument
+
+        Returns:
+            CompletedProcess: Captured result
+        """
+        args = args or []
+        return self._run([os.path.join(self.bin_dir, script)] + args, input_text,
+                         phase or " ".join([script] + args[:1]))
+
+    def report_timings(self) -> None:
+        """Print the duration of every phase run so far."""
+        for phase, seconds in self.timings.items():
+            printIt(f"{phase}: {seconds:.2f}s", lable.INFO)
+
+    def _run(self, cmd: list[str], input_text: str | None, phase: str) -> subprocess.CompletedProcess:
+        # the same variables bin/activate would export
+        env = os.environ.copy()
+        env["VIRTUAL_ENV"] = self.env_dir
+        env["PATH"] = self.bin_dir + os.pathsep + env.get("PATH", "")
+        env.pop("PYTHONHOME", None)
+        start = time.perf_counter()
+        try:
+            result = subprocess.run(cmd, input=input_text, env=env, capture_output=True, text=True)
+        except OSError as e:
+            result = subprocess.CompletedProcess(cmd, 127, "", str(e))
+        self.timings[phase] = self.timings.get(phase, 0.0) + time.perf_counter() - start
+        return result
@@ -0,0 +1,200 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import os
+import json
+import traceback
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from cmdpackage.classes.writePyProject import WritePyProject
+from cmdpackage.classes.writeCLIPackage import WriteCLIPackage
+from cmdpackage.defs.createzVirtualEnv import createzVirtualEnv
+from cmdpackage.defs.utilities import commitGitRepo, installModules
+from cmdpackage.defs.logIt import printIt, lable
+
+# Per process state shared by every project generated in that process
+_shared_template_sources: dict | None = None
+
+
+class WriteBatchPackages:
+    """
+    Generate several CLI packages in one run from a batch spec file.
+
+    The spec is a JSON list of project field dicts, in the form produced by
+    WritePyProject._collect_project_info (or an object with a "projects" list).
+    Every project is written to a directory named after its "name" field below
+    the current working directory; fields that are left out use their defaults.
+    Template discovery and the git identity lookup happen once and are shared
+    by all projects.
+    """
+
+    def __init__(self, spec_file: str, gen_temp_sync_data_write: bool = False,
+                 processes: int = 1, max_workers: int | None = None, run_tests: bool = False,
+                 use_venv_cache: bool = True):
+        """
+        Initialize the WriteBatchPackages with batch options.
+
+        Args:
+            spec_file (str): Path of the JSON batch spec
+            gen_temp_sync_data_write (bool): Flag to control temp sync data writing
+            processes (int): Worker processes used to generate projects, 1 generates
+                them one after the other in this process
+            max_workers (int): Threads each WriteCLIPackage uses to render and write files
+            run_tests (bool): Run the generated package tests for every project
+            use_venv_cache (bool): Clone project environments from the virtual environment cache
+        """
+        self.spec_file = spec_file
+        self.gen_temp_sync_data_write = gen_temp_sync_data_write
+        self.processes = max(1, processes)
+        self.max_workers = max_workers
+        self.run_tests = run_tests
+        self.use_venv_cache = use_venv_cache
+        self.base_dir = os.getcwd()
+
+    def write_batch_packages(self) -> bool:
+        """
+        Generate every project in the batch spec.
+
+        Returns:
+            bool: True if every project was generated (and tested when requested)
+        """
+        try:
+            projects = self._load_spec()
+        except (OSError, ValueError) as e:
+            printIt(f"Batch spec '{self.spec_file}' could not be read: {e}", lable.ERROR)
+            return False
+        if not projects:
+            printIt(f"Batch spec '{self.spec_file}' contains no projects", lable.WARN)
+            return True
+
+        # Resolve the shared state once in this process
+        template_sources = WriteCLIPackage({}).template_modules
+        username = WritePyProject._get_username()
+
+        jobs = [(proj_fields, self.base_dir, self.gen_temp_sync_data_write,
+                 self.max_workers, self.run_tests, self.use_venv_cache) for proj_fields in projects]
+        if self.processes == 1 or len(jobs) == 1:
+            _init_batch_worker(template_sources, username)
+            results = [_write_batch_package(job) for job in jobs]
+        else:
+            # module objects are not picklable and are not needed to render
+            picklable_sources = {name: source | {'module': None}
+                                 for name, source in template_sources.items()}
+            with ProcessPoolExecutor(max_workers=min(self.processes, len(jobs)),
+                                     initializer=_init_batch_worker,
+                                     initargs=(picklable_sources, username)) as executor:
+                results = list(executor.map(_write_batch_package, jobs))
+
+        return self._report(results)
+
+    def _load_spec(self) -> list[dict]:
+        """
+        Read the project field dicts from the batch spec.
+
+        Returns:
+            list: Project field dicts in spec order
+        """
+        with open(self.spec_file, "r") as rf:
+            spec = json.load(rf)
+        if isinstance(spec, dict):
+            spec = spec.get("projects", [])
+        if not isinstance(spec, list) or not all(isinstance(proj, dict) for proj in spec):
+            raise ValueError("expected a list of project field objects")
+        return spec
+
+    def _report(self, results: list[tuple[str, bool, str]]) -> bool:
+        """
+        Print the per project outcome in spec order.
+
+        Args:
+            results (list): (project name, success, message) per project
+
+        Returns:
+            bool: True if every project succeeded
+        """
+        print(f'\n*** Batch results for {len(results)} projects ***')
+        all_passed = True
+        for proj_name, passed, message in results:
+            if passed:
+                printIt(f"{proj_name}: {message}", lable.PASS)
+            else:
+                printIt(f"{proj_name}: {message}", lable.FAIL)
+                all_passed = False
+        return all_passed
+
+
+def _init_batch_worker(template_sources: dict, username: str) -> None:
+    """Install the template sources and git identity shared by every project."""
+    global _shared_template_sources
+    _shared_template_sources = template_sources
+    WritePyProject._username = username
+
+
+def _write_batch_package(job: tuple) -> tuple[str, bool, str]:
+    """
+    Generate one project of a batch, runs in the calling or a worker process.
+
+    Args:
+        job (tuple): (proj_fields, base_dir, gen_temp_sync_data_write, max_workers, run_tests,
+            use_venv_cache)
+
+    Returns:
+        tuple: (project name, success, message)
+    """
+    proj_fields, base_dir, gen_temp_sync_data_write, max_workers, run_tests, use_venv_cache = job
+    proj_name = str(proj_fields.get('name', ''))
+    if not proj_name:
+        return ('<unnamed>', False, "project has no 'name' field")
+    # the name becomes the project directory below base_dir and the package name
+    if os.sep in proj_name or (os.altsep and os.altsep in proj_name) or not proj_name.isidentifier():
+        return (proj_name, False, "project 'name' must be a Python identifier without path separators")
+
+    target_path = Path(base_dir).joinpath(proj_name)
+    if target_path.is_dir() and any(target_path.iterdir()):
+        return (proj_name, False, "program directory exits and contains files")
+
+    try:
+        os.makedirs(target_path, exist_ok=True)
+        os.chdir(target_path)
+        fields = WritePyProject(proj_fields=proj_fields).write_py_project()
+        cli_package_writer = WriteCLIPackage(fields, gen_temp_sync_data_write, max_workers=max_workers,
+                                             template_sources=_shared_template_sources)
+        cli_package_writer.write_cli_package()
+        createzVirtualEnv(fields, use_cache=use_venv_cache)
+        if fields['git_initialized'] == "True":
+            commitGitRepo("finalize package setup")
+        installModules(proj_name)
+        if run_tests:
+            # imported here as main imports this module
+            from cmdpackage.main import test_generated_package
+            print(f'\n*** Running tests on {proj_name} package ***')
+            if not test_generated_package(proj_name):
+                return (proj_name, False, "some tests failed")
+    except Exception:
+        return (proj_name, False, traceback.format_exc())
+    finally:
+        os.chdir(base_dir)
+
+    return (proj_name, True, f"generated in {target_path}")
+
+
+# Convenience function for backward compatibility
+def writeBatchPackages(spec_file: str, gen_temp_sync_data_write: bool = False, processes: int = 1,
+                       max_workers: int | None = None, run_tests: bool = False,
+                       use_venv_cache: bool = True) -> bool:
+    """
+    Convenience function that creates and uses the WriteBatchPackages class.
+
+    Args:
+        spec_file (str): Path of the JSON batch spec
+        gen_temp_sync_data_write (bool): Flag to control temp sync data writing
+        processes (int): Worker processes used to generate projects
+        max_workers (int): Threads used to render and write files per project
+        run_tests (bool): Run the generated package tests for every project
+        use_venv_cache (bool): Clone project environments from the virtual environment cache
+
+    Returns:
+        bool: True if every project was generated
+    """
+    batch_writer = WriteBatchPackages(spec_file, gen_temp_sync_data_write, processes,
+                                      max_workers, run_tests, use_venv_cache)
+    return batch_writer.write_batch_packages()
@@ -4,10 +4,14 @@ import os
 import json
 import inspect
 import traceback
+from difflib import unified_diff
 from string import Template
 from hashlib import md5
+from concurrent.futures import ThreadPoolExecutor
 from cmdpackage.defs.logIt import printIt, lable
-from cmdpackage.defs.utilities import chkDir, list_files_os_walk, load_template, sanitize_var_name
+from cmdpackage.defs.utilities import chkDir, sanitize_var_name
+from cmdpackage.defs.templateBundle import (read_template_bundle, write_template_bundle, build_template_bundle,
+                                            scan_template_sources, template_placeholders)
 # Note: Template imports are now handled dynamically from the new template structure
 # Old static imports have been replaced with dynamic template discovery
 
@@ -22,21 +26,36 @@ class WriteCLIPackage:
     based on their configuration, supporting various output types (py, md, json).
     """
     
-    def __init__(self, fields: dict, gen_temp_sync_data_write: bool = False):
+    def __init__(self, fields: dict, gen_temp_sync_data_write: bool = False,
+                 max_workers: int | None = None, batch_mkdir: bool = True,
+                 template_sources: dict | None = None, incremental: bool = False):
         """
         Initialize the WriteCLIPackage2 with project configuration.
         
         Args:
             fields (dict): Dictionary containing project configuration fields
             gen_temp_sync_data_write (bool): Flag to control temp sync data writing
+            max_workers (int): Threads used to render and write files, None lets
+                ThreadPoolExecutor choose and 1 keeps everything in the calling thread
+            batch_mkdir (bool): Create all output directories in one pass before writing
+                instead of checking the directory of every file as it is written
+            template_sources (dict): Sources from a previous discovery to reuse, e.g.
+                when generating several packages in one process
+            incremental (bool): Only write files whose rendered content changed, using the
+                fileMD5 values in genTempSyncData.json to detect files edited by hand
         """
         self.fields = fields
         self.gen_temp_sync_data_write = gen_temp_sync_data_write
+        self.max_workers = max_workers
+        self.batch_mkdir = batch_mkdir
+        self.incremental = incremental
         self.program_name = fields.get("name", "")
         self.description = fields.get("description", "")
         self.version = fields.get("version", "1.0.0")
         self.temp_sync_files = {}
         self.temp_sync_files['fields'] = fields
+        # Records of the previous generation, needed to tell generated from edited files
+        self.prev_sync_files = self._read_temp_sync_data() if incremental else {}
         
         # Set up base source directory
         self.src_dir = os.path.join(os.path.abspath("."), 'src', self.program_name)
@@ -45,22 +64,97 @@ class WriteCLIPackage:
         self.repl_strings = self._create_replacement_strings()
         
         # Discover all template modules
-        self.template_modules = self._discover_template_sources()
+        if template_sources is not None:
+            self.template_modules = self._retarget_template_sources(template_sources)
+        else:
+            self.template_modules = self._discover_template_sources()
 
     def write_cli_package(self) -> None:
         """
         Main method to write the complete CLI package structure using templateSources.
+
+        Templates are rendered and written on a thread pool; logging and temp sync
+        tracking happen afterwards in template discovery order so the output and
+        genTempSyncData.json are the same for every run.
+
+        In incremental mode each rendered file is compared with the file on disk and
+        its fileMD5 from the previous run: identical files are not touched, files still
+        matching the previous generation are updated and files edited since then are
+        left alone and reported as conflicts.
         """
 
-        # Process each template source
-        for source_name, source_info in self.template_modules.items():
-            self._process_template_source(source_name, source_info)
+        # Render every template source
+        rendered_files = []
+        for rendered in self._map_ordered(self._render_template_source, self.template_modules.items()):
+            if rendered['error'] is not None:
+                print(f"Error processing {rendered['source_name']}: {rendered['error']}")
+            else:
+                rendered_files.append(rendered)
+
+        # Create the output directory tree in a single pass
+        if self.batch_mkdir:
+            for dir_path in sorted({os.path.dirname(rendered['file_path']) for rendered in rendered_files}):
+                os.makedirs(dir_path, exist_ok=True)
+
+        # Decide which files need writing
+        if self.incremental:
+            statuses = self._map_ordered(self._classify_rendered_file, rendered_files)
+        else:
+            statuses = ['created'] * len(rendered_files)
+        to_write = [rendered for rendered, status in zip(rendered_files, statuses)
+                    if status in ('created', 'updated')]
+
+        # Write the files
+        write_errors = dict(zip((rendered['file_path'] for rendered in to_write),
+                                self._map_ordered(self._write_rendered_file, to_write)))
+
+        summary = {'created': [], 'updated': [], 'unchanged': [], 'conflict': []}
+        for rendered, status in zip(rendered_files, statuses):
+            write_error = write_errors.get(rendered['file_path'])
+            if write_error is not None:
+                print(f"Error processing {rendered['source_name']}: {write_error}")
+                continue
+            summary[status].append(rendered)
+            if status == 'conflict':
+                # Keep the previous record so the file stays flagged until it is resolved
+                prev_record = self.prev_sync_files.get(rendered['file_path'])
+                if prev_record is not None:
+                    self.temp_sync_files[rendered['file_path']] = prev_record
+                printIt(f"{rendered['target_file_path']} has local changes, not overwritten",
+                        lable.WARN)
+                continue
+            # Track for temp sync
+            self._temp_sync_file_json(rendered['template_name'], rendered['template_file'],
+                                      rendered['file_path'], rendered['file_content'])
+            if status == 'created':
+                printIt(rendered['target_file_path'], lable.SAVED)
+            elif status == 'updated':
+                printIt(rendered['target_file_path'], lable.REPLACED)
 
         # Write temp sync data
         self._write_temp_sync_data()
 
+        if self.incremental:
+            self._print_incremental_summary(summary)
+
         print("CLI package generation completed!")
 
+    def _map_ordered(self, func, items) -> list:
+        """
+        Apply func to every item on the writer thread pool, keeping input order.
+        
+        Args:
+            func: Callable taking one item
+            items: Iterable of items
+            
+        Returns:
+            list: Results in the same order as items
+        """
+        if self.max_workers == 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(func, items))
+
     def _create_replacement_strings(self) -> dict:
         """
         Create replacement strings dictionary from fields for template substitution.
@@ -82,85 +176,127 @@ class WriteCLIPackage:
 
     def _discover_template_sources(self) -> dict:
         """
-        Discover all template files from the templates directory structure.
+        Discover all template files, preferring the precompiled template bundle.
+
+        The bundle is a single serialized index written after a full discovery, so a
+        warm run reads one file instead of importing every *_template.py module.
         
         Returns:
             dict: Dictionary mapping template names to their configuration
         """
-        discovered_sources = {}
-        
         # Base templates directory - get cmdpackage directory
         package_dir = os.path.dirname(os.path.dirname(__file__))  # Go up 2 levels from classes/ to cmdpackage/
         templates_base = os.path.join(package_dir, "templates")
-        
+
         if not os.path.exists(templates_base):
             print(f"Warning: Templates directory not found: {templates_base}")
-            return discovered_sources
-
-        # get list of all template files in templates_base and subdirectories
-        template_files = list_files_os_walk(templates_base, extensions=('.py', '.json'))
-
-        template_mappings: dict[str, str] = {}
-        for template_filename in template_files:
-            template_mappings.update(self.get_template_map_entry(template_filename))
-
-        #print(f"Discovered {json.dumps(template_mappings,indent=2)} template mappings.")
-        # "src/vc/defs/logIt.py": "templates/src/defs/logIt_template.py"
-        # Process each template mapping
-        for target_file, template_file_path in template_mappings.items():
-            # Get the cmdpackage directory (templates are now in src/cmdpackage/templates/)
-            package_dir = os.path.dirname(os.path.dirname(__file__))  # Go up 2 levels from classes/ to cmdpackage/
-            full_template_path = os.path.join(package_dir, template_file_path)
-            full_template_path = full_template_path
-
-            module_name = os.path.splitext(template_file_path)
-            module_name = sanitize_var_name(module_name[0].split(os.path.sep)[-1])
+            return {}
+
+        discovered_sources = self._load_template_bundle(templates_base)
+        if discovered_sources is None:
+            discovered_sources = self._scan_template_sources(templates_base)
+            self.build_template_bundle(discovered_sources)
+
+        printIt(f"Discovered {len(discovered_sources)} CLIPackage template sources",lable.INFO)
+
+        return discovered_sources
+
+    def _retarget_template_sources(self, template_sources: dict) -> dict:
+        """
+        Reuse sources discovered for another project, pointing them at this program.
+        
+        Args:
+            template_sources (dict): Sources from another WriteCLIPackage
             
-            if os.path.exists(full_template_path):
-                # Load the template file as a module
-                if os.path.splitext(template_file_path)[1] == '.py':
-                    module = load_template(full_template_path)
-
-                    try:
-                        # Find the template object in the module
-                        template_obj = None
-                        if hasattr(module, module_name):
-                            template_obj = getattr(module, module_name)
-
-                        if LABLE_DEBUG == lable.DEBUG:
-                            printIt(f"target_file: {target_file}, module_name: {module_name}", lable.DEBUG)
-                            
-                        if template_obj is not None:                           
-                            discovered_sources[module_name] = {
-                                'module': module,
-                                'template_obj': template_obj,
-                                'target_file': target_file,
-                                'source_name': module_name
-                            }
-                        else:
-                            print(f"  Warning: No template found in {module_name}")
-                            # Debug: show what attributes are available
-                            available_attrs = [attr for attr in dir(module) if not attr.startswith('_')]
-                            print(f"    Available attributes: {available_attrs}")
-                            
-                    except Exception as e:
-                        print(f"  Error loading template {template_file_path}: {e}")
-                else:
-                    root, ext = os.path.splitext(target_file)
-                    module_name = module_name + "." + ext
-                    with open(full_template_path, "r") as rf:
-                        template_str = rf.read()
-                    discovered_sources[module_name] = {
-                        'module': None,
-                        'template_obj': template_str,
-                        'target_file': target_file,
-                        'source_name': full_template_path
-                    }
+        Returns:
+            dict: Sources with target_file mapped for self.program_name
+        """
+        retargeted_sources = {}
+        for source_name, source_info in template_sources.items():
+            target_file = list(self.get_template_map_entry(source_info['template_file']).keys())[0]
+            retargeted_sources[source_name] = source_info | {'target_file': target_file}
+        return retargeted_sources
+
+    def _load_template_bundle(self, templates_base: str) -> dict | None:
+        """
+        Rebuild the discovered sources from the template bundle.
+        
+        Args:
+            templates_base (str): Absolute path of the templates directory
+            
+        Returns:
+            dict: Discovered sources, or None when the bundle is missing or stale
+        """
+        bundle_sources = read_template_bundle(templates_base)
+        if bundle_sources is None:
+            return None
+
+        package_dir = os.path.dirname(templates_base)
+        discovered_sources = {}
+        for module_name, entry in bundle_sources.items():
+            full_template_path = os.path.join(package_dir, entry['templateFile'])
+            target_file = list(self.get_template_map_entry(full_template_path).keys())[0]
+            if entry['kind'] == 'Template':
+                template_obj = Template(entry['text'])
+                source_name = module_name
             else:
-                print(f"  Warning: Template file not found: {full_template_path}")
+                template_obj = entry['text']
+                source_name = full_template_path
+            discovered_sources[module_name] = {
+                'module': None,
+                'template_obj': template_obj,
+                'target_file': target_file,
+                'source_name': source_name,
+                'template_file': full_template_path,
+                'placeholders': entry['placeholders']
+            }
+        return discovered_sources
+
+    def build_template_bundle(self, discovered_sources: dict) -> bool:
+        """
+        Write the template bundle from discovered sources.
         
-        printIt(f"Discovered {len(discovered_sources)} CLIPackage template sources",lable.INFO)
+        Args:
+            discovered_sources (dict): Sources from _scan_template_sources
+            
+        Returns:
+            bool: True if the bundle was written
+        """
+        package_dir = os.path.dirname(os.path.dirname(__file__))
+        templates_base = os.path.join(package_dir, "templates")
+        return write_template_bundle(templates_base, discovered_sources)
 
+    def _scan_template_sources(self, templates_base: str) -> dict:
+        """
+        Discover all template files by loading every template module.
+        
+        Args:
+            templates_base (str): Absolute path of the templates directory
+            
+        Returns:
+            dict: Dictionary mapping template names to their configuration
+        """
+        discovered_sources = {}
+        for module_name, source in scan_template_sources(templates_base).items():
+            template_obj = source['template_obj']
+            # "src/vc/defs/logIt.py": "templates/src/defs/logIt_template.py"
+            target_file = list(self.get_template_map_entry(source['template_file']).keys())[0]
+            if LABLE_DEBUG == lable.DEBUG:
+                printIt(f"target_file: {target_file}, module_name: {module_name}", lable.DEBUG)
+            if source['module'] is not None:
+                source_name = module_name
+                placeholders = template_placeholders(getattr(template_obj, 'template', ''))
+            else:
+                source_name = source['template_file']
+                placeholders = template_placeholders(template_obj)
+            discovered_sources[module_name] = {
+                'module': source['module'],
+                'template_obj': template_obj,
+                'target_file': target_file,
+                'source_name': source_name,
+                'template_file': source['template_file'],
+                'placeholders': placeholders
+            }
         return discovered_sources
 
     def get_template_map_entry(self, template_filename: str) -> dict[str, str]:
@@ -232,37 +368,36 @@ class WriteCLIPackage:
             final_output_key: relative_template_path
         }
     
-    def _process_template_source(self, source_name: str, source_info: dict) -> None:
+    def _render_template_source(self, source_item: tuple[str, dict]) -> dict:
         """
-        Process a single template source and write its output file.
+        Render a single template source without touching the file system.
         
         Args:
-            source_name (str): Name of the template source
-            source_info (dict): Dictionary containing module, template_obj, target_file, etc.
+            source_item (tuple): (source_name, source_info) where source_info contains
+                template_obj, target_file, template_file, etc.
+            
+        Returns:
+            dict: Rendered file description, 'error' holds the traceback if rendering failed
         """
-        module = source_info['module']
+        source_name, source_info = source_item
         template_obj = source_info['template_obj']
         target_file = source_info['target_file']
         template_name = source_info['source_name']
         
-        # Substitute variables in target file path
-        target_file_path = Template(target_file).substitute(**self.repl_strings)
-        
-        # Resolve target file path (support relative paths)
-        if target_file_path.startswith('./'):
-            file_path = os.path.join(os.path.abspath("."), target_file_path[2:])
-        elif target_file_path.startswith('../'):
-            file_path = os.path.join(os.path.abspath(".."), target_file_path[3:])
-        elif not os.path.isabs(target_file_path):
-            file_path = os.path.join(os.path.abspath("."), target_file_path)
-        else:
-            file_path = target_file_path
-        
-        # Ensure directory exists
-        dir_path = os.path.dirname(file_path)
-        chkDir(dir_path)
-        
         try:
+            # Substitute variables in target file path
+            target_file_path = Template(target_file).substitute(**self.repl_strings)
+            
+            # Resolve target file path (support relative paths)
+            if target_file_path.startswith('./'):
+                file_path = os.path.join(os.path.abspath("."), target_file_path[2:])
+            elif target_file_path.startswith('../'):
+                file_path = os.path.join(os.path.abspath(".."), target_file_path[3:])
+            elif not os.path.isabs(target_file_path):
+                file_path = os.path.join(os.path.abspath("."), target_file_path)
+            else:
+                file_path = target_file_path
+        
             # Process template based on type
             if isinstance(template_obj, Template):
                 # Template object - check if this is a template definition file
@@ -312,24 +447,90 @@ class WriteCLIPackage:
             else:
                 # Other types - convert to string
                 file_content = str(template_obj)
-            
-            # Write file
-            with open(file_path, "w") as wf:
-                wf.write(file_content)
-            
-            # Track for temp sync
-            if module is not None:
-                self._temp_sync_file_json(template_name, module.__file__, file_path, file_content)
-            else:
-               self._temp_sync_file_json(template_name, template_name, file_path, file_content)
 
-            printIt(target_file_path, lable.SAVED)
+            return {
+                'source_name': source_name,
+                'template_name': template_name,
+                'template_file': source_info['template_file'],
+                'target_file_path': target_file_path,
+                'file_path': file_path,
+                'file_content': file_content,
+                'error': None
+            }
             
         except Exception as e:
             tb_str = ''.join(traceback.format_exception(
                 None, e, e.__traceback__))
-            print(f"Error processing {source_name}: {tb_str}")
+            return {'source_name': source_name, 'error': tb_str}
+
+    def _write_rendered_file(self, rendered: dict) -> str | None:
+        """
+        Write one rendered file to disk.
+        
+        Args:
+            rendered (dict): Result of _render_template_source
+            
+        Returns:
+            str: Formatted traceback if the write failed, otherwise None
+        """
+        try:
+            if not self.batch_mkdir:
+                # Ensure directory exists
+                chkDir(os.path.dirname(rendered['file_path']))
+            with open(rendered['file_path'], "w") as wf:
+                wf.write(rendered['file_content'])
+        except Exception as e:
+            return ''.join(traceback.format_exception(None, e, e.__traceback__))
+        return None
     
+    def _classify_rendered_file(self, rendered: dict) -> str:
+        """
+        Compare a rendered file with the disk and the previous generation.
+        
+        Args:
+            rendered (dict): Result of _render_template_source
+            
+        Returns:
+            str: 'created', 'updated', 'unchanged' or 'conflict'
+        """
+        file_path = rendered['file_path']
+        try:
+            with open(file_path, "r") as rf:
+                disk_content = rf.read()
+        except FileNotFoundError:
+            return 'created'
+        rendered['disk_content'] = disk_content
+        if disk_content == rendered['file_content']:
+            return 'unchanged'
+        prev_record = self.prev_sync_files.get(file_path)
+        disk_md5 = md5(disk_content.encode('utf-8')).hexdigest()
+        if prev_record is not None and prev_record.get('fileMD5') == disk_md5:
+            return 'updated'
+        return 'conflict'
+
+    def _print_incremental_summary(self, summary: dict) -> None:
+        """
+        Print the outcome of an incremental run with per file line changes.
+        
+        Args:
+            summary (dict): status -> list of rendered file descriptions
+        """
+        for status in ('updated', 'conflict'):
+            for rendered in summary[status]:
+                added = removed = 0
+                for line in unified_diff(rendered['disk_content'].splitlines(),
+                                         rendered['file_content'].splitlines(), lineterm='', n=0):
+                    if line.startswith('+') and not line.startswith('+++'):
+                        added += 1
+                    elif line.startswith('-') and not line.startswith('---'):
+                        removed += 1
+                print(f"  {status:9} +{added} -{removed} {rendered['target_file_path']}")
+        counts = ', '.join(f"{len(rendered_list)} {status}" for status, rendered_list in summary.items())
+        if summary['conflict']:
+            printIt(f"Incremental generation: {counts}", lable.WARN)
+        else:
+            printIt(f"Incremental generation: {counts}", lable.INFO)
+
     def _is_command_template(self, template_name: str) -> bool:
         """
         Check if a template is a command template that needs special commandJsonDict handling.
@@ -459,9 +660,19 @@ class WriteCLIPackage:
             
         return file_content
     
+    @staticmethod
+    def _read_temp_sync_data() -> dict:
+        """Read the genTempSyncData.json file of a previous run, empty if there is none."""
+        file_name = os.path.join(os.path.abspath("."), "genTempSyncData.json")
+        try:
+            with open(file_name, "r") as rf:
+                return json.load(rf)
+        except (OSError, ValueError):
+            return {}
+
     def _write_temp_sync_data(self) -> None:
         """Write temporary sync data JSON file."""
-        if self.gen_temp_sync_data_write:
+        if self.gen_temp_sync_data_write or self.incremental:
             file_name = os.path.join(os.path.abspath("."), "genTempSyncData.json")
             print(f'Writing temp sync data to {file_name}')
             with open(file_name, "w") as wf:
@@ -477,7 +688,7 @@ class WriteCLIPackage:
             out_file_name (str): Output file name
             file_str (str): File content string
         """
-        if self.gen_temp_sync_data_write:
+        if self.gen_temp_sync_data_write or self.incremental:
             file_md5 = md5(file_str.encode('utf-8')).hexdigest()
             self.temp_sync_files[out_file_name] = {
                 "fileMD5": file_md5,
@@ -487,13 +698,50 @@ class WriteCLIPackage:
 
 
 # Convenience function for backward compatibility
-def writeCLIPackage(fields: dict, GenTempSyncDataWrite: bool = False) -> None:
+def writeCLIPackage(fields: dict, GenTempSyncDataWrite: bool = False, max_workers: int | None = None,
+                    template_sources: dict | None = None) -> None:
     """
     Convenience function that creates and uses the WriteCLIPackage2 class.
     
     Args:
         fields (dict): Dictionary containing project configuration fields
         GenTempSyncDataWrite (bool): Flag to control temp sync data writing
+        max_workers (int): Threads used to render and write files
+        template_sources (dict): Previously discovered template sources to reuse
+    """
+    cli_package_writer = WriteCLIPackage(fields, GenTempSyncDataWrite, max_workers=max_workers,
+                                         template_sources=template_sources)
+    cli_package_writer.write_cli_package()
+
+
+def regenerateCLIPackage(max_workers: int | None = None) -> bool:
+    """
+    Incrementally regenerate the package in the current directory.
+    
+    The project fields are taken from the genTempSyncData.json file written by the
+    previous generation.
+    
+    Args:
+        max_workers (int): Threads used to render and write files
+        
+    Returns:
+        bool: False if there is no genTempSyncData.json to regenerate from
+    """
+    fields = WriteCLIPackage._read_temp_sync_data().get('fields')
+    if not fields:
+        printIt("genTempSyncData.json with project fields not found, generate with -g first",
+                lable.FileNotFound)
+        return False
+    cli_package_writer = WriteCLIPackage(fields, max_workers=max_workers, incremental=True)
+    cli_package_writer.write_cli_package()
+    return True
+
+
+def buildTemplateBundle() -> bool:
+    """
+    Rebuild the precompiled template bundle from the templates directory.
+    
+    Returns:
+        bool: True if the bundle was written
     """
-    cli_package_writer = WriteCLIPackage(fields, GenTempSyncDataWrite)
-    cli_package_writer.write_cli_package()
\ No newline at end of file
+    return build_template_bundle()
@@ -22,15 +22,22 @@ class WritePyProject:
     along with git repository initialization.
     """
     
-    def __init__(self, use_defaults: bool = False, gen_temp_sync_data_write: bool = False):
+    # git identity is looked up once per process and shared by every project
+    _username: str | None = None
+
+    def __init__(self, use_defaults: bool = False, gen_temp_sync_data_write: bool = False,
+                 proj_fields: dict[str, str] | None = None):
         """
         Initialize the WritePyProject with configuration options.
         
         Args:
             use_defaults (bool): Whether to use default values without prompting
             gen_temp_sync_data_write (bool): Flag to control temp sync data writing
+            proj_fields (dict): Preset field values (e.g. from a batch spec); missing
+                fields use their defaults and nothing is prompted
         """
-        self.use_defaults = use_defaults
+        self.use_defaults = use_defaults or proj_fields is not None
+        self.preset_fields = proj_fields or {}
         self.gen_temp_sync_data_write = gen_temp_sync_data_write
         self.temp_sync_files = {}
         self.fields = ['name', 'version', 'description', 'readme',
@@ -64,6 +71,9 @@ class WritePyProject:
         self.projFields = {}
         
         for field_name in self.fields:
+            if field_name in self.preset_fields:
+                self.projFields[field_name] = str(self.preset_fields[field_name])
+                continue
             default_value = self._get_default_values(field_name)
             if self.use_defaults:
                 self.projFields[field_name] = default_value
@@ -77,7 +87,8 @@ class WritePyProject:
                 self.projFields[field_name] = input_value
         
         # Generate classifiers
-        self.projFields['classifiers'] = self._gen_classifiers()
+        if 'classifiers' not in self.preset_fields:
+            self.projFields['classifiers'] = self._gen_classifiers()
 
         return self.projFields
     
@@ -159,7 +170,9 @@ class WritePyProject:
 
     def _ask_it_repo_needed(self) -> bool:
         """Ask user if they want to initialize a git repository."""
-        if self.use_defaults:
+        if 'git_initialized' in self.preset_fields:
+            repo_needed = 'y' if str(self.preset_fields['git_initialized']) == "True" else 'n'
+        elif self.use_defaults:
             repo_needed = 'y'
         else:
             repo_needed = self._get_input(
@@ -193,8 +206,11 @@ class WritePyProject:
 
         return classifiers_template.substitute(classifiers=classifiers_lines)
 
-    def _get_username(self) -> str:
+    @classmethod
+    def _get_username(cls) -> str:
         """Get git config values."""
+        if cls._username is not None:
+            return cls._username
         username = ''
 
         # use try-catch to prevent crashes if user doesn't install git
@@ -214,6 +230,7 @@ class WritePyProject:
             # if git command is not found, then use getuser()
             username = getuser()
 
+        cls._username = username
         return username
 
     def _get_default_values(self, field_name: str) -> str:
@@ -266,16 +283,18 @@ class WritePyProject:
 
 
 # Convenience functions to maintain backward compatibility
-def writePyProject(usedefaults: bool, gen_temp_sync_data_write: bool = False) -> dict[str, str]:
+def writePyProject(usedefaults: bool, gen_temp_sync_data_write: bool = False,
+                   proj_fields: dict[str, str] | None = None) -> dict[str, str]:
     """
     Backward compatibility function that creates and uses the WritePyProject class.
     
     Args:
         usedefaults (bool): Whether to use default values without prompting
         gen_temp_sync_data_write (bool): Flag to control temp sync data writing
+        proj_fields (dict): Preset field values, missing fields use their defaults
         
     Returns:
         dict: Dictionary containing all project configuration values
     """
-    py_project_writer = WritePyProject(usedefaults, gen_temp_sync_data_write)
+    py_project_writer = WritePyProject(usedefaults, gen_temp_sync_data_write, proj_fields)
     return py_project_writer.write_py_project()
@@ -1,13 +1,16 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 from cmdpackage.defs.runSubProc import runSubProc
+from cmdpackage.defs.venvCache import create_venv_from_cache
 
-def createzVirtualEnv(fields: dict):
+def createzVirtualEnv(fields: dict, use_cache: bool = True):
     try:
         yellow = "\033[33m"
         reset = "\033[0m"
         name = "name"
-        rtnCompProc = runSubProc(f'virtualenv env/{fields[name]}')
+        # clone the cached environment for this interpreter, build one only if that fails
+        if not (use_cache and create_venv_from_cache(f'env/{fields[name]}')):
+            rtnCompProc = runSubProc(f'virtualenv env/{fields[name]}')
         print(
             f'* Source the virtual environment with:  {yellow}. env/{fields[name]}/bin/activate{reset}')
         print(
@@ -0,0 +1,238 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import os
+import json
+from string import Template
+from hashlib import md5
+from cmdpackage.defs.utilities import list_files_os_walk, load_template, sanitize_var_name
+
+BUNDLE_VERSION = 2
+BUNDLE_FILE_NAME = "templateBundle.json"
+
+
+def get_bundle_path() -> str:
+    """Return the path of the template bundle stored next to the templates directory."""
+    package_dir = os.path.dirname(os.path.dirname(__file__))
+    return os.path.join(package_dir, BUNDLE_FILE_NAME)
+
+
+def get_templates_base() -> str:
+    """Return the templates directory of this cmdpackage installation."""
+    package_dir = os.path.dirname(os.path.dirname(__file__))
+    return os.path.join(package_dir, "templates")
+
+
+def template_placeholders(template_str: str) -> list[str]:
+    """
+    Return the sorted list of $name / ${name} placeholders used in a template string.
+
+    Args:
+        template_str (str): Raw template text
+
+    Returns:
+        list: Placeholder identifiers (escaped $$ sequences are ignored)
+    """
+    identifiers = set()
+    for match in Template.pattern.finditer(template_str):
+        identifier = match.group('named') or match.group('braced')
+        if identifier:
+            identifiers.add(identifier)
+    return sorted(identifiers)
+
+
+def _stat_key(path: str) -> list[int]:
+    file_stat = os.stat(path)
+    return [file_stat.st_mtime_ns, file_stat.st_size]
+
+
+def _template_dirs(templates_base: str) -> dict[str, int]:
+    """Map every template directory (relative to templates_base) to its mtime."""
+    dirs = {}
+    for root, dir_names, _ in os.walk(templates_base):
+        # bytecode caches change on every import and never hold templates
+        dir_names[:] = [d for d in dir_names if d != '__pycache__']
+        dirs[os.path.relpath(root, templates_base)] = os.stat(root).st_mtime_ns
+    return dirs
+
+
+def _file_md5(path: str) -> str:
+    with open(path, "rb") as rf:
+        return md5(rf.read()).hexdigest()
+
+
+def _template_files(templates_base: str) -> list[str]:
+    """Return every template file under templates_base, relative to the cmdpackage directory."""
+    package_dir = os.path.dirname(templates_base)
+    return [os.path.relpath(template_file, package_dir)
+            for template_file in list_files_os_walk(templates_base, extensions=('.py', '.json'))]
+
+
+def scan_template_sources(templates_base: str) -> dict:
+    """
+    Load every template under templates_base.
+
+    .py templates are imported and must define <module name> as a Template or
+    str; .json templates are read as text.
+
+    Args:
+        templates_base (str): Absolute path of the templates directory
+
+    Returns:
+        dict: source_name -> {'template_file', 'template_obj', 'module'} where
+            template_file is absolute and module is None for .json templates
+    """
+    sources = {}
+    for template_file in list_files_os_walk(templates_base, extensions=('.py', '.json')):
+        root, ext = os.path.splitext(template_file)
+        module_name = sanitize_var_name(os.path.basename(root))
+        if ext == '.py':
+            try:
+                module = load_template(template_file)
+            except Exception as e:
+                print(f"  Error loading template {template_file}: {e}")
+                continue
+            template_obj = getattr(module, module_name, None)
+            if template_obj is None:
+                print(f"  Warning: No template found in {module_name}")
+                available_attrs = [attr for attr in dir(module) if not attr.startswith('_')]
+                print(f"    Available attributes: {available_attrs}")
+                continue
+            sources[module_name] = {
+                'template_file': module.__file__,
+                'template_obj': template_obj,
+                'module': module
+            }
+        else:
+            with open(template_file, "r") as rf:
+                template_str = rf.read()
+            sources[module_name + "." + ext] = {
+                'template_file': template_file,
+                'template_obj': template_str,
+                'module': None
+            }
+    return sources
+
+
+def write_template_bundle(templates_base: str, sources: dict, bundle_path: str | None = None) -> bool:
+    """
+    Serialize scanned template sources into a single bundle file.
+
+    Args:
+        templates_base (str): Absolute path of the templates directory
+        sources (dict): source_name -> {'template_file', 'template_obj'} as
+            returned by scan_template_sources
+        bundle_path (str): Output file, defaults to get_bundle_path()
+
+    Returns:
+        bool: True if the bundle was written, False if a source cannot be
+            serialized or the location is read only
+    """
+    if bundle_path is None:
+        bundle_path = get_bundle_path()
+    package_dir = os.path.dirname(templates_base)
+    template_files = _template_files(templates_base)
+    bundle = {
+        "bundleVersion": BUNDLE_VERSION,
+        "dirs": _template_dirs(templates_base),
+        "files": {template_file: _file_md5(os.path.join(package_dir, template_file))
+                  for template_file in template_files},
+        "sources": {}
+    }
+    for source_name, source in sources.items():
+        template_obj = source['template_obj']
+        if isinstance(template_obj, Template):
+            kind, text = 'Template', template_obj.template
+        elif isinstance(template_obj, str):
+            kind, text = 'str', template_obj
+        else:
+            # only Template and str sources can be serialized, keep discovery
+            return False
+        template_file = os.path.relpath(source['template_file'], package_dir)
+        bundle["sources"][source_name] = {
+            "templateFile": template_file,
+            "kind": kind,
+            "stat": _stat_key(os.path.join(package_dir, template_file)),
+            "md5": md5(text.encode('utf-8')).hexdigest(),
+            "placeholders": template_placeholders(text),
+            "text": text
+        }
+    tmp_path = f"{bundle_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as wf:
+            json.dump(bundle, wf)
+        os.replace(tmp_path, bundle_path)
+    except OSError:
+        # installed into a read-only site-packages, keep using discovery
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    return True
+
+
+def build_template_bundle(templates_base: str | None = None, bundle_path: str | None = None) -> bool:
+    """
+    Scan the template sources and write the bundle.
+
+    Used by 'cmdpackage -b' and by the build step in setup.py, which writes the
+    bundle into the built package before it is installed.
+
+    Args:
+        templates_base (str): Templates directory, defaults to get_templates_base()
+        bundle_path (str): Output file, defaults to get_bundle_path()
+
+    Returns:
+        bool: True if the bundle was written
+    """
+    if templates_base is None:
+        templates_base = get_templates_base()
+    return write_template_bundle(templates_base, scan_template_sources(templates_base), bundle_path)
+
+
+def _unchanged_template_files(templates_base: str, files: dict) -> bool:
+    """Return True if the template files have the content recorded in the bundle."""
+    package_dir = os.path.dirname(templates_base)
+    template_files = _template_files(templates_base)
+    if sorted(template_files) != sorted(files):
+        return False
+    return all(_file_md5(os.path.join(package_dir, template_file)) == files[template_file]
+               for template_file in template_files)
+
+
+def read_template_bundle(templates_base: str, bundle_path: str | None = None) -> dict | None:
+    """
+    Load the template bundle if it is still current.
+
+    The stat calls on the recorded template directories and files are the fast
+    path. When any mtime or size differs, e.g. because installing a built
+    package gave every file a new mtime, the template files are hashed and the
+    bundle is stale only if a template was added, removed or edited. No
+    template is imported either way.
+
+    Args:
+        templates_base (str): Absolute path of the templates directory
+        bundle_path (str): Bundle file, defaults to get_bundle_path()
+
+    Returns:
+        dict: source_name -> bundle entry, or None when missing or stale
+    """
+    if bundle_path is None:
+        bundle_path = get_bundle_path()
+    try:
+        with open(bundle_path, "r") as rf:
+            bundle = json.load(rf)
+    except (OSError, ValueError):
+        return None
+    if bundle.get("bundleVersion") != BUNDLE_VERSION:
+        return None
+    package_dir = os.path.dirname(templates_base)
+    try:
+        unchanged = (
+            all(os.stat(os.path.join(templates_base, rel_dir)).st_mtime_ns == mtime_ns
+                for rel_dir, mtime_ns in bundle["dirs"].items())
+            and all(_stat_key(os.path.join(package_dir, entry["templateFile"])) == entry["stat"]
+                    for entry in bundle["sources"].values()))
+        if not unchanged and not _unchanged_template_files(templates_base, bundle["files"]):
+            return None
+    except (OSError, KeyError):
+        return None
+    return bundle["sources"]
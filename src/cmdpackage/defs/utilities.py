@@ -3,6 +3,7 @@ import re
 import importlib.util
 from subprocess import run, DEVNULL, CompletedProcess
 from .logIt import printIt, lable
+from .venvCache import VENV_DEPENDENCIES
 from types import ModuleType
 
 def chkDir(dirName: str):
@@ -141,18 +142,16 @@ def sanitize_var_name(requested_name):
 
 def installModules(project_name: str) -> None:
     """Install the generated module in editable mode."""
-    import subprocess
-
-    activate_cmd = f". env/{project_name}/bin/activate"
-    module = "-e ."
-    install_cmd = f"{activate_cmd} && pip install {module} --quiet"
-    result = subprocess.run(
-        install_cmd, shell=True, capture_output=True, text=True)
-    module = "black"
-    install_cmd = f"{activate_cmd} && pip install {module}  --quiet"
-    result = subprocess.run(
-        install_cmd, shell=True, capture_output=True, text=True)
+    # imported here as the classes package builds on these helpers
+    from cmdpackage.classes.venvInstaller import VenvInstaller
+
+    installer = VenvInstaller(project_name)
+    if not installer.exists():
+        printIt(f"Failed to install the module: {installer.env_dir} has no python", lable.FAIL)
+        return
+    result = installer.install()
     if result.returncode == 0:
-        printIt(f"{module} Installed ",lable.PASS)
+        printIt(f"{project_name} and {', '.join(VENV_DEPENDENCIES)} Installed ", lable.PASS)
     else:
-        printIt(f"Failed to install the module: {result.stderr}",lable.FAIL)
+        printIt(f"Failed to install the module: {result.stderr}", lable.FAIL)
+    installer.report_timings()
@@ -0,0 +1,212 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import os
+import sys
+import json
+import shutil
+from hashlib import sha256
+from cmdpackage.defs.runSubProc import runSubProc
+from cmdpackage.defs.logIt import printIt, lable
+
+VENV_CACHE_VERSION = 1
+VENV_CACHE_ENV = "CMDPACKAGE_VENV_CACHE"
+VENV_MARKER_FILE = "cmdpackage_venv.json"
+# Packages every generated project environment gets besides the project itself
+VENV_DEPENDENCIES = ["black"]
+# Build requirements of the generated pyproject.toml, kept so editable installs work offline
+BUILD_DEPENDENCIES = ["setuptools>=61.0", "wheel"]
+
+
+def get_cache_root() -> str:
+    """Return the cmdpackage cache directory, CMDPACKAGE_VENV_CACHE overrides it."""
+    cache_root = os.environ.get(VENV_CACHE_ENV)
+    if not cache_root:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+        cache_root = os.path.join(xdg_cache, "cmdpackage")
+    return cache_root
+
+
+def get_wheelhouse() -> str:
+    """Return the directory holding the reusable dependency wheels."""
+    return os.path.join(get_cache_root(), "wheels")
+
+
+def venv_cache_key(dependencies: list[str] | None = None) -> str:
+    """
+    Return the content address of a cached environment.
+
+    Args:
+        dependencies (list): Packages installed into the environment
+
+    Returns:
+        str: Hash of the interpreter build and the sorted dependency set
+    """
+    if dependencies is None:
+        dependencies = VENV_DEPENDENCIES
+    key_src = json.dumps({
+        "cacheVersion": VENV_CACHE_VERSION,
+        "python": sys.version,
+        "executable": os.path.realpath(sys.executable),
+        "dependencies": sorted(dependencies)
+    }, sort_keys=True)
+    return sha256(key_src.encode('utf-8')).hexdigest()[:16]
+
+
+def build_wheelhouse(dependencies: list[str] | None = None) -> bool:
+    """
+    Download or build wheels for the dependencies into the wheelhouse once.
+
+    Returns:
+        bool: True if the wheelhouse holds wheels for the dependencies
+    """
+    if dependencies is None:
+        dependencies = VENV_DEPENDENCIES
+    wheelhouse = get_wheelhouse()
+    os.makedirs(wheelhouse, exist_ok=True)
+    requirements = " ".join(f'"{dep}"' for dep in dependencies + BUILD_DEPENDENCIES)
+    rtnCompProc = runSubProc(
+        f'"{sys.executable}" -m pip wheel --quiet --wheel-dir "{wheelhouse}" {requirements}')
+    return rtnCompProc.returncode == 0
+
+
+def has_wheelhouse() -> bool:
+    """Return True if the wheelhouse holds wheels pip can reuse."""
+    wheelhouse = get_wheelhouse()
+    return os.path.isdir(wheelhouse) and any(f.endswith('.whl') for f in os.listdir(wheelhouse))
+
+
+def _build_cached_venv(cache_env: str, dependencies: list[str]) -> bool:
+    """
+    Create a cached environment with the dependencies installed.
+
+    The environment is built in a temporary directory and renamed into place so
+    concurrent cmdpackage runs never see a half built cache entry.
+
+    Args:
+        cache_env (str): Final location of the cached environment
+        dependencies (list): Packages to install
+
+    Returns:
+        bool: True if cache_env exists afterwards
+    """
+    build_env = f"{cache_env}.{os.getpid()}.tmp"
+    shutil.rmtree(build_env, ignore_errors=True)
+    printIt(f"Building cached virtual environment {cache_env}", lable.INFO)
+    rtnCompProc = runSubProc(f'virtualenv "{build_env}"')
+    if rtnCompProc.returncode != 0:
+        shutil.rmtree(build_env, ignore_errors=True)
+        return False
+
+    python = os.path.join(build_env, "bin", "python")
+    deps = " ".join(dependencies)
+    installed = False
+    if build_wheelhouse(dependencies):
+        rtnCompProc = runSubProc(
+            f'"{python}" -m pip install --quiet --no-index --find-links "{get_wheelhouse()}" {deps}')
+        installed = rtnCompProc.returncode == 0
+    if not installed:
+        rtnCompProc = runSubProc(f'"{python}" -m pip install --quiet {deps}')
+        installed = rtnCompProc.returncode == 0
+    if not installed:
+        shutil.rmtree(build_env, ignore_errors=True)
+        return False
+
+    with open(os.path.join(build_env, VENV_MARKER_FILE), "w") as wf:
+        json.dump({"origin": build_env, "python": sys.version, "dependencies": dependencies}, wf, indent=2)
+    try:
+        os.rename(build_env, cache_env)
+    except OSError:
+        # another run finished the same entry first
+        shutil.rmtree(build_env, ignore_errors=True)
+    return os.path.isdir(cache_env)
+
+
+def _rewrite_bytes(src_path: str, dst_path: str, origin: bytes, target: bytes) -> None:
+    """Copy src_path to dst_path replacing the origin environment path."""
+    with open(src_path, "rb") as rf:
+        content = rf.read()
+    with open(dst_path, "wb") as wf:
+        wf.write(content.replace(origin, target))
+    shutil.copymode(src_path, dst_path)
+
+
+def clone_venv(cache_env: str, target_env: str, final_env: str | None = None) -> None:
+    """
+    Clone a cached environment to target_env.
+
+    Library files are hard linked (copied when the cache is on another file
+    system); scripts in bin/ and pyvenv.cfg hold the absolute environment path
+    and are copied with that path rewritten. Bytecode caches are skipped.
+
+    Args:
+        cache_env (str): Cached environment
+        target_env (str): New environment location, must not exist
+        final_env (str): Location the clone is moved to afterwards, used for the
+            rewritten paths, defaults to target_env
+    """
+    with open(os.path.join(cache_env, VENV_MARKER_FILE), "r") as rf:
+        origin = json.load(rf)["origin"].encode()
+    target = os.path.abspath(final_env or target_env).encode()
+    bin_dir = os.path.join(cache_env, "bin")
+
+    for root, dir_names, file_names in os.walk(cache_env):
+        dir_names[:] = [d for d in dir_names if d != '__pycache__']
+        dst_root = os.path.join(target_env, os.path.relpath(root, cache_env))
+        os.makedirs(dst_root, exist_ok=True)
+        for link_dir in [d for d in dir_names if os.path.islink(os.path.join(root, d))]:
+            dir_names.remove(link_dir)
+            file_names.append(link_dir)
+        for file_name in file_names:
+            if file_name == VENV_MARKER_FILE and root == cache_env:
+                continue
+            src_path = os.path.join(root, file_name)
+            dst_path = os.path.join(dst_root, file_name)
+            if os.path.islink(src_path):
+                link_target = os.readlink(src_path)
+                os.symlink(link_target.replace(origin.decode(), target.decode()), dst_path)
+            elif root == bin_dir or (root == cache_env and file_name == "pyvenv.cfg"):
+                _rewrite_bytes(src_path, dst_path, origin, target)
+            else:
+                try:
+                    os.link(src_path, dst_path)
+                except OSError:
+                    shutil.copy2(src_path, dst_path)
+
+
+def create_venv_from_cache(target_env: str, dependencies: list[str] | None = None) -> bool:
+    """
+    Create target_env by cloning the cached environment for this interpreter.
+
+    The clone is made in a temporary sibling directory and renamed into place,
+    so an existing environment is never touched and a failed clone leaves
+    nothing behind.
+
+    Args:
+        target_env (str): Environment to create, e.g. env/<name>
+        dependencies (list): Packages the environment needs
+
+    Returns:
+        bool: True if target_env was cloned, False if the cache could not be used
+            or target_env already exists
+    """
+    if os.path.lexists(target_env):
+        # refreshed by virtualenv, which keeps the packages installed in it
+        return False
+    if dependencies is None:
+        dependencies = VENV_DEPENDENCIES
+    venvs_dir = os.path.join(get_cache_root(), "venvs")
+    cache_env = os.path.join(venvs_dir, venv_cache_key(dependencies))
+    clone_env = f"{os.path.abspath(target_env)}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(venvs_dir, exist_ok=True)
+        if not os.path.isfile(os.path.join(cache_env, VENV_MARKER_FILE)):
+            if not _build_cached_venv(cache_env, dependencies):
+                return False
+        clone_venv(cache_env, clone_env, final_env=target_env)
+        # fails rather than replace a non-empty environment created meanwhile
+        os.rename(clone_env, target_env)
+    except (OSError, ValueError, KeyError) as e:
+        printIt(f"Virtual environment cache not used: {e}", lable.WARN)
+        shutil.rmtree(clone_env, ignore_errors=True)
+        return False
+    return True
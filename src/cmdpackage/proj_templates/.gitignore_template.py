@@ -9,6 +9,18 @@ scrach/
 
 # Byte-compiled / optimized / DLL files
 __pycache__/
+# command file index rebuilt by the CLI
+.cmdindex.json
+dispatch.json
+.helpcache/
+.cmdscan.json
+.entrypoints.json
+.completion
+# advisory lock files taken by defs/storage.py
+*.json.lock
+.cmdrc.lock
+# --profile-startup=cprofile dumps
+*_startup.prof
 *.py[cod]
 *$$py.class
 
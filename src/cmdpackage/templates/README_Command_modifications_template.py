@@ -49,6 +49,23 @@ After installation, you can use the `${packName}` command from anywhere in your
 ${packName} --help
 ```
 
+### Interactive Shell
+`${packName} shell` starts a prompt that runs command lines without restarting Python.
+The command registry, `.cmdrc` options and imported command modules stay loaded; a
+command module is reloaded only when its file changes. TAB completes command names,
+arguments and option flags, and `help` prints the global help.
+
+### Shell Completion
+Enable TAB completion of commands, arguments and option flags in your login shell:
+```bash
+eval "$$(${packName} completion bash)"     # ~/.bashrc
+eval "$$(${packName} completion zsh)"      # ~/.zshrc, after compinit
+${packName} completion fish | source       # ~/.config/fish/config.fish
+```
+The scripts answer from `commands/.completion`, a tab separated index that `newCmd`,
+`modCmd` and `rmCmd` rewrite together with commands.json, so no Python starts on TAB.
+`${packName} completion index` rewrites the index by hand.
+
 ### Command Management
 
 #### Create a New Command
@@ -66,6 +83,31 @@ ${packName} newCmd mycommand "Description" --args "arg1:str:Description of arg1"
 ${packName} newCmd mycommand "Description" --template classCall
 ```
 
+#### Create Many Commands from a Manifest
+```bash
+${packName} newCmd --from manifest.json
+```
+The manifest lists commands in the commands.json layout, at the top level or under a
+`commands` key, so the commands.json of another package can be used as is. `.yaml`
+manifests need PyYAML:
+```json
+{
+  "template": "argCmdDef",
+  "commands": {
+    "deploy": {
+      "description": "Deploy the service",
+      "arguments": {"target": "Environment to deploy to"},
+      "option_switches": {"dry": "Only show what would change"},
+      "option_strings": {"tag": "Image tag to deploy"}
+    },
+    "status": {"description": "Show service status", "template": "simple"}
+  }
+}
+```
+All commands are created in one pass and commands.json is written once. Entries that are
+not mappings, or whose `arguments`, `option_switches` or `option_strings` are not
+mappings, are reported and skipped.
+
 #### Modify an Existing Command
 ```bash
 ${packName} modCmd mycommand --description "New description"
@@ -132,15 +174,22 @@ ${packName}/
 │   ├── main.py                     # Entry point
 │   ├── classes/
 │   │   ├── argParse.py            # Argument parsing logic
+│   │   ├── batchRun.py            # --batch command runner
 │   │   └── optSwitches.py         # Option flag management
 │   ├── commands/
 │   │   ├── commands.json          # Command registry
+│   │   ├── dispatch.json          # Command -> module/callable table (regenerated)
+│   │   ├── cmdDispatch.py         # Command resolution (table, entry points)
+│   │   ├── .helpcache/            # Rendered help text (regenerated)
+│   │   ├── .completion            # Shell completion index (regenerated)
 │   │   ├── cmdSwitchbord.py       # Command disptcer
 │   │   ├── commands.py            # Command loading
 │   │   ├── newCmd.py              # Command creation
 │   │   ├── modCmd.py              # Command modification
 │   │   ├── rmCmd.py               # Command removal
 │   │   ├── runTest.py             # Test runner
+│   │   ├── shell.py               # Interactive shell
+│   │   ├── completion.py          # Shell completion scripts
 │   │   └── templates/             # Code templates
 │   │       ├── argCmdDef.py       # Default template
 │   │       ├── simple.py          # Simple template
@@ -148,12 +197,29 @@ ${packName}/
 │   │       └── asyncDef.py        # Async template
 │   └── defs/
 │       ├── logIt.py              # Logging utilities
+│       ├── cmdJsonDict.py        # commandJsonDict parsing and rewriting
+│       ├── completionIndex.py    # Completion index and scripts
+│       ├── helpCache.py          # Help text cache
+│       ├── storage.py            # Atomic, locked JSON writes
+│       ├── warmClient.py         # Warm server mode, client side
+│       ├── warmServer.py         # Warm server mode
 │       └── validation.py         # Input validation
 ├── tests/                          # Test files
 ├── .${packName}rc                         # Configuration file
 └── pyproject.toml                 # Package configuration
 ```
 
+Rendered help (`${packName} -h` and `${packName} <command> -h`) is cached in `commands/.helpcache/`, keyed by the commands.json hash and the terminal width. The cache is cleared whenever commands.json is written, so `newCmd`, `modCmd` and `rmCmd` changes show up immediately.
+
+Commands are resolved through `commands/dispatch.json`, which is rewritten whenever `commands.json` changes. Other installed packages can add commands by registering entry points in the `${packName}.commands` group:
+
+```toml
+[project.entry-points."${packName}.commands"]
+myCmd = "my_package.my_module:myCmd"
+```
+
+The registered names are cached in `commands/.entrypoints.json` until a package is installed or removed.
+
 ## Configuration
 
 ${packName} uses two main configuration files:
@@ -240,6 +306,34 @@ ${packName} deploy +force --env production
 ### Template Customization
 Commands are generated from templates that can be customized by modifying the template files in the `commands/templates/` directory.
 
+### Warm Server Mode
+Scripts that call ${packName} many times can skip importing the package and its commands
+by setting the package name in upper case followed by `_WARM`:
+```bash
+export <PACKNAME>_WARM=1           # e.g. MYTOOL_WARM=1 for package mytool
+${packName} <command> [args...]
+```
+The first call starts a background server that keeps the commands imported and runs
+normally. Later calls hand their arguments, working directory, environment and
+standard streams to the server over a Unix socket and each runs in a fork of it.
+The server exits after 900 idle seconds (`<PACKNAME>_WARM_IDLE` changes this) and is
+restarted when a source file or commands.json changes.
+
+Each call still starts a Python interpreter, which takes about as long as `python -c pass`
+on the machine. Before connecting, the client (`defs/warmClient.py`) imports only modules
+built into the interpreter. What a warm call saves is the import of the package, the
+command registry and the command modules, not the interpreter startup.
+
+### Batch Mode
+Many command lines can be run by one process, each stdin line being a full command line:
+```bash
+${packName} --batch < commands.txt
+${packName} --batch --batch-results results.jsonl < commands.txt
+```
+Blank lines and `#` comments are skipped. One JSON object per command, holding its
+position, command line, exit code and duration, is written to stderr or appended to
+the `--batch-results` file. The batch exits with 1 if any command failed.
+
 ### Test Automation
 ```bash
 # Run comprehensive test suite
@@ -21,21 +21,38 @@ Features:
 import os
 import json
 import hashlib
-import ast
+import time
+import copy
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Optional, Any
 from ..defs.logIt import printIt, lable, cStr, color
+from ..defs.helpCache import clearHelpCache
+from ..defs.completionIndex import writeCompletionIndex
+from ..defs.storage import atomicWriteJson, atomicWriteText, fileLock, jsonTransaction
+from ..defs.cmdJsonDict import extractCommandJsonDict, replaceCommandJsonDict
+from ..commands.commands import Commands
+from .optSwitches import optionStore
 
 
 class CommandManager:
     \"\"\"Centralized manager for commands.json and related operations\"\"\"
 
+    # Files in the commands directory that never contain a commandJsonDict
+    NON_COMMAND_FILES = Commands.NON_COMMAND_FILES
+    COMMAND_INDEX_VERSION = 2
+    # mtime resolution assumed for command files, see load_command_index()
+    MTIME_RESOLUTION_NS = 2_000_000_000
+
     def __init__(self):
         \"\"\"Initialize CommandManager with file paths\"\"\"
         # Get the commands directory (where this would be called from)
         self.commands_dir = Path(__file__).parent.parent / "commands"
         self.commands_json_path = self.commands_dir / "commands.json"
-        self.cmdrc_path = self.commands_dir / ".cmdrc"
+        # .cmdrc is read and written through the process wide optionStore
+        self.cmdrc_path = optionStore.fileName
+        # Persisted stat/hash index of the command files and their commandJsonDict
+        self.command_index_path = self.commands_dir / ".cmdindex.json"
 
         # Legacy .${packName}rc path (in project root)
         self.project_root = self.commands_dir.parent.parent.parent
@@ -44,23 +61,67 @@ class CommandManager:
         # Sync data path
         self.sync_data_path = self.project_root / "genTempSyncData.json"
 
-    def _load_commands_json(self) -> Dict[str, Any]:
-        \"\"\"Load and return commands.json data with error handling\"\"\"
+        # In-memory commands.json model, see load() and flush()
+        self._commands_data = None
+        self._commands_stat = None
+        self._dirty = False
+        # Changes staged by transaction(), None outside a transaction
+        self._transaction = None
+
+    def _commands_json_stat(self) -> Optional[tuple]:
+        \"\"\"Stat fingerprint used to notice commands.json changes made by other writers\"\"\"
         try:
-            with open(self.commands_json_path, "r") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            printIt(f"Error loading commands.json: {e}", lable.ERROR)
-            return {}
-        except Exception as e:
-            printIt(f"Unexpected error loading commands.json: {e}", lable.ERROR)
-            return {}
+            file_stat = self.commands_json_path.stat()
+        except OSError:
+            return None
+        return (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino)
 
-    def _save_commands_json(self, data: Dict[str, Any]) -> bool:
-        \"\"\"Save data to commands.json with error handling\"\"\"
+    def load(self, force: bool = False) -> Dict[str, Any]:
+        \"\"\"
+        Return the in-memory commands.json model, reading the file only when needed
+
+        The file is read again when its mtime, size or inode changed since the
+        last load or flush. A model with unflushed changes is returned as is.
+
+        Args:
+            force (bool): Re-read commands.json, discarding unflushed changes
+
+        Returns:
+            dict: The model, edit it in place, call mark_dirty() and flush()
+        \"\"\"
+        if self._dirty and not force:
+            return self._commands_data
+        current_stat = self._commands_json_stat()
+        if force or self._commands_data is None or current_stat != self._commands_stat:
+            try:
+                with open(self.commands_json_path, "r") as f:
+                    self._commands_data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                printIt(f"Error loading commands.json: {e}", lable.ERROR)
+                self._commands_data = {}
+            except Exception as e:
+                printIt(f"Unexpected error loading commands.json: {e}", lable.ERROR)
+                self._commands_data = {}
+            self._commands_stat = current_stat
+            self._dirty = False
+        return self._commands_data
+
+    def mark_dirty(self) -> None:
+        \"\"\"Record that the model was changed and needs to be flushed\"\"\"
+        self._dirty = True
+
+    def flush(self) -> bool:
+        \"\"\"Write the model to commands.json if it has unflushed changes\"\"\"
+        if not self._dirty or self._transaction is not None:
+            # inside a transaction the model is written on commit
+            return True
         try:
-            with open(self.commands_json_path, "w") as f:
-                json.dump(data, f, indent=2)
+            with fileLock(self.commands_json_path):
+                atomicWriteJson(self.commands_json_path, self._commands_data)
+            writeCompletionIndex(self._commands_data)
+            clearHelpCache()
+            self._commands_stat = self._commands_json_stat()
+            self._dirty = False
 
             # Update MD5 hash after successful save
             self.update_sync_data_md5(str(self.commands_json_path))
@@ -69,6 +130,166 @@ class CommandManager:
             printIt(f"Error saving commands.json: {e}", lable.ERROR)
             return False
 
+    def invalidate(self) -> None:
+        \"\"\"Drop the model so the next load() reads commands.json\"\"\"
+        self._commands_data = None
+        self._commands_stat = None
+        self._dirty = False
+
+    @contextmanager
+    def transaction(self):
+        \"\"\"
+        Stage every change made in the block and commit them together on exit
+
+        The commands.json lock is held for the whole block, so no other process
+        can write commands.json between the load and the commit. commands.json
+        and command .py files are kept in memory until the block ends and then
+        written together. Edits of .cmdrc and the legacy .${packName}rc are
+        replayed on the current files under their own locks at commit, and the
+        sync data MD5s are updated once. If the block raises, nothing is
+        written. Nested transactions join the outer one.
+
+        Yields:
+            CommandManager: This manager
+        \"\"\"
+        if self._transaction is not None:
+            yield self
+            return
+        with fileLock(self.commands_json_path):
+            self.load()
+            self._transaction = {
+                "commands_stat": self._commands_stat,
+                "files": {},
+                "json": {},
+                "json_edits": {},
+                "md5": set(),
+                "sync_commands": {},
+            }
+            try:
+                yield self
+                # Each changed commandJsonDict is written to its Python file once
+                for cmd_name in self._transaction["sync_commands"]:
+                    self._sync_python_file_command_json_dict(cmd_name)
+                staged = self._transaction
+                self._transaction = None
+                self._commit_transaction(staged)
+            except BaseException:
+                self._transaction = None
+                self.invalidate()
+                # Commands instances may hold staged command data
+                Commands.invalidate()
+                raise
+
+    def _commit_transaction(self, staged: Dict[str, Any]) -> None:
+        \"\"\"Write everything a transaction staged, called with the commands.json lock held\"\"\"
+        with fileLock(self.commands_json_path):
+            if self._commands_json_stat() != staged["commands_stat"]:
+                # only a writer that ignores the lock, e.g. an editor, can get here
+                raise RuntimeError("commands.json was changed outside the lock during this edit, nothing was written")
+            for file_path, content in staged["files"].items():
+                if content is None:
+                    if file_path.exists():
+                        file_path.unlink()
+                else:
+                    atomicWriteText(file_path, content)
+            if self._dirty:
+                atomicWriteJson(self.commands_json_path, self._commands_data)
+                writeCompletionIndex(self._commands_data)
+                clearHelpCache()
+                self._commands_stat = self._commands_json_stat()
+                self._dirty = False
+                staged["md5"].add(str(self.commands_json_path))
+        for json_path, json_edits in staged["json_edits"].items():
+            if json_path == self.cmdrc_path:
+                for edit in json_edits["edits"]:
+                    optionStore.update(edit)
+                optionStore.flush()
+                continue
+            with jsonTransaction(json_path, default=json_edits["default"]) as data:
+                for edit in json_edits["edits"]:
+                    edit(data)
+        self._update_sync_data_md5s(staged["md5"])
+
+    def _staged_json(self, json_path: Path, reader) -> Dict[str, Any]:
+        \"\"\"Return the transaction's copy of a JSON file, reading it with reader() once\"\"\"
+        staged_json = self._transaction["json"]
+        if json_path not in staged_json:
+            staged_json[json_path] = reader()
+        return staged_json[json_path]
+
+    def _update_json(self, json_path: Path, reader, default: Dict[str, Any], edit) -> bool:
+        \"\"\"
+        Apply edit(data) to a JSON file under its lock
+
+        Inside a transaction the edit is applied to the staged copy and replayed
+        on the current file at commit, so changes another process made to the
+        file in the meantime are kept. .cmdrc edits go through optionStore,
+        so its data stays current for the rest of the process.
+
+        Returns:
+            bool: False if the file could not be read or written
+        \"\"\"
+        if self._transaction is not None:
+            edit(self._staged_json(json_path, reader))
+            json_edits = self._transaction["json_edits"].setdefault(json_path, {"default": default, "edits": []})
+            json_edits["edits"].append(edit)
+            return True
+        if json_path == self.cmdrc_path:
+            optionStore.update(edit)
+            return optionStore.flush()
+        try:
+            with jsonTransaction(json_path, default=default) as data:
+                edit(data)
+            return True
+        except (OSError, ValueError) as e:
+            printIt(f"Error saving {json_path.name}: {e}", lable.WARN)
+            return False
+
+    def command_file_path(self, cmd_name: str) -> Path:
+        \"\"\"Path of the Python file of a command\"\"\"
+        return self.commands_dir / f"{cmd_name}.py"
+
+    def read_command_file(self, cmd_name: str) -> Optional[str]:
+        \"\"\"Return the content of a command's Python file, None if it does not exist\"\"\"
+        file_path = self.command_file_path(cmd_name)
+        if self._transaction is not None and file_path in self._transaction["files"]:
+            return self._transaction["files"][file_path]
+        try:
+            with open(file_path, "r") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write_command_file(self, cmd_name: str, content: str) -> None:
+        \"\"\"Write a command's Python file, staged when inside a transaction\"\"\"
+        file_path = self.command_file_path(cmd_name)
+        if self._transaction is not None:
+            self._transaction["files"][file_path] = content
+        else:
+            atomicWriteText(file_path, content)
+
+    def delete_command_file(self, cmd_name: str) -> None:
+        \"\"\"Delete a command's Python file, staged when inside a transaction\"\"\"
+        file_path = self.command_file_path(cmd_name)
+        if self._transaction is not None:
+            self._transaction["files"][file_path] = None
+        elif file_path.exists():
+            file_path.unlink()
+
+    def command_file_exists(self, cmd_name: str) -> bool:
+        \"\"\"Check if a command's Python file exists, including staged changes\"\"\"
+        return self.read_command_file(cmd_name) is not None
+
+    def _load_commands_json(self) -> Dict[str, Any]:
+        \"\"\"Load and return commands.json data with error handling\"\"\"
+        return self.load()
+
+    def _save_commands_json(self, data: Dict[str, Any]) -> bool:
+        \"\"\"Save data to commands.json with error handling\"\"\"
+        self._commands_data = data
+        self.mark_dirty()
+        return self.flush()
+
     def command_exists(self, cmd_name: str) -> bool:
         \"\"\"Check if command exists in commands.json\"\"\"
         commands_data = self._load_commands_json()
@@ -212,30 +433,40 @@ class CommandManager:
 
     def get_cmdrc_data(self) -> Dict[str, Any]:
         \"\"\"Read .cmdrc file data\"\"\"
-        try:
-            if not self.cmdrc_path.exists():
-                return {"option_switches": {}, "option_strings": {}, "commands": {}}
-
-            with open(self.cmdrc_path, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, Exception) as e:
-            printIt(f"Error loading .cmdrc: {e}", lable.WARN)
-            return {"option_switches": {}, "option_strings": {}, "commands": {}}
+        if self._transaction is not None:
+            return self._staged_json(self.cmdrc_path, self._read_cmdrc_data)
+        return self._read_cmdrc_data()
+
+    def _read_cmdrc_data(self) -> Dict[str, Any]:
+        return copy.deepcopy(optionStore.data)
+
+    def update_cmdrc_data(self, edit) -> bool:
+        \"\"\"Apply edit(data) to the .cmdrc data and save it\"\"\"
+        return self._update_json(
+            self.cmdrc_path,
+            self._read_cmdrc_data,
+            {"option_switches": {}, "option_strings": {}, "commands": {}},
+            edit,
+        )
 
     def save_cmdrc_data(self, data: Dict[str, Any]) -> bool:
         \"\"\"Save data to .cmdrc file\"\"\"
-        try:
-            with open(self.cmdrc_path, "w") as f:
-                json.dump(data, f, indent=2)
-            return True
-        except Exception as e:
-            printIt(f"Error saving .cmdrc: {e}", lable.WARN)
-            return False
+
+        def edit(cmdrc_data: Dict[str, Any]) -> None:
+            cmdrc_data.clear()
+            cmdrc_data.update(copy.deepcopy(data))
+
+        return self.update_cmdrc_data(edit)
 
     def add_cmdrc_flag(self, cmd_name: str, flag_name: str, is_switch: bool, default_value: Any = None) -> bool:
         \"\"\"Add a flag to .cmdrc file\"\"\"
-        cmdrc_data = self.get_cmdrc_data()
+        return self.update_cmdrc_data(
+            lambda cmdrc_data: self._add_cmdrc_flag(cmdrc_data, cmd_name, flag_name, is_switch, default_value)
+        )
 
+    def _add_cmdrc_flag(
+        self, cmdrc_data: Dict[str, Any], cmd_name: str, flag_name: str, is_switch: bool, default_value: Any
+    ) -> None:
         if "commands" not in cmdrc_data:
             cmdrc_data["commands"] = {}
 
@@ -253,36 +484,73 @@ class CommandManager:
                 cmd_options["option_strings"] = {}
             cmd_options["option_strings"][flag_name] = default_value if default_value is not None else ""
 
-        return self.save_cmdrc_data(cmdrc_data)
-
     def remove_cmdrc_flag(self, cmd_name: str, flag_name: str) -> bool:
         \"\"\"Remove a flag from .cmdrc file\"\"\"
-        cmdrc_data = self.get_cmdrc_data()
+        cmd_options = self.get_cmdrc_data().get("commands", {}).get(cmd_name, {})
+        if flag_name not in cmd_options.get("option_switches", {}) and flag_name not in cmd_options.get(
+            "option_strings", {}
+        ):
+            return False
+        return self.update_cmdrc_data(lambda cmdrc_data: self._remove_cmdrc_flag(cmdrc_data, cmd_name, flag_name))
 
+    def _remove_cmdrc_flag(self, cmdrc_data: Dict[str, Any], cmd_name: str, flag_name: str) -> None:
         if "commands" not in cmdrc_data or cmd_name not in cmdrc_data["commands"]:
-            return False
+            return
 
         cmd_options = cmdrc_data["commands"][cmd_name]
-        removed = False
 
         # Remove from option_switches
         if "option_switches" in cmd_options and flag_name in cmd_options["option_switches"]:
             del cmd_options["option_switches"][flag_name]
-            removed = True
 
         # Remove from option_strings
         if "option_strings" in cmd_options and flag_name in cmd_options["option_strings"]:
             del cmd_options["option_strings"][flag_name]
-            removed = True
 
         # If command has no more flags, remove the command entry
         if not cmd_options.get("option_switches") and not cmd_options.get("option_strings"):
             del cmdrc_data["commands"][cmd_name]
 
-        return self.save_cmdrc_data(cmdrc_data) if removed else False
+    def save_command_options(self, cmd_name: str, cmd_options: Dict[str, Any], cmd_option_definitions: Dict[str, Any]) -> bool:
+        \"\"\"Save stored values of command options to .cmdrc\"\"\"
+
+        def edit(cmdrc_data: Dict[str, Any]) -> None:
+            cmd_entry = cmdrc_data.setdefault("commands", {}).setdefault(
+                cmd_name, {"option_switches": {}, "option_strings": {}}
+            )
+            for option_name, option_value in cmd_options.items():
+                if option_name not in cmd_option_definitions:
+                    continue
+                option_type = cmd_option_definitions[option_name].get("type", "str")
+                if option_type == "bool":
+                    cmd_entry.setdefault("option_switches", {})[option_name] = bool(option_value)
+                elif option_type == "str":
+                    option_value = "" if option_value == "__STRING_OPTION__" else str(option_value)
+                    cmd_entry.setdefault("option_strings", {})[option_name] = option_value
+
+        if self.update_cmdrc_data(edit):
+            printIt(f"Command options saved for '{cmd_name}'", lable.INFO)
+            return True
+        printIt(f"Failed to save command options for '{cmd_name}'", lable.ERROR)
+        return False
+
+    def remove_command_options(self, cmd_name: str) -> bool:
+        \"\"\"Remove all stored options of a command from .cmdrc\"\"\"
+        if cmd_name not in self.get_cmdrc_data().get("commands", {}):
+            return False
+        if self.update_cmdrc_data(lambda cmdrc_data: cmdrc_data.get("commands", {}).pop(cmd_name, None)):
+            printIt(f"Command options removed for '{cmd_name}'", lable.INFO)
+            return True
+        printIt(f"Failed to remove command options for '{cmd_name}'", lable.ERROR)
+        return False
 
     def get_legacy_${packName}rc_data(self) -> Dict[str, Any]:
         \"\"\"Read legacy .${packName}rc file data for backwards compatibility\"\"\"
+        if self._transaction is not None:
+            return self._staged_json(self.${packName}rc_path, self._read_legacy_${packName}rc_data)
+        return self._read_legacy_${packName}rc_data()
+
+    def _read_legacy_${packName}rc_data(self) -> Dict[str, Any]:
         try:
             if not self.${packName}rc_path.exists():
                 return {"commandFlags": {}}
@@ -293,61 +561,64 @@ class CommandManager:
             printIt(f"Warning: Could not read .${packName}rc file: {e}", lable.WARN)
             return {"commandFlags": {}}
 
+    def update_legacy_${packName}rc_data(self, edit) -> bool:
+        \"\"\"Apply edit(data) to the legacy .${packName}rc data and save it\"\"\"
+        return self._update_json(
+            self.${packName}rc_path, self._read_legacy_${packName}rc_data, {"commandFlags": {}}, edit
+        )
+
     def save_legacy_${packName}rc_data(self, data: Dict[str, Any]) -> bool:
         \"\"\"Save data to legacy .${packName}rc file\"\"\"
-        try:
-            with open(self.${packName}rc_path, "w") as f:
-                json.dump(data, f, indent=2)
-            return True
-        except Exception as e:
-            printIt(f"Warning: Could not update .${packName}rc file: {e}", lable.WARN)
-            return False
 
-    def remove_legacy_${packName}rc_flag(self, cmd_name: str, flag_name: str) -> bool:
-        \"\"\"Remove a flag from legacy .${packName}rc file\"\"\"
-        ${packName}rc_data = self.get_legacy_${packName}rc_data()
+        def edit(${packName}rc_data: Dict[str, Any]) -> None:
+            ${packName}rc_data.clear()
+            ${packName}rc_data.update(copy.deepcopy(data))
 
-        if (
-            "commandFlags" in ${packName}rc_data
-            and cmd_name in ${packName}rc_data["commandFlags"]
-            and flag_name in ${packName}rc_data["commandFlags"][cmd_name]
-        ):
+        return self.update_legacy_${packName}rc_data(edit)
 
-            del ${packName}rc_data["commandFlags"][cmd_name][flag_name]
+    def remove_legacy_${packName}rc_flag(self, cmd_name: str, flag_name: str) -> bool:
+        \"\"\"Remove a flag from legacy .${packName}rc file\"\"\"
+        if flag_name not in self.get_legacy_${packName}rc_data().get("commandFlags", {}).get(cmd_name, {}):
+            return False
 
+        def edit(${packName}rc_data: Dict[str, Any]) -> None:
+            cmd_flags = ${packName}rc_data.get("commandFlags", {}).get(cmd_name, {})
+            cmd_flags.pop(flag_name, None)
             # If command has no more flags, remove the command entry
-            if not ${packName}rc_data["commandFlags"][cmd_name]:
-                del ${packName}rc_data["commandFlags"][cmd_name]
+            if not cmd_flags:
+                ${packName}rc_data.get("commandFlags", {}).pop(cmd_name, None)
 
-            return self.save_legacy_${packName}rc_data(${packName}rc_data)
-
-        return False
+        return self.update_legacy_${packName}rc_data(edit)
 
     def update_sync_data_md5(self, file_path: str) -> None:
         \"\"\"Update the MD5 hash for a file in genTempSyncData.json\"\"\"
+        if self._transaction is not None:
+            # computed once when the transaction commits
+            self._transaction["md5"].add(file_path)
+            return
+        self._update_sync_data_md5s([file_path])
+
+    def _update_sync_data_md5s(self, file_paths) -> None:
+        \"\"\"Update the MD5 hashes of several files in one genTempSyncData.json write\"\"\"
         try:
-            if not self.sync_data_path.exists():
+            if not file_paths or not self.sync_data_path.exists():
                 # If genTempSyncData.json doesn't exist, no need to update
                 return
 
-            # Calculate new MD5 hash
-            with open(file_path, "rb") as f:
-                file_hash = hashlib.md5(f.read()).hexdigest()
+            # Calculate new MD5 hashes
+            file_hashes = {}
+            for file_path in file_paths:
+                with open(file_path, "rb") as f:
+                    file_hashes[os.path.abspath(file_path)] = hashlib.md5(f.read()).hexdigest()
 
-            # Load sync data
-            with open(self.sync_data_path, "r") as f:
-                sync_data = json.load(f)
+            # Update MD5 for the files that are tracked, other processes may save the sync data concurrently
+            with jsonTransaction(self.sync_data_path, indent=4) as sync_data:
+                tracked = [abs_file_path for abs_file_path in file_hashes if abs_file_path in sync_data]
+                for abs_file_path in tracked:
+                    sync_data[abs_file_path]["fileMD5"] = file_hashes[abs_file_path]
 
-            # Update MD5 for the file if it's tracked
-            abs_file_path = os.path.abspath(file_path)
-            if abs_file_path in sync_data:
-                sync_data[abs_file_path]["fileMD5"] = file_hash
-
-                # Save updated sync data
-                with open(self.sync_data_path, "w") as f:
-                    json.dump(sync_data, f, indent=4)
-
-                file_name = os.path.basename(file_path)
+            for abs_file_path in tracked:
+                file_name = os.path.basename(abs_file_path)
                 printIt(f"Updated MD5 hash for {file_name} in sync data", lable.INFO)
 
         except Exception as e:
@@ -390,7 +661,19 @@ class CommandManager:
         return success
 
     def update_python_file_command_json_dict(self, cmd_name: str) -> bool:
-        \"\"\"Update the commandJsonDict in the Python file to match commands.json\"\"\"
+        \"\"\"
+        Update the commandJsonDict in the Python file to match commands.json
+
+        Inside a transaction the update is deferred until the block ends, so a
+        command changed several times has its file parsed and rewritten once.
+        \"\"\"
+        if self._transaction is not None:
+            self._transaction["sync_commands"][cmd_name] = True
+            return True
+        return self._sync_python_file_command_json_dict(cmd_name)
+
+    def _sync_python_file_command_json_dict(self, cmd_name: str) -> bool:
+        \"\"\"Splice the commands.json entry of cmd_name into its Python file\"\"\"
         try:
             # Get the current command data from commands.json
             cmd_data = self.get_command_data(cmd_name)
@@ -399,55 +682,25 @@ class CommandManager:
                 return False
 
             # Build the path to the Python file
-            python_file_path = self.commands_dir / f"{cmd_name}.py"
+            python_file_path = self.command_file_path(cmd_name)
 
-            if not python_file_path.exists():
+            # Read the current file content, staged by a transaction or from disk
+            file_content = self.read_command_file(cmd_name)
+            if file_content is None:
                 printIt(f"Python file {python_file_path} not found", lable.WARN)
                 return False
 
-            # Read the current file content
-            with open(python_file_path, "r") as f:
-                file_content = f.read()
-
-            # Create the new commandJsonDict string
-            new_command_json_dict = {cmd_name: cmd_data}
-            json_str = json.dumps(new_command_json_dict, indent=2)
-
-            # Look for the commandJsonDict pattern with proper nesting
-            lines = file_content.split("\\n")
-            start_line = -1
-            end_line = -1
-            brace_count = 0
-            in_dict = False
-
-            for i, line in enumerate(lines):
-                if "commandJsonDict" in line and "=" in line and "{" in line:
-                    start_line = i
-                    in_dict = True
-                    brace_count = line.count("{") - line.count("}")
-                elif in_dict:
-                    brace_count += line.count("{") - line.count("}")
-                    if brace_count == 0:
-                        end_line = i
-                        break
-
-            if start_line != -1 and end_line != -1:
-                # Replace the commandJsonDict section
-                before_lines = lines[:start_line]
-                after_lines = lines[end_line + 1 :]
-
-                new_lines = before_lines + [f"commandJsonDict = {json_str}"] + after_lines
-
-                # Write the updated content back to the file
-                with open(python_file_path, "w") as f:
-                    f.write("\\n".join(new_lines))
-
-                printIt(f"Updated commandJsonDict in {python_file_path.name}", lable.INFO)
-                return True
-            else:
+            # Splice the new commandJsonDict over the old assignment
+            new_content = replaceCommandJsonDict(file_content, {cmd_name: cmd_data})
+            if new_content is None:
                 printIt(f"Could not find commandJsonDict pattern in {python_file_path.name}", lable.WARN)
                 return False
 
+            if new_content != file_content:
+                self.write_command_file(cmd_name, new_content)
+            printIt(f"Updated commandJsonDict in {python_file_path.name}", lable.INFO)
+            return True
+
         except Exception as e:
             printIt(f"Error updating Python file commandJsonDict: {e}", lable.ERROR)
             return False
@@ -465,6 +718,89 @@ class CommandManager:
         printIt(f"Synced {success_count}/{total_count} Python files", lable.INFO)
         return success_count == total_count
 
+    def load_command_index(self, rebuild: bool = False) -> Dict[str, Any]:
+        \"\"\"
+        Return the command file index, re-parsing only the files that changed
+
+        The index is persisted in commands/.cmdindex.json and holds the mtime, size and
+        md5 of every command file together with its extracted commandJsonDict (or the
+        parse error). Files with an unchanged mtime and size are not opened and files
+        with an unchanged md5 are not parsed again. A file whose mtime was within the
+        mtime resolution of the time it was indexed could have changed again without
+        a new mtime, so it is re-hashed on every load instead of trusted; the index
+        is only rewritten when an entry actually changed.
+
+        Args:
+            rebuild (bool): Ignore the persisted index and parse every file
+
+        Returns:
+            Dict[str, Any]: Command file name -> index entry
+        \"\"\"
+        old_index = {} if rebuild else self._read_command_index()
+        new_index = {}
+        now_ns = time.time_ns()
+
+        for file_name in sorted(os.listdir(self.commands_dir)):
+            if not file_name.endswith(".py") or file_name in self.NON_COMMAND_FILES:
+                continue
+            file_path = self.commands_dir / file_name
+            try:
+                file_stat = file_path.stat()
+                entry = old_index.get(file_name)
+                stat_unchanged = (
+                    entry is not None
+                    and entry["mtime_ns"] == file_stat.st_mtime_ns
+                    and entry["size"] == file_stat.st_size
+                )
+                if stat_unchanged and entry["mtime_ns"] < entry["indexed_ns"] - self.MTIME_RESOLUTION_NS:
+                    new_index[file_name] = entry
+                    continue
+                with open(file_path, "rb") as f:
+                    file_bytes = f.read()
+            except OSError:
+                continue
+
+            file_md5 = hashlib.md5(file_bytes).hexdigest()
+            if stat_unchanged and entry["md5"] == file_md5:
+                # racily clean entry whose content did not change, keep it as is
+                new_index[file_name] = entry
+                continue
+            if not entry or entry["md5"] != file_md5:
+                entry = {"md5": file_md5, "commandJsonDict": None, "error": None}
+                try:
+                    entry["commandJsonDict"] = extractCommandJsonDict(file_bytes.decode("utf-8"))
+                except (ValueError, SyntaxError, UnicodeDecodeError) as e:
+                    entry["error"] = str(e)
+            new_index[file_name] = dict(
+                entry,
+                mtime_ns=file_stat.st_mtime_ns,
+                size=file_stat.st_size,
+                indexed_ns=now_ns,
+            )
+
+        if new_index != old_index:
+            self._write_command_index(new_index)
+        return new_index
+
+    def _read_command_index(self) -> Dict[str, Any]:
+        \"\"\"Load the persisted command index, empty if it is missing or from another version\"\"\"
+        try:
+            with open(self.command_index_path, "r") as f:
+                index_data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if index_data.get("indexVersion") != self.COMMAND_INDEX_VERSION:
+            return {}
+        return index_data.get("files", {})
+
+    def _write_command_index(self, index: Dict[str, Any]) -> None:
+        \"\"\"Persist the command index, keeping the previous one if the directory is read only\"\"\"
+        index_data = {"indexVersion": self.COMMAND_INDEX_VERSION, "files": index}
+        try:
+            atomicWriteJson(self.command_index_path, index_data)
+        except OSError:
+            pass
+
     def build_tracked_commands_json(self) -> Dict[str, Any]:
         \"\"\"
         Build commands.json equivalent by extracting commandJsonDict from ALL Python files in commands directory
@@ -488,76 +824,31 @@ class CommandManager:
             printIt(f"Commands directory not found: {commands_dir}", lable.ERROR)
             return {}
 
-        # Scan ALL Python files in the commands directory
-        for file_name in os.listdir(commands_dir):
-            if not file_name.endswith(".py"):
-                continue
+        # Scan ALL Python files in the commands directory, unchanged files come from the index
+        for file_name, entry in self.load_command_index().items():
+            file_path = os.path.join(commands_dir, file_name)
+            processed_files += 1
 
-            # Skip special files that don't contain commandJsonDict
-            if file_name in ["commands.py", "__init__.py", "cmdOptSwitchboard.py", "cmdSwitchboard.py"]:
+            if entry["error"]:
+                printIt(f"Python syntax error in {file_path}: {entry['error']}", lable.ERROR)
                 continue
 
-            file_path = os.path.join(commands_dir, file_name)
-            processed_files += 1
+            command_data = entry["commandJsonDict"]
+            if command_data is None:
+                # No commandJsonDict found - this is OK, just skip silently
+                continue
 
-            try:
-                # Read the Python file
-                with open(file_path, "r") as f:
-                    file_content = f.read()
-
-                # Extract commandJsonDict using the same logic as our update method
-                lines = file_content.split("\\n")
-                start_line = -1
-                end_line = -1
-                brace_count = 0
-                in_dict = False
-
-                for i, line in enumerate(lines):
-                    if "commandJsonDict" in line and "=" in line and "{" in line:
-                        start_line = i
-                        in_dict = True
-                        brace_count = line.count("{") - line.count("}")
-                    elif in_dict:
-                        brace_count += line.count("{") - line.count("}")
-                        if brace_count == 0:
-                            end_line = i
-                            break
-
-                if start_line != -1 and end_line != -1:
-                    # Extract the commandJsonDict section
-                    dict_lines = lines[start_line : end_line + 1]
-                    dict_content = "\\n".join(dict_lines)
-
-                    # Extract just the dictionary part after the equals sign
-                    equals_index = dict_content.find("=")
-                    if equals_index != -1:
-                        python_dict_part = dict_content[equals_index + 1 :].strip()
-
-                        # Use ast.literal_eval to safely parse the Python dictionary
-                        command_data = ast.literal_eval(python_dict_part)
-
-                        # Merge into commands_dict
-                        if isinstance(command_data, dict):
-                            commands_dict.update(command_data)
-                            successful_extractions += 1
-
-                            # Get command name for logging
-                            cmd_names = list(command_data.keys())
-                            if cmd_names:
-                                printIt(
-                                    f"Extracted commandJsonDict from {file_name}: {', '.join(cmd_names)}",
-                                    lable.ABORTPRT,
-                                )
-                        else:
-                            printIt(f"Invalid commandJsonDict format in {file_path}", lable.WARN)
-                else:
-                    # No commandJsonDict found - this is OK, just skip silently
-                    pass
+            # Merge into commands_dict
+            commands_dict.update(command_data)
+            successful_extractions += 1
 
-            except (ValueError, SyntaxError) as e:
-                printIt(f"Python syntax error in {file_path}: {e}", lable.ERROR)
-            except Exception as e:
-                printIt(f"Error processing {file_path}: {e}", lable.ERROR)
+            # Get command name for logging
+            cmd_names = list(command_data.keys())
+            if cmd_names:
+                printIt(
+                    f"Extracted commandJsonDict from {file_name}: {', '.join(cmd_names)}",
+                    lable.ABORTPRT,
+                )
 
         printIt(f"Built commands dict from {successful_extractions}/{processed_files} Python command files", lable.INFO)
         printIt(f"Total commands found: {len(commands_dict)}", lable.INFO)
@@ -663,13 +954,13 @@ class CommandManager:
             # Add to commands dictionary
             commands[cmd_name] = new_command_cmd_json
 
-            # Update cmd_obj.commands (this triggers _writeCmdJsonFile via setter)
-            cmd_obj.commands = commands
+            self._set_commands(cmd_obj, commands, cmd_name)
 
             printIt(f"Successfully updated command '{cmd_name}' in commands.json", lable.INFO)
 
-            # Also update the Python file's commandJsonDict
-            self.update_python_file_command_json_dict(cmd_name)
+            # Also update the Python file's commandJsonDict, a new command's file is written afterwards
+            if self.command_file_exists(cmd_name):
+                self.update_python_file_command_json_dict(cmd_name)
 
             # Return command data for create mode
             return new_command_cmd_json
@@ -715,8 +1006,7 @@ class CommandManager:
                     commands[cmd_name]["arguments"][arg_name] = the_args[arg_name]
                 arg_index += 1
 
-            # Update cmd_obj.commands (this triggers _writeCmdJsonFile via setter)
-            cmd_obj.commands = commands
+            self._set_commands(cmd_obj, commands, cmd_name)
 
             printIt(f"Successfully updated command '{cmd_name}' in commands.json", lable.INFO)
 
@@ -729,6 +1019,16 @@ class CommandManager:
         else:
             raise ValueError(f"Invalid mode: {mode}. Must be 'create' or 'modify'")
 
+    def _set_commands(self, cmd_obj, commands: Dict[str, Any], cmd_name: str) -> None:
+        \"\"\"Store the updated command in cmd_obj, staged in the model inside a transaction\"\"\"
+        if self._transaction is not None:
+            cmd_obj.commands[cmd_name] = commands[cmd_name]
+            self.load()[cmd_name] = commands[cmd_name]
+            self.mark_dirty()
+        else:
+            # Update cmd_obj.commands (this triggers _writeCmdJsonFile via setter)
+            cmd_obj.commands = commands
+
     def verify_commands_json_integrity(self) -> bool:
         \"\"\"
         Verify that ALL Python command files have their commandJsonDict in sync with commands.json
@@ -750,79 +1050,37 @@ class CommandManager:
             printIt(f"Commands directory not found: {commands_dir}", lable.ERROR)
             return False
 
-        # Check ALL Python files in commands directory
-        for file_name in os.listdir(commands_dir):
-            if not file_name.endswith(".py"):
+        # Check ALL Python files in commands directory, unchanged files come from the index
+        for file_name, entry in self.load_command_index().items():
+            if entry["error"]:
+                issues_found.append(f"Error parsing commandJsonDict in {file_name}: {entry['error']}")
                 continue
 
-            # Skip special files that don't contain commandJsonDict
-            if file_name in ["commands.py", "__init__.py", "cmdOptSwitchboard.py", "cmdSwitchboard.py"]:
+            command_data = entry["commandJsonDict"]
+            if command_data is None:
+                # No commandJsonDict found - this might be OK for some files
                 continue
 
-            file_path = os.path.join(commands_dir, file_name)
-
-            try:
-                # Extract commandJsonDict from Python file
-                with open(file_path, "r") as f:
-                    file_content = f.read()
-
-                # Look for commandJsonDict
-                lines = file_content.split("\\n")
-                start_line = -1
-                end_line = -1
-                brace_count = 0
-                in_dict = False
-
-                for i, line in enumerate(lines):
-                    if "commandJsonDict" in line and "=" in line and "{" in line:
-                        start_line = i
-                        in_dict = True
-                        brace_count = line.count("{") - line.count("}")
-                    elif in_dict:
-                        brace_count += line.count("{") - line.count("}")
-                        if brace_count == 0:
-                            end_line = i
-                            break
-
-                if start_line == -1 or end_line == -1:
-                    # No commandJsonDict found - this might be OK for some files
-                    continue
-
-                # Extract and parse the commandJsonDict
-                dict_lines = lines[start_line : end_line + 1]
-                dict_content = "\\n".join(dict_lines)
-                equals_index = dict_content.find("=")
-                if equals_index != -1:
-                    python_dict_part = dict_content[equals_index + 1 :].strip()
-                    try:
-                        command_data = ast.literal_eval(python_dict_part)
-
-                        # Check each command in the Python file
-                        for cmd_name, cmd_info in command_data.items():
-                            if cmd_name not in commands_json:
-                                issues_found.append(f"Command '{cmd_name}' from {file_name} missing in commands.json")
-                            else:
-                                # Check if the command data matches
-                                json_cmd = commands_json[cmd_name]
-
-                                # Check description
-                                if cmd_info.get("description") != json_cmd.get("description"):
-                                    issues_found.append(
-                                        f"Command '{cmd_name}' description mismatch between {file_name} and commands.json"
-                                    )
-
-                                # Check if major sections exist
-                                for section in ["option_switches", "option_strings", "arguments"]:
-                                    if section in cmd_info and section not in json_cmd:
-                                        issues_found.append(
-                                            f"Command '{cmd_name}' missing {section} section in commands.json"
-                                        )
-
-                    except Exception as e:
-                        issues_found.append(f"Error parsing commandJsonDict in {file_name}: {e}")
-
-            except Exception as e:
-                issues_found.append(f"Error processing {file_name}: {e}")
+            # Check each command in the Python file
+            for cmd_name, cmd_info in command_data.items():
+                if cmd_name not in commands_json:
+                    issues_found.append(f"Command '{cmd_name}' from {file_name} missing in commands.json")
+                else:
+                    # Check if the command data matches
+                    json_cmd = commands_json[cmd_name]
+
+                    # Check description
+                    if cmd_info.get("description") != json_cmd.get("description"):
+                        issues_found.append(
+                            f"Command '{cmd_name}' description mismatch between {file_name} and commands.json"
+                        )
+
+                    # Check if major sections exist
+                    for section in ["option_switches", "option_strings", "arguments"]:
+                        if section in cmd_info and section not in json_cmd:
+                            issues_found.append(
+                                f"Command '{cmd_name}' missing {section} section in commands.json"
+                            )
 
         # Report findings
         if issues_found:
@@ -883,8 +1141,11 @@ class CommandManager:
 
             # Write the repaired commands.json
             try:
-                with open(self.commands_json_path, "w") as f:
-                    json.dump(repaired_commands, f, indent=2, ensure_ascii=False)
+                with fileLock(self.commands_json_path):
+                    atomicWriteJson(self.commands_json_path, repaired_commands, ensure_ascii=False)
+                writeCompletionIndex(repaired_commands)
+                clearHelpCache()
+                self.invalidate()
 
                 total_commands = len([k for k in repaired_commands.keys() if k != "switchFlags"])
                 printIt(f"✅ Successfully repaired commands.json ({total_commands} total commands)", lable.INFO)
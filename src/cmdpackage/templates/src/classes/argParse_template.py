@@ -3,9 +3,10 @@
 from textwrap import dedent
 from string import Template
 
-argParse_template = Template(dedent("""import os, sys, argparse, shlex
+argParse_template = Template(dedent("""import os, sys, argparse, shlex, shutil
 from ..defs.logIt import color, cStr
 from ..commands.commands import Commands
+from ..defs.helpCache import cachedHelp
 
 
 class PiHelpFormatter(argparse.RawTextHelpFormatter):
@@ -33,6 +34,50 @@ class PiHelpFormatter(argparse.RawTextHelpFormatter):
             self._add_item(self._format_action, [action])
 
 
+class LazyHelpParser(argparse.ArgumentParser):
+    # Calls helpBuilder once before help is rendered or an error message is formatted
+    def __init__(self, *args, helpBuilder=None, helpWidth=0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.helpBuilder = helpBuilder
+        self.helpWidth = helpWidth
+
+    def _buildHelp(self):
+        if self.helpBuilder is not None:
+            helpBuilder, self.helpBuilder = self.helpBuilder, None
+            helpBuilder(self)
+
+    def format_help(self):
+        # the rendered text is cached per commands.json hash and terminal width
+        return cachedHelp(f"global-{self.prog}", self.helpWidth, self._renderHelp)
+
+    def _renderHelp(self):
+        self._buildHelp()
+        return super().format_help()
+
+    def error(self, message):
+        self._buildHelp()
+        super().error(message)
+
+
+# Narrowest width help is wrapped to, formatHelpWidth needs room to make progress
+MIN_TERMINAL_COLUMNS = 40
+
+
+def terminalColumns() -> int:
+    \"\"\"Width of the controlling terminal without running stty
+
+    A pty without a size reports 0 columns, that is treated as unknown.
+    \"\"\"
+    for stream in (sys.stdin, sys.stdout):
+        try:
+            columns = os.get_terminal_size(stream.fileno()).columns
+        except (AttributeError, ValueError, OSError):
+            continue
+        if columns > 0:
+            return max(columns, MIN_TERMINAL_COLUMNS)
+    return max(shutil.get_terminal_size().columns or 80, MIN_TERMINAL_COLUMNS)
+
+
 def str_or_int(arg):
     try:
         return int(arg)  # try convert to int
@@ -48,6 +93,8 @@ class ArgParse:
     def __init__(self):
         # Parse command-specific options (double hyphen) before main parsing
         self.cmd_options = {}
+        # Commands are loaded once and shared by option extraction and help
+        self.theCmds = Commands()
         self.filtered_args = self._extract_cmd_options(sys.argv[1:])
         if not sys.stdin.isatty():
             self.parser = argparse.ArgumentParser(add_help=False)
@@ -55,112 +102,137 @@ class ArgParse:
             self.parser.add_argument("arguments", nargs="*")
             self.args = self.parser.parse_args(self.filtered_args)
         else:
-            _, tCols = os.popen("stty size", "r").read().split()
-            tCols = int(tCols)
-            indentPad = 8
-            formatter_class = lambda prog: PiHelpFormatter(prog, max_help_position=8, width=tCols)
-            commandsHelp = ""
-            argumentsHelp = ""
-            theCmds = Commands()
-            commands = theCmds.commands
-            swtcFlag = theCmds.switchFlags["switchFlags"]
-            for cmdName in commands:
-                # Skip metadata entries that are not actual commands
-                if cmdName in ["description", "_globalSwtceFlags"] or not isinstance(commands[cmdName], dict):
-                    continue
-
-                needCmdDescription = True
-                needArgDescription = True
-                command_info = commands[cmdName]
-                argumentsHelp += cStr(cmdName, color.YELLOW) + ": \\n"
-
-                # Handle new structure vs old structure
-                if "arguments" in command_info:
-                    # New structure - arguments are under "arguments" key
-                    arguments = command_info["arguments"]
-                    # Get description from description field
-                    if "description" in command_info:
-                        cmdHelp = cStr(cmdName, color.YELLOW) + ": " + f"{command_info['description']}"
-                        if len(cmdHelp) > tCols:
-                            indentPad = len(cmdName) + 2
-                            cmdHelp = formatHelpWidth(cmdHelp, tCols, indentPad)
-                        else:
-                            cmdHelp += "\\n"
-                        commandsHelp += cmdHelp
-                        needCmdDescription = False
+            self.tCols = terminalColumns()
+            formatter_class = lambda prog: PiHelpFormatter(prog, max_help_position=8, width=self.tCols)
+            swtcFlag = self.theCmds.switchFlags["switchFlags"]
 
-                    # Process arguments
-                    for argName, argDesc in arguments.items():
-                        argHelp = cStr(f"  <{argName}> ", color.CYAN) + f"{argDesc}"
-                        if len(argHelp) > tCols:
-                            indentPad = len(argName) + 5
-                            argHelp = " " + formatHelpWidth(argHelp, tCols, indentPad)
-                        else:
-                            argHelp += "\\n"
-                        argumentsHelp += argHelp
-                        needArgDescription = False
-                else:
-                    # Old structure - iterate through all keys and filter out metadata
-                    for argName in command_info:
-                        if argName == "description":
-                            cmdHelp = cStr(cmdName, color.YELLOW) + ": " + f"{command_info[argName]}"
-                            if len(cmdHelp) > tCols:
-                                indentPad = len(cmdName) + 2
-                                cmdHelp = formatHelpWidth(cmdHelp, tCols, indentPad)
-                            else:
-                                cmdHelp += "\\n"
-                            commandsHelp += cmdHelp
-                            needCmdDescription = False
-                        elif argName not in ["switchFlags", "option_switches", "option_strings"]:
-                            # Only process actual arguments, not metadata
-                            argHelp = cStr(f"  <{argName}> ", color.CYAN) + f"{command_info[argName]}"
-                            if len(argHelp) > tCols:
-                                indentPad = len(argName) + 5
-                                argHelp = " " + formatHelpWidth(argHelp, tCols, indentPad)
-                            else:
-                                argHelp += "\\n"
-                            argumentsHelp += argHelp
-                            needArgDescription = False
-                if needArgDescription:
-                    argumentsHelp = argumentsHelp[:-1]
-                    argumentsHelp += "no arguments\\n"
-                if needCmdDescription:
-                    commandsHelp += cStr(cmdName, color.WHITE) + "\\n"
-            #   commandsHelp = commandsHelp[:-1]
-
-            self.parser = argparse.ArgumentParser(
+            # The command and argument help is filled in by _buildHelp when
+            # help or a parse error is shown, plain command runs skip it
+            self.parser = LazyHelpParser(
                 description="Command Line Tool for creating and managing commands.",
                 epilog="Have Fun!",
                 formatter_class=formatter_class,
+                helpBuilder=self._buildHelp,
+                helpWidth=self.tCols,
             )
 
-            self.parser.add_argument(
+            self.commandsAction = self.parser.add_argument(
                 "commands",
                 type=str,
                 nargs=1,
                 metavar=f'{cStr(cStr("Commands", color.YELLOW), color.UNDERLINE)}:',
-                help=commandsHelp,
+                help="",
             )
 
-            self.parser.add_argument(
+            self.argumentsAction = self.parser.add_argument(
                 "arguments",
                 type=str_or_int,
                 nargs="*",
                 metavar=f'{cStr(cStr("Arguments", color.CYAN), color.UNDERLINE)}:',
                 # metavar="arguments:",
-                help=argumentsHelp,
+                help="",
             )
 
             for optFlag in swtcFlag:
                 flagHelp = swtcFlag[optFlag]
                 self.parser.add_argument(f"-{optFlag}", action="store_true", help=flagHelp)
+            # consumed by defs/startupProfile before parsing, listed here for the help text
+            self.parser.add_argument(
+                "--profile-startup",
+                metavar="cprofile,imports",
+                nargs="?",
+                help="Report startup phase times on stderr, optionally with a cProfile dump and import times",
+            )
+            # handled by classes/batchRun before parsing, listed here for the help text
+            self.parser.add_argument(
+                "--batch",
+                action="store_true",
+                help="Run every stdin line as a command line in this process, must be the first argument",
+            )
+            self.parser.add_argument(
+                "--batch-results",
+                metavar="file",
+                help="Append the JSON result of each --batch command to file instead of stderr",
+            )
             self.args = self.parser.parse_args(self.filtered_args)
 
+    def _buildHelp(self, parser):
+        \"\"\"Build the colored command and argument help text shown by -h\"\"\"
+        tCols = self.tCols
+        indentPad = 8
+        commandsHelp = ""
+        argumentsHelp = ""
+        commands = self.theCmds.commands
+        for cmdName in commands:
+            # Skip metadata entries that are not actual commands
+            if cmdName in ["description", "_globalSwtceFlags"] or not isinstance(commands[cmdName], dict):
+                continue
+
+            needCmdDescription = True
+            needArgDescription = True
+            command_info = commands[cmdName]
+            argumentsHelp += cStr(cmdName, color.YELLOW) + ": \\n"
+
+            # Handle new structure vs old structure
+            if "arguments" in command_info:
+                # New structure - arguments are under "arguments" key
+                arguments = command_info["arguments"]
+                # Get description from description field
+                if "description" in command_info:
+                    cmdHelp = cStr(cmdName, color.YELLOW) + ": " + f"{command_info['description']}"
+                    if len(cmdHelp) > tCols:
+                        indentPad = len(cmdName) + 2
+                        cmdHelp = formatHelpWidth(cmdHelp, tCols, indentPad)
+                    else:
+                        cmdHelp += "\\n"
+                    commandsHelp += cmdHelp
+                    needCmdDescription = False
+
+                # Process arguments
+                for argName, argDesc in arguments.items():
+                    argHelp = cStr(f"  <{argName}> ", color.CYAN) + f"{argDesc}"
+                    if len(argHelp) > tCols:
+                        indentPad = len(argName) + 5
+                        argHelp = " " + formatHelpWidth(argHelp, tCols, indentPad)
+                    else:
+                        argHelp += "\\n"
+                    argumentsHelp += argHelp
+                    needArgDescription = False
+            else:
+                # Old structure - iterate through all keys and filter out metadata
+                for argName in command_info:
+                    if argName == "description":
+                        cmdHelp = cStr(cmdName, color.YELLOW) + ": " + f"{command_info[argName]}"
+                        if len(cmdHelp) > tCols:
+                            indentPad = len(cmdName) + 2
+                            cmdHelp = formatHelpWidth(cmdHelp, tCols, indentPad)
+                        else:
+                            cmdHelp += "\\n"
+                        commandsHelp += cmdHelp
+                        needCmdDescription = False
+                    elif argName not in ["switchFlags", "option_switches", "option_strings"]:
+                        # Only process actual arguments, not metadata
+                        argHelp = cStr(f"  <{argName}> ", color.CYAN) + f"{command_info[argName]}"
+                        if len(argHelp) > tCols:
+                            indentPad = len(argName) + 5
+                            argHelp = " " + formatHelpWidth(argHelp, tCols, indentPad)
+                        else:
+                            argHelp += "\\n"
+                        argumentsHelp += argHelp
+                        needArgDescription = False
+            if needArgDescription:
+                argumentsHelp = argumentsHelp[:-1]
+                argumentsHelp += "no arguments\\n"
+            if needCmdDescription:
+                commandsHelp += cStr(cmdName, color.WHITE) + "\\n"
+        #   commandsHelp = commandsHelp[:-1]
+        self.commandsAction.help = commandsHelp
+        self.argumentsAction.help = argumentsHelp
+
     def _extract_cmd_options(self, args):
         \"\"\"Extract command-specific options(--option and -option) from arguments\"\"\"
         # Get global swtc flags to differentiate from command-specific flags
-        theCmds = Commands()
-        global_swtc_flags = theCmds.switchFlags.get("switchFlags", {})
+        global_swtc_flags = self.theCmds.switchFlags.get("switchFlags", {})
 
         filtered_args = []
         i = 0
@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+batchRun_template = Template(dedent("""import io
+import os
+import sys
+import json
+import time
+import shlex
+import importlib
+import traceback
+from contextlib import contextmanager
+from ..defs.logIt import printIt, lable
+from ..defs.startupProfile import profiler
+
+BATCH_SWITCH = "--batch"
+BATCH_RESULTS_SWITCH = "--batch-results"
+
+
+class BatchInput(io.TextIOWrapper):
+    # stdin shared by the batch loop or shell and the commands they run. The
+    # builtin exit() closes sys.stdin, which must not end the session.
+    def close(self):
+        pass
+
+
+@contextmanager
+def sharedStdin():
+    \"\"\"Replace sys.stdin with a BatchInput over the same file descriptor for the block\"\"\"
+    savedStdin = sys.stdin
+    sys.stdin = BatchInput(open(savedStdin.fileno(), "rb", closefd=False), encoding=savedStdin.encoding)
+    try:
+        yield sys.stdin
+    finally:
+        sys.stdin = savedStdin
+
+
+def runCommandLine(commandLine) -> int:
+    \"\"\"Parse and dispatch one command line in this process and return its exit code
+
+    Args:
+        commandLine (str | list): Command line without the program name, as a
+            string split like a shell would or as a list of arguments
+    \"\"\"
+    from .argParse import ArgParse
+    from .optSwitches import optionStore
+    from ..commands import cmdSwitchbord
+
+    if isinstance(commandLine, str):
+        commandLine = shlex.split(commandLine)
+    savedArgv = sys.argv
+    sys.argv = [savedArgv[0]] + list(commandLine)
+    exitCode = 0
+    try:
+        # commands added or removed by an earlier line are picked up here
+        cmdSwitchbord.loadCommands()
+        importlib.invalidate_caches()
+        with profiler.phase("argParse"):
+            argParse = ArgParse()
+        cmdSwitchbord.cmdSwitchbord(argParse)
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            exitCode = e.code
+        elif e.code is not None:
+            print(e.code, file=sys.stderr)
+            exitCode = 1
+    except Exception:
+        traceback.print_exc()
+        exitCode = 1
+    finally:
+        sys.argv = savedArgv
+        # the next line, or another process, must see this line's option changes
+        optionStore.flush()
+        sys.stdout.flush()
+    return exitCode
+
+
+def runBatch(args: list) -> int:
+    \"\"\"Run every command line read from stdin and report one JSON result per line
+
+    Usage:
+        ${packName} --batch [--batch-results <file>] < commands.txt
+
+    Blank lines and lines starting with # are skipped. Lines read by a
+    command's own prompts are not run. Results, with the command's position in
+    the batch, command line, exit code and duration, are written to stderr or
+    appended to the --batch-results file.
+
+    Returns:
+        int: 0 if every command line succeeded, 1 otherwise
+    \"\"\"
+    resultsFileName = None
+    argIndex = 0
+    while argIndex < len(args):
+        arg = args[argIndex]
+        if arg.startswith(BATCH_RESULTS_SWITCH + "="):
+            resultsFileName = arg.split("=", 1)[1]
+        elif arg == BATCH_RESULTS_SWITCH and argIndex + 1 < len(args):
+            argIndex += 1
+            resultsFileName = args[argIndex]
+        else:
+            printIt(f"Unknown batch argument: {arg}", lable.ERROR)
+            return 2
+        argIndex += 1
+
+    results = open(resultsFileName, "a") if resultsFileName else sys.stderr
+    failed = False
+    try:
+        index = 0
+        with sharedStdin() as batchInput:
+            while True:
+                line = batchInput.readline()
+                if not line:
+                    break
+                commandLine = line.strip()
+                if not commandLine or commandLine.startswith("#"):
+                    continue
+                index += 1
+                start = time.perf_counter()
+                try:
+                    exitCode = runCommandLine(commandLine)
+                except ValueError as e:
+                    # shlex could not split the line
+                    printIt(f"command {index}: {e}", lable.ERROR)
+                    exitCode = 2
+                result = {
+                    "index": index,
+                    "command": commandLine,
+                    "exitCode": exitCode,
+                    "seconds": round(time.perf_counter() - start, 6),
+                }
+                results.write(json.dumps(result) + "\\n")
+                results.flush()
+                failed = failed or exitCode != 0
+    finally:
+        if results is not sys.stderr:
+            results.close()
+    return 1 if failed else 0
+"""))
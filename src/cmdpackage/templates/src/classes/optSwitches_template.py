@@ -3,33 +3,111 @@
 from textwrap import dedent
 from string import Template
 
-optSwitches_template = Template(dedent("""import json
+optSwitches_template = Template(dedent("""import os
+import atexit
+from copy import deepcopy
 from pathlib import Path
 from ..defs.logIt import printIt, lable
+from ..defs.storage import atomicWriteJson, fileLock, jsonTransaction, readJson
 
 # Store command options in src/${packName}/commands/.cmdrc
 rcFileDir = Path(__file__).resolve().parents[1] / "commands"  # Go to src/${packName}/commands
 rcFileName = rcFileDir.joinpath(".cmdrc")
 
 
+class OptionStore:
+    \"\"\"The .cmdrc options of this process.
+
+    .cmdrc is read once and read again only when its stat changes. Every change
+    is an edit function applied to the loaded data at once and remembered; the
+    edits are replayed on the current file under its lock and written with one
+    atomic write when the process exits, so changes another process made in the
+    meantime are kept.
+    \"\"\"
+
+    def __init__(self, fileName: Path) -> None:
+        self.fileName = fileName
+        self._data = None
+        self._stat = None
+        self._edits = []
+        self._flushPid = None
+
+    def _fileStat(self):
+        try:
+            fileStat = os.stat(self.fileName)
+        except OSError:
+            return None
+        return (fileStat.st_mtime_ns, fileStat.st_size)
+
+    def _read(self) -> dict:
+        try:
+            data = readJson(self.fileName)
+        except ValueError as e:
+            printIt(f"Error reading .cmdrc: {e}", lable.WARN)
+            data = None
+        return _ensureCmdrcSections(data if isinstance(data, dict) else {})
+
+    @property
+    def data(self) -> dict:
+        \"\"\"The .cmdrc content including edits not yet written\"\"\"
+        fileStat = self._fileStat()
+        if self._data is None or fileStat != self._stat:
+            self._data = self._read()
+            self._stat = fileStat
+            for edit in self._edits:
+                edit(self._data)
+        return self._data
+
+    def update(self, edit) -> None:
+        \"\"\"Apply edit(data) now and write it to .cmdrc with the others at exit\"\"\"
+        edit(self.data)
+        self._edits.append(edit)
+        if self._flushPid != os.getpid():
+            # registered per process, forked warm server children clear atexit
+            self._flushPid = os.getpid()
+            atexit.register(self.flush)
+
+    def flush(self) -> bool:
+        \"\"\"Write the pending edits to .cmdrc in one locked, atomic write\"\"\"
+        if not self._edits:
+            return True
+        try:
+            with jsonTransaction(self.fileName, default={}) as data:
+                _ensureCmdrcSections(data)
+                for edit in self._edits:
+                    edit(data)
+        except (OSError, ValueError) as e:
+            printIt(f"Error writing .cmdrc: {e}", lable.ERROR)
+            return False
+        self._edits = []
+        self._data = data
+        self._stat = self._fileStat()
+        return True
+
+    def write(self, data: dict) -> None:
+        \"\"\"Replace the whole .cmdrc content now, dropping pending edits\"\"\"
+        with fileLock(self.fileName):
+            atomicWriteJson(self.fileName, data)
+        self._edits = []
+        self._data = _ensureCmdrcSections(data)
+        self._stat = self._fileStat()
+
+
+optionStore = OptionStore(rcFileName)
+
+
 class optSwitches:
     def __init__(self, switchFlags: dict) -> None:
         self.switchFlags = switchFlags
         self.optSwitches = readoptSwitches()
 
     def toggleSwtcFlag(self, swtcFlag: str):
-        optSwitches = {}
-        optSwitches["switchFlags"] = {}
         currSwtcFlag = swtcFlag[1:]
         if swtcFlag[0] in "+":
             currSwtcValue = True  # not (self.optSwitches["switchFlags"][currSwtcFlag] == True)
         else:
             currSwtcValue = False
-        try:
-            self.optSwitches["switchFlags"][currSwtcFlag] = currSwtcValue
-        except:
-            print("here")
-            self.optSwitches["switchFlags"][currSwtcFlag] = True
+        self.optSwitches["switchFlags"][currSwtcFlag] = currSwtcValue
         writeOptJson(self.optSwitches, self.switchFlags)
 
 
@@ -54,38 +132,24 @@ def removeCmdSwitchOptions(cmdName: str):
 
 
 def readoptSwitches() -> dict:
-    global rcFileName
     optSwitches = {}
-    if rcFileName.is_file():
-        with open(rcFileName, "r") as rf:
-            rawRcJson = json.load(rf)
-        # Handle new .cmdrc structure (option_switches, option_strings, commands)
-        # Map to old structure for backward compatibility
-        optSwitches["switchFlags"] = rawRcJson.get("option_switches", {})
-        optSwitches["commandFlags"] = rawRcJson.get("commands", {})
-    else:
-        # Initialize new structure
-        optSwitches["switchFlags"] = {}
-        optSwitches["commandFlags"] = {}
+    # Map the .cmdrc structure (option_switches, option_strings, commands)
+    # to the old structure for backward compatibility
+    rawRcJson = optionStore.data
+    optSwitches["switchFlags"] = dict(rawRcJson["option_switches"])
+    optSwitches["commandFlags"] = deepcopy(rawRcJson["commands"])
     return optSwitches
 
 
 def writeOptJson(optSwitches: dict, switchFlags: dict) -> dict:
-    global rcFileName
-    rawRC = {}
-    if rcFileName.is_file():
-        with open(rcFileName, "r") as rf:
-            rawRC = json.load(rf)
-    rawRC = rawRC | optSwitches
-    for swtcFlag in switchFlags.keys():  # fill in missing items'
-        try:
-            _ = rawRC["switchFlags"][swtcFlag]
-        except:
-            rawRC["switchFlags"][swtcFlag] = False
-    # printIt(formatOptStr(rawRC["switchFlags"]), lable.INFO)
-    with open(rcFileName, "w") as wf:
-        json.dump(rawRC, wf, indent=2)
-    return rawRC
+    def edit(rawRC: dict):
+        rawRC["option_switches"].update(optSwitches["switchFlags"])
+        for swtcFlag in switchFlags.keys():  # fill in missing items
+            rawRC["option_switches"].setdefault(swtcFlag, False)
+
+    optionStore.update(edit)
+    # printIt(formatOptStr(optionStore.data["option_switches"]), lable.INFO)
+    return optionStore.data
 
 
 def formatOptStr(optSwitches: dict) -> str:
@@ -103,48 +167,39 @@ def formatOptStr(optSwitches: dict) -> str:
 
 def get_cmdrc_path() -> Path:
     \"\"\"Get the path to the .cmdrc file for command storage\"\"\"
-    # Get the path relative to this file: src/${packName}/defs/utilities.py
-    # Go up to src/${packName}/commands/.cmdrc
-    current_file = Path(__file__).resolve()
-    commands_dir = current_file.parent.parent / "commands"
-    return commands_dir / ".cmdrc"
+    return optionStore.fileName
 
 
 def read_cmdrc() -> dict:
-    \"\"\"Read the command storage file (.cmdrc) and return the data\"\"\"
-    cmdrc_path = get_cmdrc_path()
+    \"\"\"Return a copy of the command storage (.cmdrc) data\"\"\"
+    return deepcopy(optionStore.data)
 
-    if not cmdrc_path.exists():
-        # Create default structure if file doesn't exist
-        return {"option_switches": {}, "option_strings": {}, "commands": {}}
 
-    try:
-        with open(cmdrc_path, "r") as f:
-            data = json.load(f)
-            # Ensure all required sections exist
-            if "option_switches" not in data:
-                data["option_switches"] = {}
-            if "option_strings" not in data:
-                data["option_strings"] = {}
-            if "commands" not in data:
-                data["commands"] = {}
-            return data
-    except (json.JSONDecodeError, FileNotFoundError) as e:
-        printIt(f"Error reading .cmdrc: {e}", lable.WARN)
-        return {"option_switches": {}, "option_strings": {}, "commands": {}}
+def _ensureCmdrcSections(data: dict) -> dict:
+    \"\"\"Ensure all required .cmdrc sections exist\"\"\"
+    if "option_switches" not in data:
+        data["option_switches"] = {}
+    if "option_strings" not in data:
+        data["option_strings"] = {}
+    if "commands" not in data:
+        data["commands"] = {}
+    return data
+
+
+def _commandSection(data: dict, cmd_name: str) -> dict:
+    \"\"\"Return the .cmdrc section of cmd_name, created if it doesn't exist\"\"\"
+    _ensureCmdrcSections(data)
+    if cmd_name not in data["commands"]:
+        data["commands"][cmd_name] = {"option_switches": {}, "option_strings": {}}
+    return data["commands"][cmd_name]
 
 
 def write_cmdrc(data: dict) -> bool:
     \"\"\"Write data to the command storage file (.cmdrc)\"\"\"
-    cmdrc_path = get_cmdrc_path()
-
     try:
         # Ensure directory exists
-        cmdrc_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Write with pretty formatting
-        with open(cmdrc_path, "w") as f:
-            json.dump(data, f, indent=2)
+        optionStore.fileName.parent.mkdir(parents=True, exist_ok=True)
+        optionStore.write(data)
         return True
     except Exception as e:
         printIt(f"Error writing .cmdrc: {e}", lable.ERROR)
@@ -160,70 +215,62 @@ def save_command_options(cmd_name: str, cmd_options: dict, cmd_option_definition
         cmd_options: Dict of option names to values
         cmd_option_definitions: Dict of option definitions with type info
     \"\"\"
-    data = read_cmdrc()
 
-    # Initialize command section if it doesn't exist
-    if cmd_name not in data["commands"]:
-        data["commands"][cmd_name] = {"option_switches": {}, "option_strings": {}}
+    def edit(data: dict):
+        cmdSection = _commandSection(data, cmd_name)
+
+        # Process each option based on its type
+        for option_name, option_value in cmd_options.items():
+            if option_name in cmd_option_definitions:
+                option_def = cmd_option_definitions[option_name]
+                option_type = option_def.get("type", "str")
+
+                if option_type == "bool":
+                    # Boolean option - save to option_switches
+                    cmdSection.setdefault("option_switches", {})[option_name] = bool(option_value)
+                elif option_type == "str":
+                    # String option - save to option_strings
+                    if option_value == "__STRING_OPTION__":
+                        cmdSection.setdefault("option_strings", {})[option_name] = ""
+                    else:
+                        cmdSection.setdefault("option_strings", {})[option_name] = str(option_value)
 
-    # Process each option based on its type
-    for option_name, option_value in cmd_options.items():
-        if option_name in cmd_option_definitions:
-            option_def = cmd_option_definitions[option_name]
-            option_type = option_def.get("type", "str")
-
-            if option_type == "bool":
-                # Boolean option - save to option_switches
-                data["commands"][cmd_name]["option_switches"][option_name] = bool(option_value)
-            elif option_type == "str":
-                # String option - save to option_strings
-                if option_value == "__STRING_OPTION__":
-                    data["commands"][cmd_name]["option_strings"][option_name] = ""
-                else:
-                    data["commands"][cmd_name]["option_strings"][option_name] = str(option_value)
-
-    # Write back to file
-    if write_cmdrc(data):
+    try:
+        optionStore.update(edit)
         printIt(f"Command options saved for '{cmd_name}'", lable.INFO)
-    else:
-        printIt(f"Failed to save command options for '{cmd_name}'", lable.ERROR)
+    except Exception as e:
+        printIt(f"Failed to save command options for '{cmd_name}': {e}", lable.ERROR)
 
 
 def toggle_command_option(cmd_name: str, option_name: str, set_value: bool) -> None:
     \"\"\"Toggle a command-specific boolean option in .cmdrc\"\"\"
-    data = read_cmdrc()
 
-    # Initialize command section if it doesn't exist
-    if cmd_name not in data["commands"]:
-        data["commands"][cmd_name] = {"option_switches": {}, "option_strings": {}}
-
-    # Set the option value
-    data["commands"][cmd_name]["option_switches"][option_name] = set_value
+    def edit(data: dict):
+        _commandSection(data, cmd_name).setdefault("option_switches", {})[option_name] = set_value
 
-    # Write back to file
-    if write_cmdrc(data):
+    try:
+        optionStore.update(edit)
         status = "enabled" if set_value else "disabled"
         printIt(f"Command option '{option_name}' {status} for '{cmd_name}'", lable.INFO)
-    else:
-        printIt(f"Failed to toggle command option '{option_name}' for '{cmd_name}'", lable.ERROR)
+    except Exception as e:
+        printIt(f"Failed to toggle command option '{option_name}' for '{cmd_name}': {e}", lable.ERROR)
 
 
 def get_command_options(cmd_name: str) -> dict:
     \"\"\"Get stored command-specific options from .cmdrc\"\"\"
-    data = read_cmdrc()
-    return data.get("commands", {}).get(cmd_name, {})
+    return deepcopy(optionStore.data["commands"].get(cmd_name, {}))
 
 
 def remove_command_options(cmd_name: str) -> None:
     \"\"\"Remove all stored options for a specific command from .cmdrc\"\"\"
-    data = read_cmdrc()
 
-    if "commands" in data and cmd_name in data["commands"]:
-        del data["commands"][cmd_name]
+    def edit(data: dict):
+        data.get("commands", {}).pop(cmd_name, None)
 
-        if write_cmdrc(data):
+    try:
+        if cmd_name in optionStore.data["commands"]:
+            optionStore.update(edit)
             printIt(f"Command options removed for '{cmd_name}'", lable.INFO)
-        else:
-            printIt(f"Failed to remove command options for '{cmd_name}'", lable.ERROR)
+    except Exception as e:
+        printIt(f"Failed to remove command options for '{cmd_name}': {e}", lable.ERROR)
 """))
-
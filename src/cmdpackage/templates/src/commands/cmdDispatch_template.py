@@ -0,0 +1,156 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+cmdDispatch_template = Template(dedent("""import os
+import sys
+import json
+import importlib
+from ..defs.storage import atomicWriteJson
+
+# Third party packages can add commands by registering entry points in this group:
+#   [project.entry-points."${packName}.commands"]
+#   myCmd = "my_package.my_module:myCmd"
+ENTRY_POINT_GROUP = "${packName}.commands"
+DISPATCH_FILE_NAME = "dispatch.json"
+# Entry point names of ENTRY_POINT_GROUP, reused while sys.path is unchanged
+ENTRY_POINT_CACHE_FILE_NAME = ".entrypoints.json"
+
+_cmdFileDir = os.path.dirname(os.path.abspath(__file__))
+_dispatchFileName = os.path.join(_cmdFileDir, DISPATCH_FILE_NAME)
+_cmdJsonFileName = os.path.join(_cmdFileDir, "commands.json")
+_entryPointCacheFileName = os.path.join(_cmdFileDir, ENTRY_POINT_CACHE_FILE_NAME)
+
+# Per process caches: resolved callables, the dispatch table and entry points
+_resolved = {}
+_dispatchTable = None
+_entryPoints = None
+_entryPointNames = None
+
+
+def _commandsFingerprint() -> list:
+    try:
+        jsonStat = os.stat(_cmdJsonFileName)
+    except OSError:
+        return []
+    return [jsonStat.st_mtime_ns, jsonStat.st_size]
+
+
+def writeDispatchTable(commands: dict) -> dict:
+    \"\"\"Write dispatch.json mapping every command to its module and callable\"\"\"
+    global _dispatchTable
+    table = {
+        cmdName: {"module": f"{__package__}.{cmdName}", "callable": cmdName}
+        for cmdName, cmdInfo in commands.items()
+        if isinstance(cmdInfo, dict) and cmdName != "switchFlags"
+    }
+    dispatchData = {"commandsFingerprint": _commandsFingerprint(), "commands": table}
+    try:
+        atomicWriteJson(_dispatchFileName, dispatchData)
+    except OSError:
+        # read only install, the table is still used from memory
+        pass
+    _dispatchTable = table
+    _resolved.clear()
+    return table
+
+
+def _loadDispatchTable() -> dict:
+    global _dispatchTable
+    if _dispatchTable is not None:
+        return _dispatchTable
+    try:
+        with open(_dispatchFileName, "r") as fr:
+            dispatchData = json.load(fr)
+        if dispatchData.get("commandsFingerprint") == _commandsFingerprint():
+            _dispatchTable = dispatchData["commands"]
+            return _dispatchTable
+    except (OSError, ValueError, KeyError):
+        pass
+    # missing or older than commands.json, regenerate it
+    from .commands import Commands
+
+    return writeDispatchTable(Commands().commands)
+
+
+def _loadEntryPoints() -> dict:
+    global _entryPoints
+    if _entryPoints is None:
+        from importlib.metadata import entry_points
+
+        _entryPoints = {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+    return _entryPoints
+
+
+def _sysPathFingerprint() -> list:
+    # installing or removing a distribution changes the mtime of its sys.path directory
+    fingerprint = []
+    for pathDir in sys.path:
+        try:
+            fingerprint.append([pathDir, os.stat(pathDir or ".").st_mtime_ns])
+        except OSError:
+            fingerprint.append([pathDir, None])
+    return fingerprint
+
+
+def _loadEntryPointNames() -> set:
+    \"\"\"Return the entry point names of ENTRY_POINT_GROUP
+
+    The names are cached in .entrypoints.json with a sys.path fingerprint, so
+    a command missing from commands.json does not scan every installed
+    distribution on each run.
+    \"\"\"
+    global _entryPointNames
+    if _entryPointNames is not None:
+        return _entryPointNames
+    fingerprint = _sysPathFingerprint()
+    try:
+        with open(_entryPointCacheFileName, "r") as fr:
+            cacheData = json.load(fr)
+        if cacheData.get("sysPathFingerprint") == fingerprint:
+            _entryPointNames = set(cacheData["names"])
+            return _entryPointNames
+    except (OSError, ValueError, KeyError):
+        pass
+    _entryPointNames = set(_loadEntryPoints())
+    try:
+        atomicWriteJson(_entryPointCacheFileName, {"sysPathFingerprint": fingerprint, "names": sorted(_entryPointNames)})
+    except OSError:
+        # read only install, the names are still used from memory
+        pass
+    return _entryPointNames
+
+
+def isRegisteredCommand(cmdName: str) -> bool:
+    \"\"\"Return True if an installed package registers cmdName as an entry point\"\"\"
+    return cmdName in _loadEntryPointNames()
+
+
+def resolveCommand(cmdName: str):
+    \"\"\"Return the callable implementing cmdName
+
+    Resolution order: the per process cache, the dispatch table written
+    alongside commands.json, the ${packName}.commands entry point group and
+    finally the commands/<cmdName>.py convention.
+    \"\"\"
+    cmdFunc = _resolved.get(cmdName)
+    if cmdFunc is not None:
+        return cmdFunc
+    entry = _loadDispatchTable().get(cmdName)
+    if entry is not None:
+        cmdFunc = getattr(importlib.import_module(entry["module"]), entry["callable"])
+    elif cmdName in _loadEntryPoints():
+        cmdFunc = _loadEntryPoints()[cmdName].load()
+    else:
+        cmdFunc = getattr(importlib.import_module(f"{__package__}.{cmdName}"), cmdName)
+    _resolved[cmdName] = cmdFunc
+    return cmdFunc
+
+
+def invalidate() -> None:
+    \"\"\"Forget resolved commands and the loaded dispatch table\"\"\"
+    global _dispatchTable
+    _resolved.clear()
+    _dispatchTable = None
+"""))
@@ -8,17 +8,27 @@ from argparse import Namespace
 from ..defs.logIt import printIt, lable, cStr, color
 from .commands import Commands
 from .cmdOptSwitchbord import cmdOptSwitchbord
-from ..classes.argParse import ArgParse
+from ..classes.argParse import ArgParse, terminalColumns
 from ..classes.optSwitches import saveCmdSwitchOptions, toggleCmdSwitchOption
+from ..defs.startupProfile import profiler
+from .cmdDispatch import resolveCommand, isRegisteredCommand
+from ..defs.helpCache import cachedHelp, renderedOutput
+
+
+def loadCommands():
+    \"\"\"Bind commands and switchFlags to the current Commands registry\"\"\"
+    global cmdObj, commands, switchFlags
+    cmdObj = Commands()
+    commands = cmdObj.commands
+    # Handle both old and new global switch structure
+    if hasattr(cmdObj, "switchFlags") and "switchFlags" in cmdObj.switchFlags:
+        switchFlags = cmdObj.switchFlags["switchFlags"]
+    else:
+        # Try new structure or fallback to empty
+        switchFlags = cmdObj.switchFlags.get("option_switches", {})
+
 
-cmdObj = Commands()
-commands = cmdObj.commands
-# Handle both old and new global switch structure
-if hasattr(cmdObj, "switchFlags") and "switchFlags" in cmdObj.switchFlags:
-    switchFlags = cmdObj.switchFlags["switchFlags"]
-else:
-    # Try new structure or fallback to empty
-    switchFlags = cmdObj.switchFlags.get("option_switches", {})
+loadCommands()
 
 
 def printCommandHelp(cmdName: str):
@@ -26,7 +36,11 @@ def printCommandHelp(cmdName: str):
     if cmdName not in commands:
         printIt(f"Command '{cmdName}' not found", lable.ERROR)
         return
+    sys.stdout.write(cachedHelp(f"cmd-{cmdName}", terminalColumns(), lambda: renderedOutput(renderCommandHelp, cmdName)))
+
 
+def renderCommandHelp(cmdName: str):
+    \"\"\"Print the help of an existing command, printCommandHelp caches the output\"\"\"
     cmdInfo = commands[cmdName]
 
     # Print command description
@@ -207,7 +221,8 @@ def cmdSwitchbord(argParse: ArgParse):
                     printCommandHelp(cmdName)
                     exit()
 
-                # Check for flag toggle operations anywhere in the arguments
+                # Check for flag toggle operations anywhere in the arguments, optionStore
+                # collects them and writes .cmdrc once when the process exits
                 cmdName = sys.argv[1]
                 for i in range(2, len(sys.argv)):
                     arg = sys.argv[i]
@@ -283,16 +298,19 @@ def cmdSwitchbord(argParse: ArgParse):
 
             args: Namespace = argParse.args
             theCmd = args.commands[0]
-            if theCmd in commands.keys():
+            # entry points are only looked up for names missing from commands.json
+            if theCmd in commands.keys() or isRegisteredCommand(theCmd):
                 # Save command-specific swtc flags before executing command
                 # Skip if a flag toggle already occurred to avoid overwriting the toggle
                 if hasattr(argParse, "cmd_options") and argParse.cmd_options and not flag_toggle_occurred:
-                    cmdswitchFlags = commands[theCmd].get("switchFlags", {})
+                    cmdswitchFlags = commands.get(theCmd, {}).get("switchFlags", {})
                     if cmdswitchFlags:
-                        saveCmdswitchFlags(theCmd, argParse.cmd_options, cmdswitchFlags)
+                        saveCmdSwitchOptions(theCmd, argParse.cmd_options, cmdswitchFlags)
 
-                exec(f"from ..commands.{theCmd} import {theCmd}")
-                exec(f"{theCmd}(argParse)")
+                with profiler.phase("import"):
+                    cmdFunc = resolveCommand(theCmd)
+                with profiler.phase("execute"):
+                    cmdFunc(argParse)
             else:
                 theArgs = args.arguments
                 argIndex = 0
@@ -307,6 +325,6 @@ def cmdSwitchbord(argParse: ArgParse):
     except Exception as e:
         tb_str = "".join(traceback.format_exception(None, e, e.__traceback__))
         printIt(f"{theCmd}\\n{tb_str}", lable.ERROR)
-        exit()
+        exit(1)
 """))
 
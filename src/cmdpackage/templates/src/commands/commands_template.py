@@ -7,14 +7,35 @@ commands_template = Template(dedent("""import json
 import os
 from copy import copy
 import inspect
+from ..defs.startupProfile import profiler
+from .cmdDispatch import writeDispatchTable
+from ..defs.helpCache import clearHelpCache
+from ..defs.completionIndex import writeCompletionIndex
+from ..defs.storage import atomicWriteJson, fileLock
+from ..defs.cmdJsonDict import readCommandJsonDict
+
+
+# .py files without a commandJsonDict and the mtime they were examined at
+SCAN_STATE_FILE_NAME = ".cmdscan.json"
 
 
 class Commands(object):
+    NON_COMMAND_FILES = ["commands.py", "__init__.py", "cmdOptSwitchbord.py", "cmdSwitchbord.py", "cmdDispatch.py"]
+
+    # Process wide command registry shared by every Commands() instance. It is
+    # rebuilt only when the stat fingerprint of the command files changes.
+    _registry = {}
+
     def __init__(self) -> None:
         self.cmdFileDir = os.path.dirname(inspect.getfile(self.__class__))
         self.cmdFileName = os.path.join(self.cmdFileDir, "commands.json")
+        registry = Commands._registry
+        if registry and registry["fingerprint"] == self._fingerprint():
+            self._switchFlags = registry["switchFlags"]
+            self._commands = registry["commands"]
+            return
         try:
-            with open(self.cmdFileName, "r") as fr:
+            with profiler.phase("commands"), open(self.cmdFileName, "r") as fr:
                 rawJson = json.load(fr)
                 self._switchFlags = {}
 
@@ -39,13 +60,47 @@ class Commands(object):
                             del rawJson[key]
                     self._commands = rawJson
 
-            self.checkForUpdates()
+            with profiler.phase("commands"):
+                self.checkForUpdates()
 
             # Verify commands.json integrity with tracked Python files
-            self._verify_integrity()
+            with profiler.phase("integrity"):
+                self._verify_integrity()
 
         except json.decoder.JSONDecodeError:
             self.rebuildCommandsJson()
+        self._remember()
+
+    def _pyFileStats(self) -> dict:
+        \"\"\"mtime of every .py file in the commands directory, from one scandir\"\"\"
+        try:
+            with os.scandir(self.cmdFileDir) as entries:
+                return {entry.name: entry.stat().st_mtime_ns for entry in entries if entry.name.endswith(".py")}
+        except OSError:
+            return {}
+
+    def _fingerprint(self):
+        \"\"\"Cheap stat based fingerprint of the command files and commands.json\"\"\"
+        # the directory mtime is not used, it also moves when dispatch.json or
+        # another cache file next to the commands is replaced
+        try:
+            jsonStat = os.stat(self.cmdFileName)
+        except OSError:
+            return None
+        return (tuple(sorted(self._pyFileStats().items())), jsonStat.st_mtime_ns, jsonStat.st_size)
+
+    def _remember(self):
+        \"\"\"Make this instance's commands the process wide registry\"\"\"
+        Commands._registry = {
+            "fingerprint": self._fingerprint(),
+            "switchFlags": self._switchFlags,
+            "commands": self._commands,
+        }
+
+    @classmethod
+    def invalidate(cls):
+        \"\"\"Drop the registry so the next Commands() reloads commands.json\"\"\"
+        cls._registry = {}
 
     def _verify_integrity(self):
         \"\"\"Verify commands.json integrity and auto-repair if needed\"\"\"
@@ -92,63 +147,77 @@ class Commands(object):
         # outJson = copy(self._switchFlags)
         # outJson.update(self._commands)
         outJson = self._switchFlags | self._commands
-        with open(self.cmdFileName, "w") as fw:
-            json.dump(outJson, fw, indent=2)
+        with fileLock(self.cmdFileName):
+            atomicWriteJson(self.cmdFileName, outJson)
+        writeDispatchTable(self._commands)
+        writeCompletionIndex(self._commands)
+        clearHelpCache()
+        self._remember()
+
+    def _readScanState(self) -> dict:
+        try:
+            with open(os.path.join(self.cmdFileDir, SCAN_STATE_FILE_NAME), "r") as fr:
+                pyFiles = json.load(fr).get("pyFiles")
+        except (OSError, ValueError, AttributeError):
+            return {}
+        return pyFiles if isinstance(pyFiles, dict) else {}
+
+    def _writeScanState(self, pyFiles: dict):
+        try:
+            atomicWriteJson(os.path.join(self.cmdFileDir, SCAN_STATE_FILE_NAME), {"pyFiles": pyFiles})
+        except OSError:
+            pass
 
     def checkForUpdates(self):
-        dirList = os.listdir(self.cmdFileDir)
-        for aFile in dirList:
-            if not aFile in [
-                "commands.py",
-                "__init__.py",
-                "cmdOptSwtcboard.py",
-                "cmdSwtcboard.py",
-            ]:
-                if aFile[:-2] == "py":
-                    chkName = aFile[:-3]
-                    if chkName not in self.commands and chkName != "commands":
-                        commandJsonDict = self.extractCommandJsonDict(aFile)
-                        self._commands[chkName] = commandJsonDict
-        self._writeCmdJsonFile()
+        \"\"\"Add command files dropped into the commands directory since the last scan\"\"\"
+        # One scandir gives the .py names and mtimes. Files that are already
+        # commands, or were examined with the same mtime and held no
+        # commandJsonDict, are not opened, so an unchanged directory is a
+        # read only check.
+        pyFiles = self._pyFileStats()
+        scannedFiles = self._readScanState()
+        newFiles = [
+            aFile
+            for aFile, mtimeNs in sorted(pyFiles.items())
+            if aFile not in self.NON_COMMAND_FILES
+            and aFile[:-3] not in self._commands
+            and scannedFiles.get(aFile) != mtimeNs
+        ]
+        if not newFiles:
+            return
+        updated = False
+        for aFile in newFiles:
+            # extractCommandJsonDict adds the command when the file defines one
+            if self.extractCommandJsonDict(aFile):
+                updated = True
+        # commands.json is only written when a new command file was found
+        if updated:
+            self._writeCmdJsonFile()
+        # remember the examined files that are not commands
+        scannedFiles = {
+            aFile: mtimeNs
+            for aFile, mtimeNs in (scannedFiles | {aFile: pyFiles[aFile] for aFile in newFiles}).items()
+            if aFile in pyFiles and aFile[:-3] not in self._commands
+        }
+        self._writeScanState(scannedFiles)
 
     def rebuildCommandsJson(self):
         dirList = os.listdir(self.cmdFileDir)
         self._commands = {}
         for aFile in dirList:
-            if not aFile in [
-                "commands.py",
-                "__init__.py",
-                "cmdOptSwtcboard.py",
-                "cmdSwtcboard.py",
-            ]:
-                if aFile[:-2] == "py":
-                    chkName = aFile[:-3]
-                    commandJsonDict = self.extractCommandJsonDict(aFile)
-                    self._commands[chkName] = commandJsonDict
+            if aFile.endswith(".py") and aFile not in self.NON_COMMAND_FILES:
+                self.extractCommandJsonDict(aFile)
         self._writeCmdJsonFile()
 
     def extractCommandJsonDict(self, fileName: str) -> dict:
-        cmdJsonDict = {}
-        filePath = os.path.join(self.cmdFileDir, fileName)
-        with open(filePath, "r") as fr:
-            fileLines = fr.readlines()
-        inCmdJsonDict = False
-        cmdJsonLines = []
-        for line in fileLines:
-            if line.strip().startswith("commandJsonDict = {"):
-                inCmdJsonDict = True
-            if inCmdJsonDict:
-                cmdJsonLines.append(line)
-            if inCmdJsonDict and line.strip().endswith("}"):
-                inCmdJsonDict = False
-                break
-        cmdJsonStr = "".join(cmdJsonLines).replace("commandJsonDict =", "").strip()
+        \"\"\"Register the command defined by fileName's commandJsonDict and return the dict\"\"\"
         try:
-            cmdJsonDict = json.loads(cmdJsonStr)
-            cmdName = list(cmdJsonDict.keys())[0]
-            self._commands[cmdName] = cmdJsonDict[cmdName]
-        except json.JSONDecodeError:
-            pass
+            cmdJsonDict = readCommandJsonDict(os.path.join(self.cmdFileDir, fileName)) or {}
+        except (OSError, SyntaxError, ValueError, UnicodeDecodeError):
+            return {}
+        for cmdName, cmdDef in cmdJsonDict.items():
+            self._commands[cmdName] = cmdDef
+            break
         return cmdJsonDict
 """))
 
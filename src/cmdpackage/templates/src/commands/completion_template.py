@@ -0,0 +1,36 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+completion_template = Template(dedent("""from ..defs.logIt import printIt, lable
+from ..defs.completionIndex import COMPLETION_SHELLS, completionScript, writeCompletionIndex
+
+commandJsonDict = {
+    "completion": {
+        "description": "Print the ${packName} shell completion script for bash, zsh or fish, or rewrite the completion index.",
+        "option_switches": {},
+        "option_strings": {},
+        "arguments": {
+            "bash": "Print the bash completion script",
+            "zsh": "Print the zsh completion script",
+            "fish": "Print the fish completion script",
+            "index": "Rewrite the completion index from commands.json",
+        },
+    }
+}
+
+
+def completion(argParse):
+    \"\"\"Print a completion script or rewrite the completion index\"\"\"
+    theArgs = argParse.args.arguments
+    if len(theArgs) == 0:
+        printIt("No shell specified. Usage: ${packName} completion bash|zsh|fish|index", lable.ERROR)
+        return
+    if theArgs[0] == "index":
+        writeCompletionIndex()
+    elif theArgs[0] in COMPLETION_SHELLS:
+        print(completionScript(theArgs[0]), end="")
+    else:
+        printIt(f"Unknown shell '{theArgs[0]}', use one of: {', '.join(COMPLETION_SHELLS)}", lable.ERROR)
+"""))
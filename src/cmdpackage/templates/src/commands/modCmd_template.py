@@ -10,7 +10,6 @@ from ..defs.validation import (
     check_command_uses_argcmddef_template,
 )
 from ..classes.argParse import ArgParse
-from ..classes.optSwitches import saveCmdSwitchOptions
 from ..classes.CommandManager import command_manager
 from .commands import Commands
 from .templates.argCmdDef import cmdDefTemplate
@@ -68,30 +67,32 @@ def modCmd(argParse: ArgParse):
         actual_modifications = {k: v for k, v in theArgs.items() if k != "_option_details"}
         if len(actual_modifications) > 0 or (theArgs.get("_option_details") and len(theArgs["_option_details"]) > 0):
             # updateCMDJson(cmdObj, modCmdName, theArgs)
-            command_manager.update_command_json(cmdObj, theArgs, cmd_name=modCmdName, mode="modify")
-
-            # If command uses argCmdDef template, add new argument functions to the .py file
-            if uses_argcmddef:
-                add_new_argument_functions(modCmdName, theArgs, tracking)
-
-            # Save new option details to .${packName}rc if any were added
-            option_details = theArgs.get("_option_details", {})
-            if option_details:
-                # Extract options for the command being modified
-                new_cmd_options = {}
-
-                for option_name, option_def in option_details.items():
-                    option_type = option_def.get("type", "str")
-                    if option_type == "bool":
-                        # Boolean option - save with default value False
-                        new_cmd_options[option_name] = False
-                    elif option_type == "str":
-                        # String option - save with empty string default
-                        new_cmd_options[option_name] = ""
-
-                # Save the options to .${packName}rc using the saveCmdSwitchOptions function
-                if new_cmd_options:
-                    saveCmdSwitchOptions(modCmdName, new_cmd_options, option_details)
+            # commands.json, the command file and .cmdrc are committed together
+            with command_manager.transaction():
+                command_manager.update_command_json(cmdObj, theArgs, cmd_name=modCmdName, mode="modify")
+
+                # If command uses argCmdDef template, add new argument functions to the .py file
+                if uses_argcmddef:
+                    add_new_argument_functions(modCmdName, theArgs, tracking)
+
+                # Save new option details to .${packName}rc if any were added
+                option_details = theArgs.get("_option_details", {})
+                if option_details:
+                    # Extract options for the command being modified
+                    new_cmd_options = {}
+
+                    for option_name, option_def in option_details.items():
+                        option_type = option_def.get("type", "str")
+                        if option_type == "bool":
+                            # Boolean option - save with default value False
+                            new_cmd_options[option_name] = False
+                        elif option_type == "str":
+                            # String option - save with empty string default
+                            new_cmd_options[option_name] = ""
+
+                    # Save the options to .cmdrc as part of the transaction
+                    if new_cmd_options:
+                        command_manager.save_command_options(modCmdName, new_cmd_options, option_details)
 
             # Print detailed modification results
             print_modification_results(modCmdName, tracking)
@@ -272,17 +273,12 @@ def add_new_argument_functions(cmdName: str, theArgs: dict, tracking: dict) -> N
     if not new_arguments:
         return
 
-    fileDir = os.path.dirname(__file__)
-    fileName = os.path.join(fileDir, f"{cmdName}.py")
-
-    if not os.path.isfile(fileName):
-        printIt(f"Source file {fileName} not found", lable.WARN)
+    # Read the current file content, including changes staged by the transaction
+    fileContent = command_manager.read_command_file(cmdName)
+    if fileContent is None:
+        printIt(f"Source file {command_manager.command_file_path(cmdName)} not found", lable.WARN)
         return
 
-    # Read the current file content
-    with open(fileName, "r") as fr:
-        fileContent = fr.read()
-
     # Generate new function definitions using argDefTemplate
     new_functions = ""
     for argName in new_arguments:
@@ -298,8 +294,7 @@ def add_new_argument_functions(cmdName: str, theArgs: dict, tracking: dict) -> N
         updated_content = fileContent + "\\n" + new_functions
 
         # Write the updated content back to the file
-        with open(fileName, "w") as fw:
-            fw.write(updated_content)
+        command_manager.write_command_file(cmdName, updated_content)
 
         arg_list = ", ".join(new_arguments)
         printIt(f"Added function definitions for arguments: {arg_list}", lable.INFO)
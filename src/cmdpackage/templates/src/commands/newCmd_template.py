@@ -14,7 +14,6 @@ from ..defs.validation import (
     check_command_uses_argcmddef_template,
 )
 from ..classes.argParse import ArgParse
-from ..classes.optSwitches import saveCmdSwitchOptions
 from ..classes.CommandManager import command_manager
 from .commands import Commands
 
@@ -25,7 +24,7 @@ commandJsonDict = {
     "newCmd": {
         "description": "Add new command <cmdName> with [argNames...]. Also creates a file cmdName.py.",
         "option_switches": {"d": "Silently use default description"},
-        "option_strings": {},
+        "option_strings": {"from": "Create every command listed in a JSON or YAML manifest file"},
         "arguments": {
             "cmdName": "Name of new command",
             "argName": "(argName...) Optional names of argument to associate with the new command.",
@@ -56,6 +55,15 @@ def newCmd(argParse: ArgParse):
     cmdObj = Commands()
     argsDict = args.arguments
 
+    # Handle --from option to create commands listed in a manifest file
+    if hasattr(argParse, "cmd_options") and "from" in argParse.cmd_options:
+        manifestFile = argParse.cmd_options["from"]
+        if manifestFile == "__STRING_OPTION__":
+            printIt("Manifest file required: --from manifest.json", lable.ERROR)
+            return
+        newCmdsFromManifest(cmdObj, manifestFile, argParse.cmd_options.get("template", "argCmdDef"))
+        return
+
     if len(argsDict) == 0:
         printIt("Command name required", lable.ERROR)
         return
@@ -102,50 +110,52 @@ def newCmd(argParse: ArgParse):
                 combined_args.append(f"--{option_name}")
 
         theArgs = verifyArgsWithDiscriptions(cmdObj, combined_args, template_name, use_defaults)
-        newCommandCMDJson = command_manager.update_command_json(cmdObj, theArgs, mode="create")
-
-        writeCodeFile(theArgs, newCommandCMDJson, template_name)
-
-        # Save newCmd-specific options to .${packName}rc for the newCmd command itself
-        if hasattr(argParse, "cmd_options") and argParse.cmd_options:
-            # Save newCmd-specific options like --template
-            newcmd_options = {}
-            newcmd_swtc_options = {}
-            for option_name, option_value in argParse.cmd_options.items():
-                if option_name in ["template", "templates"]:
-                    # Save template option for newCmd command
-                    if option_name == "template":
-                        newcmd_options["template"] = option_value
-                        newcmd_swtc_options["template"] = {"type": "str"}
-                    elif option_name == "templates" and option_value not in [
-                        "__STRING_OPTION__",
-                        True,
-                    ]:
-                        # --templates=value format, treat as template
-                        newcmd_options["template"] = option_value
-                        newcmd_swtc_options["template"] = {"type": "str"}
-
-            # Save newCmd-specific options if any were found
-            if newcmd_options:
-                saveCmdSwitchOptions("newCmd", newcmd_options, newcmd_swtc_options)
-
-            # Extract boolean options for the new command being created
-            new_cmd_options = {}
-            for option_name, option_value in argParse.cmd_options.items():
-                # Skip newCmd-specific options
-                if option_name in ["template", "templates"]:
-                    continue
-                # Only save boolean options (single hyphen options) with default value False
-                if isinstance(option_value, bool):
-                    new_cmd_options[option_name] = False  # Default to False for new command options
-
-            # Save the options if any were found
-            if new_cmd_options:
-                # Create switchFlags dict for the new command
-                new_cmd_swtc_options = {}
-                for option_name in new_cmd_options.keys():
-                    new_cmd_swtc_options[option_name] = {"type": "bool"}
-                saveCmdSwitchOptions(newCmdName, new_cmd_options, new_cmd_swtc_options)
+        # commands.json, the new command file and .cmdrc are committed together
+        with command_manager.transaction():
+            newCommandCMDJson = command_manager.update_command_json(cmdObj, theArgs, mode="create")
+
+            writeCodeFile(theArgs, newCommandCMDJson, template_name)
+
+            # Save newCmd-specific options to .${packName}rc for the newCmd command itself
+            if hasattr(argParse, "cmd_options") and argParse.cmd_options:
+                # Save newCmd-specific options like --template
+                newcmd_options = {}
+                newcmd_swtc_options = {}
+                for option_name, option_value in argParse.cmd_options.items():
+                    if option_name in ["template", "templates"]:
+                        # Save template option for newCmd command
+                        if option_name == "template":
+                            newcmd_options["template"] = option_value
+                            newcmd_swtc_options["template"] = {"type": "str"}
+                        elif option_name == "templates" and option_value not in [
+                            "__STRING_OPTION__",
+                            True,
+                        ]:
+                            # --templates=value format, treat as template
+                            newcmd_options["template"] = option_value
+                            newcmd_swtc_options["template"] = {"type": "str"}
+
+                # Save newCmd-specific options if any were found
+                if newcmd_options:
+                    command_manager.save_command_options("newCmd", newcmd_options, newcmd_swtc_options)
+
+                # Extract boolean options for the new command being created
+                new_cmd_options = {}
+                for option_name, option_value in argParse.cmd_options.items():
+                    # Skip newCmd-specific options
+                    if option_name in ["template", "templates"]:
+                        continue
+                    # Only save boolean options (single hyphen options) with default value False
+                    if isinstance(option_value, bool):
+                        new_cmd_options[option_name] = False  # Default to False for new command options
+
+                # Save the options if any were found
+                if new_cmd_options:
+                    # Create switchFlags dict for the new command
+                    new_cmd_swtc_options = {}
+                    for option_name in new_cmd_options.keys():
+                        new_cmd_swtc_options[option_name] = {"type": "bool"}
+                    command_manager.save_command_options(newCmdName, new_cmd_options, new_cmd_swtc_options)
 
         printIt(f'"{newCmdName}" added using {template_name} template.', lable.NewCmd)
     else:
@@ -155,6 +165,139 @@ def newCmd(argParse: ArgParse):
         )
 
 
+def loadManifest(manifestFile: str) -> dict:
+    \"\"\"Read a newCmd manifest, YAML files need the optional PyYAML package\"\"\"
+    with open(manifestFile, "r") as fr:
+        if manifestFile.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                printIt("PyYAML is required for YAML manifests: pip install pyyaml", lable.ERROR)
+                return {}
+            return yaml.safe_load(fr) or {}
+        return json.load(fr)
+
+
+def manifestCmdArgs(cmdName: str, cmdInfo: dict, template_name: str) -> dict:
+    \"\"\"Build the verifyArgsWithDiscriptions result for one manifest command\"\"\"
+    theArgs = {cmdName: cmdInfo.get("description") or f"Run ${packName} modCmd {cmdName}"}
+    for argName, argDescription in cmdInfo.get("arguments", {}).items():
+        if template_name == "argCmdDef" and not validate_argument_name(argName, cmdName):
+            printIt(
+                f"Skipping invalid argument '{argName}' of '{cmdName}' - cannot be used as function name",
+                lable.WARN,
+            )
+            continue
+        theArgs[argName] = argDescription or f"Run ${packName} modCmd {argName}"
+    optionFlags = {}
+    for optionName, optionDescription in cmdInfo.get("option_switches", {}).items():
+        optionFlags[optionName] = {"description": optionDescription or f"Boolean flag -{optionName}", "type": "bool"}
+    for optionName, optionDescription in cmdInfo.get("option_strings", {}).items():
+        optionFlags[optionName] = {"description": optionDescription or f"Value option --{optionName}", "type": "str"}
+    theArgs["_option_details"] = optionFlags
+    return theArgs
+
+
+def manifestCommandEntries(manifest: dict) -> dict:
+    \"\"\"
+    Return the {cmdName: cmdInfo} entries of a manifest
+
+    With a "commands" key the entries are its value, otherwise the manifest
+    is a commands.json file and every top-level key other than "template"
+    and "switchFlags" is a command.
+    \"\"\"
+    if "commands" in manifest:
+        return manifest["commands"]
+    return {cmdName: cmdInfo for cmdName, cmdInfo in manifest.items() if cmdName not in ("template", "switchFlags")}
+
+
+def manifestEntryError(cmdName: str, cmdInfo) -> str:
+    \"\"\"Return why a manifest entry can't be used, or an empty string\"\"\"
+    if not isinstance(cmdInfo, dict):
+        return f"'{cmdName}' must be a mapping, not {type(cmdInfo).__name__}"
+    for section in ("arguments", "option_switches", "option_strings"):
+        if not isinstance(cmdInfo.get(section, {}), dict):
+            return f"'{section}' of '{cmdName}' must be a mapping, not {type(cmdInfo[section]).__name__}"
+    for field in ("description", "template"):
+        if not isinstance(cmdInfo.get(field, ""), (str, type(None))):
+            return f"'{field}' of '{cmdName}' must be a string"
+    return ""
+
+
+def newCmdsFromManifest(cmdObj: Commands, manifestFile: str, template_name: str = "argCmdDef") -> None:
+    \"\"\"
+    Create every command listed in a manifest in one pass
+
+    The manifest lists commands in the commands.json layout, either at the
+    top level, so an existing commands.json can be used as is, or under a
+    "commands" key. A template can be given per command or for all of them:
+
+        {"template": "argCmdDef",
+         "commands": {"cmdName": {"description": "...", "template": "simple",
+                                  "arguments": {"argName": "..."},
+                                  "option_switches": {"flag": "..."},
+                                  "option_strings": {"option": "..."}}}}
+
+    Entries that are not valid are reported and skipped.
+
+    All files, commands.json and .cmdrc are written by a single transaction.
+    \"\"\"
+    try:
+        manifest = loadManifest(manifestFile)
+    except (OSError, ValueError) as e:
+        printIt(f"Could not read manifest {manifestFile}: {e}", lable.ERROR)
+        return
+    if not isinstance(manifest, dict):
+        printIt(f"Manifest {manifestFile} must contain a mapping of commands", lable.ERROR)
+        return
+    manifestCommands = manifestCommandEntries(manifest)
+    if not isinstance(manifestCommands, dict):
+        printIt(f"'commands' in manifest {manifestFile} must be a mapping of commands", lable.ERROR)
+        return
+    default_template = manifest.get("template") or template_name
+    if not isinstance(default_template, str):
+        printIt(f"'template' in manifest {manifestFile} must be a string", lable.ERROR)
+        return
+
+    # Validate everything before anything is written
+    newCommands = []
+    for cmdName, cmdInfo in manifestCommands.items():
+        cmdInfo = {} if cmdInfo is None else cmdInfo
+        entryError = manifestEntryError(cmdName, cmdInfo)
+        if entryError:
+            printIt(f"Skipping manifest entry: {entryError}", lable.ERROR)
+            continue
+        cmd_template = cmdInfo.get("template") or default_template
+        if cmdName in cmdObj.commands or command_manager.command_file_exists(cmdName):
+            printIt(f'"{cmdName}" exists. use modCmd or rmCmd to modify or remove this command.', lable.INFO)
+        elif not isinstance(cmdName, str) or not cmdName.isidentifier():
+            printIt(f"Skipping invalid command name '{cmdName}'", lable.WARN)
+        elif cmd_template != "argCmdDef" and not template_exists(cmd_template):
+            printIt(f"ERROR: Template '{cmd_template}' for '{cmdName}' not found.", lable.ERROR)
+            list_templates()
+            return
+        else:
+            newCommands.append((cmdName, manifestCmdArgs(cmdName, cmdInfo, cmd_template), cmd_template))
+
+    with command_manager.transaction():
+        for cmdName, theArgs, cmd_template in newCommands:
+            newCommandCMDJson = command_manager.update_command_json(cmdObj, theArgs, mode="create")
+            writeCodeFile(theArgs, newCommandCMDJson, cmd_template)
+            # Boolean options start out disabled, as for a single newCmd
+            new_cmd_swtc_options = {
+                optionName: {"type": "bool"}
+                for optionName, optionInfo in theArgs["_option_details"].items()
+                if optionInfo["type"] == "bool"
+            }
+            if new_cmd_swtc_options:
+                new_cmd_options = {optionName: False for optionName in new_cmd_swtc_options}
+                command_manager.save_command_options(cmdName, new_cmd_options, new_cmd_swtc_options)
+
+    for cmdName, theArgs, cmd_template in newCommands:
+        printIt(f'"{cmdName}" added using {cmd_template} template.', lable.NewCmd)
+    printIt(f"{len(newCommands)} of {len(manifestCommands)} manifest commands added", lable.INFO)
+
+
 def list_templates():
     \"\"\"List all available templates\"\"\"
     template_dir = os.path.join(os.path.dirname(__file__), "templates")
@@ -268,14 +411,12 @@ def verifyArgsWithDiscriptions(
 
 
 def writeCodeFile(theArgs: dict, newCommandCMDJson: dict, template_name: str = "simple") -> str:
-    fileDir = os.path.dirname(__file__)
-    fileName = os.path.join(fileDir, f"{list(theArgs.keys())[0]}.py")
-    if os.path.isfile(fileName):
+    cmdName = list(theArgs.keys())[0]
+    if command_manager.command_file_exists(cmdName):
         rtnStr = lable.EXISTS
     else:
         ourStr = cmdCodeBlock(theArgs, newCommandCMDJson, template_name)
-        with open(fileName, "w") as fw:
-            fw.write(ourStr)
+        command_manager.write_command_file(cmdName, ourStr)
         rtnStr = lable.SAVED
     return rtnStr
 
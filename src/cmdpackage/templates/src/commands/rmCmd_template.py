@@ -3,9 +3,9 @@
 from textwrap import dedent
 from string import Template
 
-rmCmd_template = Template(dedent("""import os, json, hashlib
+rmCmd_template = Template(dedent("""import os, hashlib
 from ..defs.logIt import printIt, lable, cStr, color
-from ..classes.optSwitches import removeCmdSwitchOptions
+from ..defs.cmdJsonDict import rewriteCommandSource
 from ..classes.CommandManager import command_manager
 from .commands import Commands
 
@@ -25,6 +25,12 @@ commands = cmdObj.commands
 
 
 def rmCmd(argParse):
+    # Everything removed by one rmCmd call is committed together
+    with command_manager.transaction():
+        rmCmdItems(argParse)
+
+
+def rmCmdItems(argParse):
     # Check for +d flag (silent mode) using unconventional persistence storage model
     # -d = silence OFF (prompts), +d = silence ON (no prompts)
     use_silent_mode = hasattr(argParse, "cmd_options") and argParse.cmd_options.get("d", False)
@@ -59,6 +65,7 @@ def rmCmd(argParse):
             return
 
         # Process each flag that was specified for removal
+        removedFlags = False
         for flagName in flags_to_remove:
             cmd_data = commands[cmdName]
             is_option_switch = "option_switches" in cmd_data and flagName in cmd_data["option_switches"]
@@ -75,6 +82,7 @@ def rmCmd(argParse):
 
                 if chkRm[0].lower() == "y":
                     removeCmdSwtcFlag(cmdName, flagName)
+                    removedFlags = True
                     printIt(
                         f'Swtc flag "--{flagName}" removed from command "{cmdName}"',
                         lable.RmArg,
@@ -89,6 +97,8 @@ def rmCmd(argParse):
                     f'Swtc flag "--{flagName}" is not defined for command "{cmdName}"',
                     lable.WARN,
                 )
+        if removedFlags:
+            updateSourceFileAfterRemoval(cmdName, command_manager.get_command_data(cmdName))
         return
 
     # If only one argument provided and no flags to remove, remove the entire command
@@ -118,6 +128,9 @@ def rmCmd(argParse):
             printIt(f'"{cmdName}" is not currently a Command.', lable.WARN)
             return
 
+        # The source file is rewritten once after every item has been removed
+        removedArgs = []
+        removedFlags = False
         for argIndex in range(1, len(theArgs)):
             anArg = theArgs[argIndex]
 
@@ -141,6 +154,7 @@ def rmCmd(argParse):
 
                     if chkRm[0].lower() == "y":
                         removeCmdSwtcFlag(cmdName, flagName)
+                        removedFlags = True
                         printIt(
                             f'Swtc flag "{anArg}" removed from command "{cmdName}"',
                             lable.RmArg,
@@ -173,6 +187,7 @@ def rmCmd(argParse):
 
                     if chkRm[0].lower() == "y":
                         removeCmdSwtcFlag(cmdName, anArg)
+                        removedFlags = True
                         printIt(
                             f'Swtc flag "-{anArg}" removed from command "{cmdName}"',
                             lable.RmArg,
@@ -192,7 +207,8 @@ def rmCmd(argParse):
                             chkRm = "N"
 
                     if chkRm[0].lower() == "y":
-                        removeCmdArg(cmdName, anArg)
+                        if removeCmdArg(cmdName, anArg):
+                            removedArgs.append(anArg)
                         printIt(anArg, lable.RmArg)
                     else:
                         printIt(
@@ -204,153 +220,55 @@ def rmCmd(argParse):
                         f'"{anArg}" is not an argument or swtc flag for command "{cmdName}".',
                         lable.WARN,
                     )
+        if removedArgs or removedFlags:
+            updateSourceFileAfterRemoval(cmdName, command_manager.get_command_data(cmdName), removedArgs)
 
 
-def removeCmdArg(cmdName, argName):
+def removeCmdArg(cmdName, argName) -> bool:
     \"\"\"Remove an argument from a command using CommandManager\"\"\"
-    # Use CommandManager to remove the argument
+    # The argument's function is cut from the source file by updateSourceFileAfterRemoval
     if not command_manager.remove_argument(cmdName, argName):
         printIt(f"Argument '{argName}' not found in command '{cmdName}'", lable.WARN)
-        return
-
-    # Remove the function from the source file
-    removeFunctionFromSourceFile(cmdName, argName)
-
-    # Update source file's commandJsonDict
-    cmd_data = command_manager.get_command_data(cmdName)
-    updateSourceFileAfterRemoval(cmdName, cmd_data)
+        return False
+    return True
 
 
 def removeCmdSwtcFlag(cmdName: str, flagName: str) -> None:
     \"\"\"Remove a switch flag from a command.\"\"\"
     command_manager.remove_flag_from_all_locations(cmdName, flagName)
 
-    # Update source file's commandJsonDict
-    cmd_data = command_manager.get_command_data(cmdName)
-    updateSourceFileAfterRemoval(cmdName, cmd_data)
 
+def updateSourceFileAfterRemoval(cmdName: str, cmdDict: dict, removedArgs: list = None) -> None:
+    \"\"\"Update the commandJsonDict in the source file and remove the functions of removed arguments
 
-def updateSourceFileAfterRemoval(cmdName: str, cmdDict: dict) -> None:
-    \"\"\"Update the commandJsonDict in the source file after removing an argument or swtc flag\"\"\"
-    fileDir = os.path.dirname(__file__)
-    fileName = os.path.join(fileDir, f"{cmdName}.py")
+    The file is parsed once and written once however many arguments were removed.
+    \"\"\"
+    fileName = command_manager.command_file_path(cmdName)
+    removedArgs = removedArgs or []
 
-    if not os.path.isfile(fileName):
+    # Read the current file content, including changes staged by the transaction
+    fileContent = command_manager.read_command_file(cmdName)
+    if fileContent is None:
         printIt(f"Source file {fileName} not found", lable.WARN)
         return
 
-    # Read the current file content
-    with open(fileName, "r") as fr:
-        fileContent = fr.read()
-
-    # Create the new commandJsonDict string
-    newCommandJsonDict = {cmdName: cmdDict}
-    jsonStr = json.dumps(newCommandJsonDict, indent=2)
-
-    # Look for the commandJsonDict pattern with proper nesting
-    lines = fileContent.split("\\n")
-    start_line = -1
-    end_line = -1
-    brace_count = 0
-    in_dict = False
-
-    for i, line in enumerate(lines):
-        if "commandJsonDict" in line and "=" in line and "{" in line:
-            start_line = i
-            in_dict = True
-            brace_count = line.count("{") - line.count("}")
-        elif in_dict:
-            brace_count += line.count("{") - line.count("}")
-            if brace_count == 0:
-                end_line = i
-                break
-
-    if start_line != -1 and end_line != -1:
-        # Replace the commandJsonDict section
-        before_lines = lines[:start_line]
-        after_lines = lines[end_line + 1 :]
-
-        new_lines = before_lines + [f"commandJsonDict = {jsonStr}"] + after_lines
-
-        # Write the updated content back to the file
-        with open(fileName, "w") as fw:
-            fw.write("\\n".join(new_lines))
-
-        printIt(f"Updated commandJsonDict in {fileName}", lable.INFO)
-    else:
+    try:
+        newContent, removedFunctions = rewriteCommandSource(fileContent, {cmdName: cmdDict}, removedArgs)
+    except (SyntaxError, ValueError) as e:
+        printIt(f"Could not parse {fileName}: {e}", lable.WARN)
+        return
+    if newContent is None:
         printIt(f"Could not find commandJsonDict pattern in {fileName}", lable.WARN)
-
-
-def removeFunctionFromSourceFile(cmdName: str, argName: str) -> None:
-    \"\"\"Remove a function definition from the source file\"\"\"
-    fileDir = os.path.dirname(__file__)
-    fileName = os.path.join(fileDir, f"{cmdName}.py")
-
-    if not os.path.isfile(fileName):
-        printIt(f"Source file {fileName} not found", lable.WARN)
         return
 
-    # Read the current file content
-    with open(fileName, "r") as fr:
-        fileContent = fr.read()
-
-    lines = fileContent.split("\\n")
-
-    # Find the function definition and its end
-    function_start = -1
-    function_end = -1
-    indent_level = 0
-
-    for i, line in enumerate(lines):
-        # Look for the function definition
-        if line.strip().startswith(f"def {argName}("):
-            function_start = i
-            # Find the indentation level of this function
-            indent_level = len(line) - len(line.lstrip())
-            continue
-
-        # If we're inside a function, look for the end
-        if function_start != -1 and i > function_start:
-            # If we hit a non-empty line that's at the same or lesser indent level as the function,
-            # or another function definition, we've found the end
-            if line.strip():  # Non-empty line
-                current_indent = len(line) - len(line.lstrip())
-                if current_indent <= indent_level and not line.strip().startswith("#"):
-                    function_end = i - 1  # Previous line was the end
-                    break
-            # If we reach the end of file
-            elif i == len(lines) - 1:
-                function_end = i
-                break
-
-    # If function was found, remove it
-    if function_start != -1:
-        if function_end == -1:
-            function_end = len(lines) - 1  # Function goes to end of file
-
-        # Remove the function lines (including any trailing empty lines that belong to it)
-        # Also remove leading empty lines before the function if they exist
-        start_remove = function_start
-        end_remove = function_end
-
-        # Look backwards for empty lines to remove before function
-        while start_remove > 0 and not lines[start_remove - 1].strip():
-            start_remove -= 1
-
-        # Look forwards for empty lines to remove after function
-        while end_remove < len(lines) - 1 and not lines[end_remove + 1].strip():
-            end_remove += 1
-
-        # Create new content without the function
-        new_lines = lines[:start_remove] + lines[end_remove + 1 :]
-
-        # Write the updated content back to the file
-        with open(fileName, "w") as fw:
-            fw.write("\\n".join(new_lines))
-
-        printIt(f"Removed function '{argName}' from {fileName}", lable.INFO)
-    else:
-        printIt(f"Function '{argName}' not found in {fileName}", lable.WARN)
+    if newContent != fileContent:
+        command_manager.write_command_file(cmdName, newContent)
+    for argName in removedArgs:
+        if argName in removedFunctions:
+            printIt(f"Removed function '{argName}' from {fileName}", lable.INFO)
+        else:
+            printIt(f"Function '{argName}' not found in {fileName}", lable.WARN)
+    printIt(f"Updated commandJsonDict in {fileName}", lable.INFO)
 
 
 def removeCmd(cmdName):
@@ -358,12 +276,9 @@ def removeCmd(cmdName):
     command_manager.remove_command(cmdName)
 
     # Remove the Python file
-    pyFileName = f"{cmdName}.py"
-    pyFileName = os.path.join(os.path.dirname(__file__), pyFileName)
-    if os.path.isfile(pyFileName):
-        os.remove(pyFileName)
+    command_manager.delete_command_file(cmdName)
 
-    # Remove command flags from .${packName}rc and .cmdrc
-    removeCmdSwitchOptions(cmdName)
+    # Remove command flags from .cmdrc
+    command_manager.remove_command_options(cmdName)
 """))
 
@@ -0,0 +1,177 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+shell_template = Template(dedent("""import os
+import sys
+import shlex
+import importlib
+from ..defs.logIt import printIt, lable, cStr, color
+from ..classes.CommandManager import command_manager
+from ..classes.batchRun import runCommandLine, sharedStdin
+from .commands import Commands
+
+try:
+    import readline
+except ImportError:
+    # no line editing or completion on this platform
+    readline = None
+
+commandJsonDict = {
+    "shell": {
+        "description": "Interactive ${packName} shell that keeps commands, options and command modules loaded between command lines.",
+        "option_switches": {},
+        "option_strings": {},
+        "arguments": {},
+    }
+}
+
+SHELL_COMMANDS = ["exit", "quit", "help"]
+HISTORY_FILE_NAME = os.path.join(os.path.expanduser("~"), ".${packName}_shell_history")
+# Modules that hold the shell's own state and are never reloaded
+KEEP_LOADED = Commands.NON_COMMAND_FILES + ["shell.py"]
+
+
+class ShellSession:
+    \"\"\"Read command lines interactively and run them in this process\"\"\"
+
+    def __init__(self):
+        self.modulePrefix = f"{__package__}."
+        self.moduleMtimes = {}
+        self.matches = []
+
+    def run(self):
+        if readline is not None:
+            readline.set_completer(self.complete)
+            readline.set_completer_delims(" \\t\\n")
+            readline.parse_and_bind("tab: complete")
+            try:
+                readline.read_history_file(HISTORY_FILE_NAME)
+            except OSError:
+                pass
+        printIt(f"{cStr('${packName}', color.YELLOW)} shell, TAB completes, 'help' lists commands, 'exit' leaves", lable.INFO)
+        self.reloadChangedModules()
+        with sharedStdin():
+            try:
+                while True:
+                    try:
+                        commandLine = input("${packName}> ").strip()
+                    except EOFError:
+                        print()
+                        break
+                    except KeyboardInterrupt:
+                        print()
+                        continue
+                    if not commandLine:
+                        continue
+                    if commandLine in ["exit", "quit"]:
+                        break
+                    self.runLine(commandLine)
+            finally:
+                if readline is not None:
+                    try:
+                        readline.write_history_file(HISTORY_FILE_NAME)
+                    except OSError:
+                        pass
+
+    def runLine(self, commandLine: str):
+        try:
+            words = shlex.split(commandLine)
+        except ValueError as e:
+            printIt(str(e), lable.ERROR)
+            return
+        if words == ["help"]:
+            # -h needs a terminal on stdin, piped lines would get a usage error
+            self.showHelp()
+            return
+        elif words[0] == "shell":
+            printIt("Already running the shell", lable.WARN)
+            return
+        self.reloadChangedModules()
+        try:
+            runCommandLine(words)
+        except KeyboardInterrupt:
+            print()
+        # records modules the line imported and reloads files the line changed
+        self.reloadChangedModules()
+
+    def reloadChangedModules(self):
+        \"\"\"Reload imported command modules whose file changed since the last check\"\"\"
+        from . import cmdDispatch
+
+        changed = False
+        for moduleName, module in list(sys.modules.items()):
+            fileName = getattr(module, "__file__", None)
+            if not moduleName.startswith(self.modulePrefix) or not fileName:
+                continue
+            if os.path.basename(fileName) in KEEP_LOADED:
+                continue
+            try:
+                mtime = os.stat(fileName).st_mtime_ns
+            except OSError:
+                # command file removed, forget its module
+                del sys.modules[moduleName]
+                self.moduleMtimes.pop(moduleName, None)
+                changed = True
+                continue
+            knownMtime = self.moduleMtimes.get(moduleName)
+            if knownMtime is not None and knownMtime != mtime:
+                try:
+                    importlib.reload(module)
+                except Exception as e:
+                    printIt(f"Could not reload {moduleName}: {e}", lable.WARN)
+                changed = True
+            self.moduleMtimes[moduleName] = mtime
+        if changed:
+            cmdDispatch.invalidate()
+
+    def showHelp(self):
+        \"\"\"List the commands with their descriptions and the shell's own commands\"\"\"
+        commands = command_manager.get_all_commands()
+        cmdNames = self.candidates([])
+        nameWidth = max(len(cmdName) for cmdName in cmdNames)
+        printIt(cStr("Commands:", color.CYAN), lable.INFO)
+        for cmdName in cmdNames:
+            if cmdName in SHELL_COMMANDS:
+                description = "Show this list" if cmdName == "help" else "Leave the shell"
+            else:
+                description = commands[cmdName].get("description", "")
+            printIt(f"  {cStr(cmdName.ljust(nameWidth), color.YELLOW)}  {description}", lable.INFO)
+        printIt("'<command> -h' shows the help of a command", lable.INFO)
+
+    def candidates(self, words: list) -> list:
+        \"\"\"Completion candidates for the word after words\"\"\"
+        commands = command_manager.get_all_commands()
+        cmdNames = [cmdName for cmdName, cmdInfo in commands.items() if isinstance(cmdInfo, dict)]
+        if not words:
+            return sorted(cmdNames) + SHELL_COMMANDS
+        cmdInfo = commands.get(words[0])
+        if not isinstance(cmdInfo, dict):
+            return []
+        arguments = list(cmdInfo.get("arguments", {}))
+        found = []
+        # commands like modCmd and rmCmd take a command name first
+        if len(words) == 1 and arguments[:1] == ["cmdName"]:
+            found.extend(sorted(cmdNames))
+        else:
+            found.extend(arguments)
+        for flagName in cmdInfo.get("option_switches", {}):
+            found.extend([f"+{flagName}", f"-{flagName}"])
+        for optionName in cmdInfo.get("option_strings", {}):
+            found.append(f"--{optionName}")
+        return found
+
+    def complete(self, text: str, state: int):
+        \"\"\"readline completer over the in memory commands.json model\"\"\"
+        if state == 0:
+            lineBefore = readline.get_line_buffer()[: readline.get_begidx()]
+            self.matches = [word for word in self.candidates(lineBefore.split()) if word.startswith(text)]
+        if state < len(self.matches):
+            return self.matches[state] + " "
+        return None
+
+
+def shell(argParse):
+    ShellSession().run()
+"""))
@@ -18,6 +18,8 @@ from typing import Dict, Any, List, Optional, Union, Tuple
 
 from ..defs.logIt import printIt, lable, cStr, color
 from ..defs.utilities import calculate_md5, split_args
+from ..defs.storage import atomicWriteJson, fileLock
+from ..defs.cmdJsonDict import readCommandJsonDict
 from .commands import Commands
 from ..classes.optSwitches import getCmdSwitchOptions
 from ..classes.CommandManager import command_manager
@@ -114,8 +116,8 @@ class TemplateSyncer:
     def _save_sync_data(self):
         \"\"\"Save the synchronization data back to JSON file\"\"\"
         try:
-            with open(self.sync_data_file, "w", encoding="utf-8") as f:
-                json.dump(self.sync_data, f, indent=4, ensure_ascii=False)
+            with fileLock(self.sync_data_file):
+                atomicWriteJson(self.sync_data_file, self.sync_data, indent=4, ensure_ascii=False)
             printIt(
                 f"Update sync data in {cStr(os.path.basename(self.sync_data_file),color.YELLOW)}",
                 lable.SAVED,
@@ -343,49 +345,12 @@ class TemplateSyncer:
             printIt(f"Error substituting template fields: {e}", lable.WARN)
             return template_content
 
-    def _extract_command_json_dict(self, file_path: str) -> Optional[str]:
+    def _extract_command_json_dict(self, file_path: str) -> Optional[Dict[str, Any]]:
         \"\"\"Extract commandJsonDict from a source file\"\"\"
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                file_content = f.read()
-
-            # Look for commandJsonDict = { ... } with proper brace mtcing
-            lines = file_content.split("\\n")
-            start_line = -1
-            end_line = -1
-            brace_count = 0
-            in_dict = False
-
-            for i, line in enumerate(lines):
-                if "commandJsonDict" in line and "=" in line and "{" in line:
-                    start_line = i
-                    in_dict = True
-                    brace_count = line.count("{") - line.count("}")
-                elif in_dict:
-                    brace_count += line.count("{") - line.count("}")
-                    if brace_count == 0:
-                        end_line = i
-                        break
-
-            if start_line != -1 and end_line != -1:
-                # Extract the dictionary content
-                dict_lines = lines[start_line : end_line + 1]
-                dict_content = "\\n".join(dict_lines)
-
-                # Remove the variable assignment part to get just the dictionary
-                dict_content = dict_content.split("=", 1)[1].strip()
-
-                try:
-                    # Use eval to parse Python dict syntax
-                    json_data = eval(dict_content)
-                    return json.dumps(json_data, indent=2, ensure_ascii=False)
-                except Exception as e:
-                    printIt(
-                        f"Error parsing commandJsonDict from {file_path}: {e}",
-                        lable.WARN,
-                    )
-                    return None
-
+            return readCommandJsonDict(file_path)
+        except (SyntaxError, ValueError) as e:
+            printIt(f"Error parsing commandJsonDict from {file_path}: {e}", lable.WARN)
             return None
         except Exception as e:
             printIt(f"Error reading file {file_path}: {e}", lable.WARN)
@@ -415,15 +380,8 @@ class TemplateSyncer:
                 # Extract command JSON from this file
                 command_json_dict = self._extract_command_json_dict(file_path)
                 if command_json_dict:
-                    try:
-                        cmd_data = json.loads(command_json_dict)
-                        # Merge command data into the main dict
-                        commands_dict.update(cmd_data)
-                    except Exception as e:
-                        printIt(
-                            f"Error parsing command JSON from {file_path}: {e}",
-                            lable.WARN,
-                        )
+                    # Merge command data into the main dict
+                    commands_dict.update(command_json_dict)
 
         return json.dumps(commands_dict, indent=2, ensure_ascii=False)
 
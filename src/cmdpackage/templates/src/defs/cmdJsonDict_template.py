@@ -0,0 +1,179 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+cmdJsonDict_template = Template(dedent("""import io
+import ast
+import copy
+import json
+import hashlib
+
+CMD_JSON_DICT_NAME = "commandJsonDict"
+
+# JSON spellings json.dumps may leave in a commandJsonDict literal
+_JSON_NAMES = {"true": True, "false": False, "null": None}
+
+# md5 of a source text -> spans found by _parse. Kept small, files are re-read
+# only when they change.
+_parseCache = {}
+_PARSE_CACHE_SIZE = 256
+
+
+class _JsonNames(ast.NodeTransformer):
+    def visit_Name(self, node):
+        if node.id in _JSON_NAMES:
+            return ast.copy_location(ast.Constant(_JSON_NAMES[node.id]), node)
+        return node
+
+
+def _lineOffsets(source: str) -> list:
+    # character offset of every line start, lines split the way the tokenizer splits them
+    offsets = [0]
+    for line in io.StringIO(source, newline="").readlines():
+        offsets.append(offsets[-1] + len(line))
+    return offsets
+
+
+def _offset(source: str, lineStarts: list, lineno: int, colOffset: int) -> int:
+    # ast column offsets count UTF-8 bytes, string slicing counts characters
+    lineStart = lineStarts[lineno - 1]
+    line = source[lineStart : lineStarts[lineno] if lineno < len(lineStarts) else len(source)]
+    return lineStart + len(line.encode("utf-8")[:colOffset].decode("utf-8", "ignore"))
+
+
+def _assignedValue(node):
+    # value of a module level "commandJsonDict = ..." statement, None for anything else
+    if isinstance(node, ast.Assign):
+        targets, value = node.targets, node.value
+    elif isinstance(node, ast.AnnAssign) and node.value is not None:
+        targets, value = [node.target], node.value
+    else:
+        return None
+    if any(isinstance(target, ast.Name) and target.id == CMD_JSON_DICT_NAME for target in targets):
+        return value
+    return None
+
+
+def _functionSpan(source: str, lineStarts: list, node) -> tuple:
+    # whole lines of the function including its decorators and the blank lines above it
+    firstLine = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+    while firstLine > 1 and not source[lineStarts[firstLine - 2] : lineStarts[firstLine - 1]].strip():
+        firstLine -= 1
+    return lineStarts[firstLine - 1], lineStarts[min(node.end_lineno, len(lineStarts) - 1)]
+
+
+def _parse(source: str) -> dict:
+    \"\"\"Parse source once and return the spans of its commandJsonDict and functions
+
+    The result holds "cmdJsonDict": (start, end, commandJsonDict) or None,
+    "functions": module level function name -> (start, end) and the
+    exceptions raised while parsing the source or the commandJsonDict literal.
+    It is cached per source hash so a file is parsed once however many times
+    its metadata is read or rewritten.
+    \"\"\"
+    sourceHash = hashlib.md5(source.encode("utf-8")).hexdigest()
+    parsed = _parseCache.get(sourceHash)
+    if parsed is not None:
+        return parsed
+    parsed = {"cmdJsonDict": None, "functions": {}, "syntaxError": None, "cmdJsonDictError": None}
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        parsed["syntaxError"] = e
+        tree = None
+    if tree is not None:
+        lineStarts = _lineOffsets(source)
+        foundCmdJsonDict = False
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                parsed["functions"].setdefault(node.name, _functionSpan(source, lineStarts, node))
+                continue
+            value = None if foundCmdJsonDict else _assignedValue(node)
+            if value is None:
+                continue
+            foundCmdJsonDict = True
+            try:
+                cmdJsonDict = ast.literal_eval(_JsonNames().visit(value))
+                if not isinstance(cmdJsonDict, dict):
+                    raise ValueError(f"{CMD_JSON_DICT_NAME} is not a dictionary")
+            except ValueError as e:
+                parsed["cmdJsonDictError"] = e
+                continue
+            start = _offset(source, lineStarts, node.lineno, node.col_offset)
+            end = _offset(source, lineStarts, node.end_lineno, node.end_col_offset)
+            parsed["cmdJsonDict"] = (start, end, cmdJsonDict)
+    if len(_parseCache) >= _PARSE_CACHE_SIZE:
+        _parseCache.pop(next(iter(_parseCache)))
+    _parseCache[sourceHash] = parsed
+    return parsed
+
+
+def locateCommandJsonDict(source: str):
+    \"\"\"Return (start, end, commandJsonDict) of the module level commandJsonDict assignment
+
+    start and end are character offsets of the whole assignment statement.
+
+    Raises:
+        SyntaxError, ValueError: If the source or the commandJsonDict literal cannot be parsed
+    \"\"\"
+    if CMD_JSON_DICT_NAME not in source:
+        return None
+    parsed = _parse(source)
+    if parsed["syntaxError"] is not None:
+        raise parsed["syntaxError"]
+    if parsed["cmdJsonDictError"] is not None:
+        raise parsed["cmdJsonDictError"]
+    return parsed["cmdJsonDict"]
+
+
+def extractCommandJsonDict(source: str):
+    \"\"\"Return the commandJsonDict defined in source, None if it defines none\"\"\"
+    span = locateCommandJsonDict(source)
+    if span is None:
+        return None
+    return copy.deepcopy(span[2])
+
+
+def readCommandJsonDict(fileName: str):
+    \"\"\"Return the commandJsonDict defined in a command file, None if it defines none\"\"\"
+    with open(fileName, "r", encoding="utf-8") as fr:
+        return extractCommandJsonDict(fr.read())
+
+
+def rewriteCommandSource(source: str, cmdJsonDict: dict, removeFunctionNames=()) -> tuple:
+    \"\"\"Replace the commandJsonDict of source and cut module level functions out of it
+
+    Every edit is spliced from the one cached parse. A function goes together
+    with its decorators, nested definitions and the blank lines in front of it;
+    everything else, including a comment after the commandJsonDict, is kept
+    byte for byte.
+
+    Args:
+        source (str): Command file source
+        cmdJsonDict (dict): New commandJsonDict
+        removeFunctionNames (list): Names of the functions to remove
+
+    Returns:
+        tuple: The new source, None if source has no commandJsonDict, and the
+            list of function names that were found and removed
+
+    Raises:
+        SyntaxError, ValueError: If the source or the commandJsonDict literal cannot be parsed
+    \"\"\"
+    span = locateCommandJsonDict(source)
+    if span is None:
+        return None, []
+    functions = _parse(source)["functions"]
+    removed = [name for name in dict.fromkeys(removeFunctionNames) if name in functions]
+    newAssignment = f"{CMD_JSON_DICT_NAME} = {json.dumps(cmdJsonDict, indent=2)}"
+    edits = [(span[0], span[1], newAssignment)] + [functions[name] + ("",) for name in removed]
+    for start, end, text in sorted(edits, reverse=True):
+        source = source[:start] + text + source[end:]
+    return source, removed
+
+
+def replaceCommandJsonDict(source: str, cmdJsonDict: dict):
+    \"\"\"Return source with its commandJsonDict assignment replaced in place, None if it has none\"\"\"
+    return rewriteCommandSource(source, cmdJsonDict)[0]
+"""))
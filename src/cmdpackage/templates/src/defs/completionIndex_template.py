@@ -0,0 +1,125 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+completionIndex_template = Template(dedent("""import os
+import re
+import json
+from .storage import atomicWriteText
+
+# One line per command: name, words completed right after the command and
+# words completed further on, separated by tabs. The completion scripts read
+# it directly, so a TAB press never starts Python.
+COMPLETION_INDEX_FILE_NAME = ".completion"
+COMPLETION_SHELLS = ["bash", "zsh", "fish"]
+
+_packageName = __package__.split(".")[0]
+_cmdFileDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "commands")
+_indexFileName = os.path.join(_cmdFileDir, COMPLETION_INDEX_FILE_NAME)
+_cmdJsonFileName = os.path.join(_cmdFileDir, "commands.json")
+
+
+def _commandLine(cmdName: str, cmdInfo: dict, cmdNames: list) -> str:
+    arguments = list(cmdInfo.get("arguments", {}))
+    flags = []
+    for flagName in cmdInfo.get("option_switches", {}):
+        flags.extend([f"+{flagName}", f"-{flagName}"])
+    flags.extend(f"--{optionName}" for optionName in cmdInfo.get("option_strings", {}))
+    # commands like modCmd and rmCmd take a command name first
+    firstWords = cmdNames if arguments[:1] == ["cmdName"] else arguments
+    return "\\t".join([cmdName, " ".join(firstWords + flags), " ".join(arguments + flags)])
+
+
+def writeCompletionIndex(commands: dict = None) -> None:
+    \"\"\"Rewrite the completion index from commands, read from commands.json when not given\"\"\"
+    try:
+        if commands is None:
+            with open(_cmdJsonFileName, "r") as fr:
+                commands = json.load(fr)
+            commands = commands.get("commands", commands)
+        cmdNames = [
+            cmdName
+            for cmdName, cmdInfo in commands.items()
+            if isinstance(cmdInfo, dict) and cmdName not in ["switchFlags", "_globalSwtceFlags"]
+        ]
+        lines = [_commandLine(cmdName, commands[cmdName], cmdNames) for cmdName in cmdNames]
+        atomicWriteText(_indexFileName, "".join(line + "\\n" for line in lines))
+    except (OSError, ValueError):
+        # read only install or unreadable commands.json, completion keeps the old index
+        pass
+
+
+_BASH_SCRIPT = \"\"\"# @PROG@ bash completion, enable with: eval "$$(@PROG@ completion bash)"
+_@FUNC@_complete() {
+    local index="@INDEX@" cmdJson="@JSON@" name first rest words=""
+    [[ ! -f $$index || $$cmdJson -nt $$index ]] && @PROG@ completion index >/dev/null 2>&1
+    while IFS=$$'\\\\t' read -r name first rest; do
+        if (( COMP_CWORD == 1 )); then
+            words+=" $$name"
+        elif [[ $$name == "$${COMP_WORDS[1]}" ]]; then
+            (( COMP_CWORD == 2 )) && words=$$first || words=$$rest
+            break
+        fi
+    done < "$$index"
+    COMPREPLY=( $$(compgen -W "$$words" -- "$${COMP_WORDS[COMP_CWORD]}") )
+}
+complete -F _@FUNC@_complete @PROG@
+\"\"\"
+
+_ZSH_SCRIPT = \"\"\"# @PROG@ zsh completion, enable with: eval "$$(@PROG@ completion zsh)"
+_@FUNC@_complete() {
+    local index="@INDEX@" cmdJson="@JSON@" name first rest
+    local -a found
+    [[ ! -f $$index || $$cmdJson -nt $$index ]] && @PROG@ completion index >/dev/null 2>&1
+    while IFS=$$'\\\\t' read -r name first rest; do
+        if (( CURRENT == 2 )); then
+            found+=("$$name")
+        elif [[ $$name == "$${words[2]}" ]]; then
+            (( CURRENT == 3 )) && found=($${=first}) || found=($${=rest})
+            break
+        fi
+    done < "$$index"
+    compadd -- $$found
+}
+compdef _@FUNC@_complete @PROG@
+\"\"\"
+
+_FISH_SCRIPT = \"\"\"# @PROG@ fish completion, enable with: @PROG@ completion fish | source
+function __@FUNC@_complete
+    set -l index "@INDEX@"
+    set -l cmdJson "@JSON@"
+    if not test -f $$index; or command test $$cmdJson -nt $$index
+        @PROG@ completion index >/dev/null 2>&1
+    end
+    set -l tokens (commandline -opc)
+    while read --delimiter \\\\t name first rest
+        if test (count $$tokens) -eq 1
+            echo $$name
+        else if test "$$name" = "$$tokens[2]"
+            if test (count $$tokens) -eq 2
+                string split -n " " -- $$first
+            else
+                string split -n " " -- $$rest
+            end
+            break
+        end
+    end < $$index
+end
+complete -c @PROG@ -f -a "(__@FUNC@_complete)"
+\"\"\"
+
+
+def completionScript(shell: str) -> str:
+    \"\"\"Return the completion script for shell, one of COMPLETION_SHELLS\"\"\"
+    script = {"bash": _BASH_SCRIPT, "zsh": _ZSH_SCRIPT, "fish": _FISH_SCRIPT}[shell]
+    replacements = {
+        "@PROG@": _packageName,
+        "@FUNC@": re.sub(r"\\W", "_", _packageName),
+        "@INDEX@": _indexFileName,
+        "@JSON@": _cmdJsonFileName,
+    }
+    for placeholder, value in replacements.items():
+        script = script.replace(placeholder, value)
+    return script
+"""))
@@ -0,0 +1,83 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+helpCache_template = Template(dedent("""import os
+import hashlib
+from io import StringIO
+from contextlib import redirect_stdout
+
+HELP_CACHE_DIR_NAME = ".helpcache"
+
+_cmdFileDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "commands")
+_helpCacheDir = os.path.join(_cmdFileDir, HELP_CACHE_DIR_NAME)
+_cmdJsonFileName = os.path.join(_cmdFileDir, "commands.json")
+
+# commands.json hash, recomputed only when its stat changes
+_commandsHash = {"stat": None, "hash": ""}
+
+
+def _commandsJsonHash() -> str:
+    try:
+        jsonStat = os.stat(_cmdJsonFileName)
+        statKey = (jsonStat.st_mtime_ns, jsonStat.st_size)
+        if _commandsHash["stat"] != statKey:
+            with open(_cmdJsonFileName, "rb") as fr:
+                _commandsHash["hash"] = hashlib.md5(fr.read()).hexdigest()
+            _commandsHash["stat"] = statKey
+    except OSError:
+        return ""
+    return _commandsHash["hash"]
+
+
+def _helpCacheFile(topic: str, width: int) -> str:
+    return os.path.join(_helpCacheDir, f"{topic}.{width}.txt")
+
+
+def cachedHelp(topic: str, width: int, render) -> str:
+    \"\"\"Return the help text for topic, calling render() only on a cache miss\"\"\"
+    commandsHash = _commandsJsonHash()
+    cacheFile = _helpCacheFile(topic, width)
+    if commandsHash:
+        try:
+            with open(cacheFile, "r") as fr:
+                cachedHash = fr.readline().rstrip("\\n")
+                if cachedHash == commandsHash:
+                    return fr.read()
+        except OSError:
+            pass
+    helpText = render()
+    if commandsHash:
+        tmpFileName = f"{cacheFile}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(_helpCacheDir, exist_ok=True)
+            with open(tmpFileName, "w") as fw:
+                fw.write(commandsHash + "\\n" + helpText)
+            os.replace(tmpFileName, cacheFile)
+        except OSError:
+            # read only install, help is rendered every time
+            if os.path.exists(tmpFileName):
+                os.remove(tmpFileName)
+    return helpText
+
+
+def renderedOutput(printFunc, *args) -> str:
+    \"\"\"Return what printFunc(*args) prints to stdout\"\"\"
+    outStr = StringIO()
+    with redirect_stdout(outStr):
+        printFunc(*args)
+    return outStr.getvalue()
+
+
+def clearHelpCache():
+    \"\"\"Remove every cached help text, called whenever commands.json is written\"\"\"
+    _commandsHash["stat"] = None
+    if not os.path.isdir(_helpCacheDir):
+        return
+    for fileName in os.listdir(_helpCacheDir):
+        try:
+            os.remove(os.path.join(_helpCacheDir, fileName))
+        except OSError:
+            pass
+"""))
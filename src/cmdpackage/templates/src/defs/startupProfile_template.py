@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+startupProfile_template = Template(dedent("""import os
+import sys
+import time
+import atexit
+import builtins
+import importlib.util
+from contextlib import contextmanager
+
+PROFILE_SWITCH = "--profile-startup"
+PROFILE_MODES = ["cprofile", "imports"]
+
+
+class StartupProfiler:
+    \"\"\"Collect wall times of the CLI startup phases when --profile-startup is given
+
+    Usage:
+        ${packName} --profile-startup <command> ...
+        ${packName} --profile-startup=cprofile,imports <command> ...
+
+    The phase report, and the optional cProfile summary and import-time tree,
+    are written to stderr when the process exits. The cProfile data is also
+    dumped to ${packName}_startup.prof in the current directory.
+    \"\"\"
+
+    def __init__(self):
+        self.enabled = False
+        self.modes = set()
+        self.phases = {}
+        self.start_time = time.perf_counter()
+        self._cprofile = None
+        self._imports = []
+        self._import_depth = 0
+        self._original_import = None
+
+    def configure(self, argv: list) -> None:
+        \"\"\"Enable profiling if argv holds the switch and remove it from argv\"\"\"
+        for arg in list(argv[1:]):
+            if arg == PROFILE_SWITCH or arg.startswith(PROFILE_SWITCH + "="):
+                argv.remove(arg)
+                self.enabled = True
+                if "=" in arg:
+                    self.modes.update(mode for mode in arg.split("=", 1)[1].split(",") if mode in PROFILE_MODES)
+        if not self.enabled:
+            return
+        if "imports" in self.modes:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._timed_import
+        if "cprofile" in self.modes:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        atexit.register(self.report)
+
+    @contextmanager
+    def phase(self, name: str):
+        \"\"\"Time the enclosed block, repeated phases are added up\"\"\"
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self) -> None:
+        \"\"\"Write the collected timings to stderr\"\"\"
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        out = sys.stderr
+        total = time.perf_counter() - self.start_time
+        print(f"\\nStartup profile ({total * 1000:.1f} ms since profiler import):", file=out)
+        for name, seconds in self.phases.items():
+            print(f"  {name:<12} {seconds * 1000:9.1f} ms", file=out)
+        if self._cprofile is not None:
+            import pstats
+
+            dump_file = os.path.abspath("${packName}_startup.prof")
+            self._cprofile.dump_stats(dump_file)
+            print(f"\\ncProfile data written to {dump_file}", file=out)
+            pstats.Stats(self._cprofile, stream=out).sort_stats("cumulative").print_stats(15)
+        if "imports" in self.modes:
+            print("\\nImport time (ms, self/cumulative):", file=out)
+            for depth, name, self_ms, cumulative_ms in self._imports:
+                print(f"  {self_ms:8.1f} {cumulative_ms:8.1f}  {'  ' * depth}{name}", file=out)
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        full_name = name
+        if level:
+            try:
+                full_name = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+            except (ImportError, ValueError):
+                return self._original_import(name, globals, locals, fromlist, level)
+        # only first imports are interesting, cached modules cost nothing
+        if full_name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        record = [self._import_depth, full_name, 0.0, 0.0]
+        self._imports.append(record)
+        child_count = len(self._imports)
+        self._import_depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative_ms = (time.perf_counter() - start) * 1000
+            self._import_depth -= 1
+            children_ms = sum(r[3] for r in self._imports[child_count:] if r[0] == record[0] + 1)
+            record[2] = cumulative_ms - children_ms
+            record[3] = cumulative_ms
+
+
+profiler = StartupProfiler()
+"""))
@@ -0,0 +1,118 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+storage_template = Template(dedent("""import os
+import json
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # no advisory locks on this platform, writes are still atomic
+    fcntl = None
+
+LOCK_SUFFIX = ".lock"
+
+# Locks held by this process: lock file name -> [file object, depth]. flock
+# locks belong to an open file, so nested fileLock() calls reuse the same one.
+_heldLocks = {}
+_heldLocksGuard = threading.RLock()
+
+
+@contextmanager
+def fileLock(fileName):
+    \"\"\"Hold an exclusive advisory lock on fileName for the duration of the block.
+
+    The lock is taken on a fileName.lock sidecar so the data file itself can be
+    replaced by atomicWriteJson while the lock is held. Nested calls for the
+    same file in one process are re-entrant.
+    \"\"\"
+    lockFileName = os.path.abspath(f"{fileName}{LOCK_SUFFIX}")
+    with _heldLocksGuard:
+        held = _heldLocks.get(lockFileName)
+        if held is not None:
+            held[1] += 1
+        else:
+            lockFile = open(lockFileName, "a")
+            if fcntl is not None:
+                fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX)
+            held = _heldLocks[lockFileName] = [lockFile, 1]
+        try:
+            yield
+        finally:
+            held[1] -= 1
+            if held[1] == 0:
+                del _heldLocks[lockFileName]
+                if fcntl is not None:
+                    fcntl.flock(held[0].fileno(), fcntl.LOCK_UN)
+                held[0].close()
+
+
+def readJson(fileName, default=None):
+    \"\"\"Return the parsed content of fileName, or default if it does not exist\"\"\"
+    try:
+        with open(fileName, "r", encoding="utf-8") as fr:
+            return json.load(fr)
+    except FileNotFoundError:
+        return default
+
+
+def _umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def atomicWriteText(fileName, text):
+    \"\"\"Write text to fileName through a temporary file and a rename.
+
+    Readers see either the old or the new content, never a truncated file.
+    Use fileLock or jsonTransaction around it to serialize read-modify-write.
+    \"\"\"
+    fileName = os.fspath(fileName)
+    fileDir = os.path.dirname(os.path.abspath(fileName))
+    fd, tmpFileName = tempfile.mkstemp(dir=fileDir, prefix=f".{os.path.basename(fileName)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fw:
+            fw.write(text)
+            fw.flush()
+            os.fsync(fw.fileno())
+        # keep the mode of the file being replaced, mkstemp creates it 0600
+        if os.path.exists(fileName):
+            shutil.copymode(fileName, tmpFileName)
+        else:
+            os.chmod(tmpFileName, 0o666 & ~_umask())
+        os.replace(tmpFileName, fileName)
+    except BaseException:
+        if os.path.exists(tmpFileName):
+            os.remove(tmpFileName)
+        raise
+
+
+def atomicWriteJson(fileName, data, indent=2, **dumpArgs):
+    \"\"\"Write data as JSON to fileName with atomicWriteText\"\"\"
+    atomicWriteText(fileName, json.dumps(data, indent=indent, **dumpArgs))
+
+
+@contextmanager
+def jsonTransaction(fileName, default=None, indent=2, **dumpArgs):
+    \"\"\"Read-modify-write fileName under its lock.
+
+    Yields the parsed content (a copy of default if the file does not exist).
+    If the block changed it and exits without an exception the data is written
+    back atomically, unchanged data is not rewritten.
+    \"\"\"
+    with fileLock(fileName):
+        data = readJson(fileName)
+        if data is None:
+            data = json.loads(json.dumps(default if default is not None else {}))
+        before = json.dumps(data, sort_keys=True)
+        yield data
+        if json.dumps(data, sort_keys=True) != before or not os.path.exists(fileName):
+            atomicWriteJson(fileName, data, indent=indent, **dumpArgs)
+"""))
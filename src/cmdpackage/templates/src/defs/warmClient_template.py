@@ -0,0 +1,138 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+warmClient_template = Template(dedent("""import os
+import sys
+import zlib
+import marshal
+import _signal
+import _socket
+
+# Client side of the warm server mode, see defs/warmServer.py. main() imports
+# this module before anything else, so it only uses modules built into the
+# interpreter: json, socket and signal would import re and enum, which cost
+# more than the rest of a warm call. A warm call still pays for starting the
+# interpreter itself.
+_packageName = __package__.split(".")[0]
+WARM_ENV = f"{_packageName.upper()}_WARM"
+WARM_IDLE_ENV = f"{WARM_ENV}_IDLE"
+WARM_IDLE_SECONDS = 900
+
+_packageDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def warmEnabled() -> bool:
+    return os.environ.get(WARM_ENV, "") not in ("", "0")
+
+
+def socketPath() -> str:
+    \"\"\"Unix socket of the warm server for this user and package location\"\"\"
+    runDir = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    # socket paths are limited to about 100 bytes, so the package location is hashed
+    packageKey = format(zlib.crc32(_packageDir.encode("utf-8")), "08x")
+    return os.path.join(runDir, f"{_packageName}-{os.getuid()}-{packageKey}.warm.sock")
+
+
+def sendMessage(conn, message: dict) -> None:
+    \"\"\"Send a length prefixed, marshalled message\"\"\"
+    data = marshal.dumps(message)
+    conn.sendall(len(data).to_bytes(4, "big") + data)
+
+
+def _recvExactly(conn, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise EOFError("warm server closed the connection")
+        data += chunk
+    return data
+
+
+def readMessage(conn) -> dict:
+    \"\"\"Read a message written by sendMessage
+
+    Raises:
+        EOFError, ValueError, TypeError: If the connection closed or the message is not valid
+    \"\"\"
+    message = marshal.loads(_recvExactly(conn, int.from_bytes(_recvExactly(conn, 4), "big")))
+    if not isinstance(message, dict):
+        raise ValueError("warm server message is not a mapping")
+    return message
+
+
+def forwardToWarmServer(argv: list):
+    \"\"\"Run argv in the warm server and return its exit code
+
+    stdin, stdout and stderr are passed to the server as file descriptors, so
+    the command reads and writes this process's streams directly. Ctrl-C is
+    forwarded to the process running the command.
+
+    Returns:
+        int: Exit code of the command, None if warm mode is off or no server
+            could run it. A missing or outdated server is started in the
+            background and the caller runs the command itself this time.
+    \"\"\"
+    if not warmEnabled() or not hasattr(_socket, "AF_UNIX"):
+        return None
+    sockPath = socketPath()
+    conn = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        # never hand our streams and environment to a socket another user created
+        if os.stat(sockPath).st_uid != os.getuid():
+            conn.close()
+            return None
+        conn.connect(sockPath)
+    except OSError:
+        conn.close()
+        startWarmServer()
+        return None
+    try:
+        try:
+            fds = b"".join(fd.to_bytes(4, sys.byteorder) for fd in (0, 1, 2))
+            conn.sendmsg([b"\\0"], [(_socket.SOL_SOCKET, _socket.SCM_RIGHTS, fds)])
+            sendMessage(conn, {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)})
+            reply = readMessage(conn)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if "pid" not in reply:
+            # sources changed since the server started
+            startWarmServer()
+            return None
+        while True:
+            try:
+                reply = readMessage(conn)
+                break
+            except KeyboardInterrupt:
+                try:
+                    os.kill(reply["pid"], _signal.SIGINT)
+                except OSError:
+                    pass
+            except (OSError, EOFError, ValueError, TypeError):
+                return 1
+        return reply.get("exitCode", 1)
+    finally:
+        conn.close()
+
+
+def startWarmServer() -> None:
+    \"\"\"Start a detached warm server for this package\"\"\"
+    import subprocess
+
+    env = dict(os.environ)
+    # the server must import this very copy of the package
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(_packageDir), env.get("PYTHONPATH")]))
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", f"{_packageName}.defs.warmServer"],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+"""))
@@ -0,0 +1,209 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+warmServer_template = Template(dedent("""import os
+import sys
+import signal
+import socket
+from .warmClient import WARM_IDLE_ENV, WARM_IDLE_SECONDS, readMessage, sendMessage, socketPath
+
+# <PACKNAME>_WARM=1, the package name in upper case, forwards every call to a
+# background server that keeps the CLI imported. The client side, which main()
+# runs first, is defs/warmClient.py. The server exits after <PACKNAME>_WARM_IDLE
+# seconds without a request (default WARM_IDLE_SECONDS) and is replaced when a
+# source file changes.
+_packageDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_cmdJsonFileName = os.path.join(_packageDir, "commands", "commands.json")
+
+
+def _sourceFingerprint() -> list:
+    # stat of commands.json and every module of the package, any change restarts the server
+    fingerprint = []
+    for dirPath in [_packageDir] + [entry.path for entry in os.scandir(_packageDir) if entry.is_dir()]:
+        for entry in os.scandir(dirPath):
+            if entry.name.endswith(".py"):
+                fingerprint.append((entry.path, entry.stat().st_mtime_ns))
+    try:
+        fingerprint.append((_cmdJsonFileName, os.stat(_cmdJsonFileName).st_mtime_ns))
+    except OSError:
+        pass
+    return sorted(fingerprint)
+
+
+class WarmServer:
+    \"\"\"Keep the CLI imported and run forwarded command lines in forked children
+
+    Every request is run by a fork of the server, so commands start with all
+    modules and the command registry already loaded and cannot change the
+    state the next request starts from.
+    \"\"\"
+
+    def __init__(self, sockPath: str, idleSeconds: float):
+        self.sockPath = sockPath
+        self.idleSeconds = idleSeconds
+        self.listener = None
+        self.sockIno = None
+        self.fingerprint = None
+
+    def serve(self) -> None:
+        if not self._bind():
+            return
+        try:
+            self._warmUp()
+            self.fingerprint = _sourceFingerprint()
+            # children report their exit code themselves, the kernel reaps them
+            signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+            self.listener.settimeout(self.idleSeconds)
+            while True:
+                try:
+                    conn, _ = self.listener.accept()
+                except socket.timeout:
+                    break
+                with conn:
+                    if not self._trusted(conn):
+                        continue
+                    if _sourceFingerprint() != self.fingerprint:
+                        sendMessage(conn, {"restart": True})
+                        break
+                    self._handle(conn)
+        finally:
+            self._close()
+
+    def _bind(self) -> bool:
+        from .storage import fileLock
+
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        with fileLock(self.sockPath):
+            if os.path.exists(self.sockPath):
+                probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    probe.connect(self.sockPath)
+                    # another server is already answering
+                    self.listener.close()
+                    return False
+                except OSError:
+                    os.unlink(self.sockPath)
+                finally:
+                    probe.close()
+            oldUmask = os.umask(0o077)
+            try:
+                self.listener.bind(self.sockPath)
+            finally:
+                os.umask(oldUmask)
+            self.listener.listen(16)
+            self.sockIno = os.stat(self.sockPath).st_ino
+        return True
+
+    def _close(self) -> None:
+        self.listener.close()
+        try:
+            # a replacement server may already own the path
+            if os.stat(self.sockPath).st_ino == self.sockIno:
+                os.unlink(self.sockPath)
+        except OSError:
+            pass
+
+    def _trusted(self, conn: socket.socket) -> bool:
+        if not hasattr(socket, "SO_PEERCRED"):
+            return True
+        import struct
+
+        creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        return struct.unpack("3i", creds)[1] == os.getuid()
+
+    def _warmUp(self) -> None:
+        # import everything a command run needs, including every command module
+        from ..main import runMain
+        from ..classes.argParse import ArgParse
+        from ..commands.cmdSwitchbord import cmdSwitchbord
+        from ..commands.cmdDispatch import resolveCommand
+        from ..commands.commands import Commands
+
+        for cmdName in Commands().commands:
+            try:
+                resolveCommand(cmdName)
+            except Exception:
+                pass
+
+    def _handle(self, conn: socket.socket) -> None:
+        try:
+            _, fds, _, _ = socket.recv_fds(conn, 1, 3)
+            request = readMessage(conn)
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if len(fds) != 3:
+            for fd in fds:
+                os.close(fd)
+            return
+        pid = os.fork()
+        if pid == 0:
+            exitCode = 1
+            try:
+                self.listener.close()
+                sendMessage(conn, {"pid": os.getpid()})
+                exitCode = _runForwarded(request, fds)
+                sendMessage(conn, {"exitCode": exitCode})
+            finally:
+                os._exit(0)
+        for fd in fds:
+            os.close(fd)
+
+
+def _runForwarded(request: dict, fds: list) -> int:
+    \"\"\"Run a forwarded command line in a forked server child and return its exit code\"\"\"
+    import time
+    import atexit
+    import traceback
+    from .startupProfile import profiler
+    from ..main import runMain
+
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    for targetFd, fd in enumerate(fds):
+        os.dup2(fd, targetFd)
+        os.close(fd)
+    for stream in (sys.stdout, sys.stderr):
+        stream.reconfigure(line_buffering=stream.isatty())
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    sys.argv = request["argv"]
+    profiler.start_time = time.perf_counter()
+    atexit._clear()
+
+    exitCode = 0
+    try:
+        runMain()
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            exitCode = e.code
+        elif e.code is not None:
+            print(e.code, file=sys.stderr)
+            exitCode = 1
+    except BaseException:
+        traceback.print_exc()
+        exitCode = 1
+    finally:
+        atexit._run_exitfuncs()
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+    return exitCode
+
+
+def serve() -> None:
+    \"\"\"Run the warm server for this package until it is idle or outdated\"\"\"
+    try:
+        idleSeconds = float(os.environ.get(WARM_IDLE_ENV, WARM_IDLE_SECONDS))
+    except ValueError:
+        idleSeconds = WARM_IDLE_SECONDS
+    WarmServer(socketPath(), idleSeconds).serve()
+
+
+if __name__ == "__main__":
+    serve()
+"""))
@@ -4,13 +4,43 @@ from textwrap import dedent
 from string import Template
 
 main_template = Template(dedent("""import sys, os
-from .classes.argParse import ArgParse
-from .commands.cmdSwitchbord import cmdSwitchbord
+from .defs.warmClient import forwardToWarmServer
 
 
 def main():
     # packName = os.path.basename(sys.argv[0])
-    argParse = ArgParse()
+    # With warm mode on, a running warm server executes the command
+    exitCode = forwardToWarmServer(sys.argv)
+    if exitCode is not None:
+        sys.exit(exitCode)
+    runMain()
+
+
+def runMain():
+    from .defs.startupProfile import profiler
+
+    # configured before the remaining imports so --profile-startup=imports sees them
+    profiler.configure(sys.argv)
+    from .classes.argParse import ArgParse
+    from .commands.cmdSwitchbord import cmdSwitchbord
+
+    if "--rebuild-index" in sys.argv:
+        # Re-parse every command file instead of trusting the persisted command index
+        sys.argv.remove("--rebuild-index")
+        from .classes.CommandManager import command_manager
+        from .defs.logIt import printIt, lable
+
+        index = command_manager.load_command_index(rebuild=True)
+        printIt(f"Command index rebuilt from {len(index)} command files", lable.INFO)
+        if len(sys.argv) == 1:
+            return
+    if sys.argv[1:2] == ["--batch"]:
+        # Every stdin line is a command line run in this process
+        from .classes.batchRun import runBatch
+
+        sys.exit(runBatch(sys.argv[2:]))
+    with profiler.phase("argParse"):
+        argParse = ArgParse()
     cmdSwitchbord(argParse)
 
 
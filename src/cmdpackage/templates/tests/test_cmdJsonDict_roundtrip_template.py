@@ -0,0 +1,364 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+test_cmdJsonDict_roundtrip_template = Template(dedent("""#!/usr/bin/env python3
+\"\"\"
+Test script for the commandJsonDict engine of ${packName} (src/${packName}/defs/cmdJsonDict.py)
+
+This test suite validates that:
+
+1. Replacing the commandJsonDict of a source splices only the assignment:
+   the text before and after it, comments included, is kept byte for byte
+2. The new commandJsonDict reads back equal, and replacing it again with the
+   same dict or restoring the old one is stable
+3. A generated command file round trips through its own commandJsonDict
+4. Removing a function cuts it with its decorators and leaves every other
+   function unchanged
+
+The engine is run in a new process on files in a temporary directory, the
+project is not changed.
+\"\"\"
+
+import tempfile
+import os
+import sys
+import json
+import shlex
+import subprocess
+from pathlib import Path
+from textwrap import dedent
+from typing import Tuple
+
+
+class Colors:
+    \"\"\"ANSI color codes for terminal output\"\"\"
+
+    RED = "\\033[0;31m"
+    GREEN = "\\033[0;32m"
+    YELLOW = "\\033[1;33m"
+    BLUE = "\\033[0;34m"
+    MAGENTA = "\\033[35m"
+    NC = "\\033[0m"  # No Color
+
+
+class TestResult:
+    \"\"\"Class to track test results\"\"\"
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.tests = []
+
+    def add_result(self, test_name: str, passed: bool, message: str = ""):
+        self.tests.append((test_name, passed, message))
+        if passed:
+            self.passed += 1
+            print_pass(f"{test_name}: {message}")
+        else:
+            self.failed += 1
+            print_fail(f"{test_name}: {message}")
+
+    def print_summary(self):
+        total = self.passed + self.failed
+        print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+        print(f"{Colors.BLUE}TEST SUMMARY{Colors.NC}")
+        print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+        print(f"Total tests: {total}")
+        print(f"{Colors.GREEN}Passed: {self.passed}{Colors.NC}")
+        print(f"{Colors.RED}Failed: {self.failed}{Colors.NC}")
+
+        if self.failed > 0:
+            print(f"{Colors.RED}FAILED TESTS:{Colors.NC}")
+            for test_name, passed, message in self.tests:
+                if not passed:
+                    print(f"  - {test_name}: {message}")
+
+        success_rate = (self.passed / total * 100) if total > 0 else 0
+        print(f"Success rate: {success_rate:.1f}%")
+        return self.failed == 0
+
+
+def print_test(message: str):
+    \"\"\"Print test status message\"\"\"
+    print(f"{Colors.BLUE}[TEST]{Colors.NC} {message}")
+
+
+def print_pass(message: str):
+    \"\"\"Print pass message\"\"\"
+    print(f"{Colors.GREEN}[PASS]{Colors.NC} {message}")
+
+
+def print_fail(message: str):
+    \"\"\"Print fail message\"\"\"
+    print(f"{Colors.RED}[FAIL]{Colors.NC} {message}")
+
+
+def print_info(message: str):
+    \"\"\"Print info message\"\"\"
+    print(f"{Colors.YELLOW}[INFO]{Colors.NC} {message}")
+
+
+def python_command(code: str, *args: str) -> str:
+    \"\"\"Shell command running code with the project's Python in its virtual environment\"\"\"
+    project_dir = Path(__file__).parent.parent
+    python_cmd = f"python -c {shlex.quote(dedent(code))} " + " ".join(shlex.quote(str(arg)) for arg in args)
+    return f"cd {project_dir} && source env/${packName}/bin/activate && {python_cmd}"
+
+
+def run_python(code: str, *args: str) -> Tuple[int, str, str]:
+    \"\"\"Run code in a new process and return (returncode, stdout, stderr)\"\"\"
+    try:
+        result = subprocess.run(
+            python_command(code, *args),
+            shell=True,
+            text=True,
+            capture_output=True,
+            executable="/bin/bash",
+            timeout=60,
+        )
+        return result.returncode, result.stdout, result.stderr
+    except Exception as e:
+        return 1, "", str(e)
+
+
+def start_python(code: str, *args: str) -> subprocess.Popen:
+    \"\"\"Start code in a new process without waiting for it\"\"\"
+    return subprocess.Popen(
+        python_command(code, *args),
+        shell=True,
+        text=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        executable="/bin/bash",
+    )
+
+
+SAMPLE_SOURCE = '''#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Sample command file, this header comment must survive
+import os   # spacing kept
+
+commandJsonDict = {
+    "testSplice": {
+        "description": "Sample command",   # comment inside the literal
+        "arguments": {"alpha": "First argument"},
+    }
+}  # comment after the commandJsonDict
+
+# comment between functions
+
+
+def alpha(argParse):
+    \"\"\"Keep me\"\"\"
+    return  os.getcwd()   # odd spacing kept
+
+
+@staticmethod
+def beta(argParse):
+    def inner():
+        return 2
+    return inner()
+
+
+def gamma(argParse):
+    return "gamma"
+'''
+
+NEW_DICT = {
+    "testSplice": {
+        "description": "Changed description",
+        "arguments": {"alpha": "First argument", "gamma": "Third argument"},
+        "option_switches": {"verbose": "Verbose output"},
+    }
+}
+
+# Runs the engine on a source file and prints every result as JSON
+ENGINE_CODE = \"\"\"
+    import sys, json
+    from ${packName}.defs.cmdJsonDict import (
+        extractCommandJsonDict, locateCommandJsonDict, replaceCommandJsonDict, rewriteCommandSource
+    )
+    source = open(sys.argv[1], encoding="utf-8").read()
+    newDict = json.loads(sys.argv[2])
+    removeNames = json.loads(sys.argv[3])
+    start, end, oldDict = locateCommandJsonDict(source)
+    newSource = replaceCommandJsonDict(source, newDict)
+    restored = replaceCommandJsonDict(newSource, oldDict)
+    cutSource, removed = rewriteCommandSource(source, oldDict, removeNames)
+    print(json.dumps({
+        "start": start,
+        "end": end,
+        "oldDict": oldDict,
+        "newSource": newSource,
+        "newDict": extractCommandJsonDict(newSource),
+        "again": replaceCommandJsonDict(newSource, newDict),
+        "restored": restored,
+        "restoredDict": extractCommandJsonDict(restored),
+        "cutSource": cutSource,
+        "removed": removed,
+    }))
+\"\"\"
+
+
+def run_engine(source_file: Path, new_dict: dict, remove_names: list) -> Tuple[dict, str]:
+    \"\"\"Run ENGINE_CODE on source_file and return its results and stderr\"\"\"
+    returncode, stdout, stderr = run_python(ENGINE_CODE, source_file, json.dumps(new_dict), json.dumps(remove_names))
+    if returncode != 0:
+        return {}, stderr.strip()
+    try:
+        return json.loads(stdout.strip().splitlines()[-1]), ""
+    except (ValueError, IndexError):
+        return {}, stdout.strip()
+
+
+def splice_kept_surroundings(source: str, results: dict, key: str) -> bool:
+    \"\"\"Check that results[key] differs from source only inside the commandJsonDict span\"\"\"
+    spliced = results[key]
+    before, after = source[: results["start"]], source[results["end"] :]
+    return spliced.startswith(before) and spliced.endswith(after)
+
+
+def test_splice_keeps_source(result: TestResult, test_dir: Path) -> bool:
+    \"\"\"Test 1: Replacing commandJsonDict keeps everything around it byte for byte\"\"\"
+    print_test("Test 1: commandJsonDict splice keeps comments and formatting")
+    source_file = test_dir / "testSplice.py"
+    source_file.write_text(SAMPLE_SOURCE)
+    results, error = run_engine(source_file, NEW_DICT, [])
+    if not results:
+        result.add_result("Splice keeps source", False, f"Failed - engine error: {error}")
+        return False
+
+    kept = splice_kept_surroundings(SAMPLE_SOURCE, results, "newSource")
+    comments_kept = all(
+        comment in results["newSource"]
+        for comment in ("# Sample command file", "# spacing kept", "# comment after the commandJsonDict",
+                        "# comment between functions", "# odd spacing kept")
+    )
+    passed = kept and comments_kept
+    result.add_result(
+        "Splice keeps source",
+        passed,
+        "text around commandJsonDict unchanged" if passed else f"Failed - surroundings:{kept}, comments:{comments_kept}",
+    )
+    return passed
+
+
+def test_splice_round_trip(result: TestResult, test_dir: Path) -> bool:
+    \"\"\"Test 2: The spliced commandJsonDict reads back and restoring the old one round trips\"\"\"
+    print_test("Test 2: commandJsonDict round trip")
+    source_file = test_dir / "testSplice.py"
+    source_file.write_text(SAMPLE_SOURCE)
+    results, error = run_engine(source_file, NEW_DICT, [])
+    if not results:
+        result.add_result("commandJsonDict round trip", False, f"Failed - engine error: {error}")
+        return False
+
+    old_ok = results["oldDict"] == {
+        "testSplice": {"description": "Sample command", "arguments": {"alpha": "First argument"}}
+    }
+    new_ok = results["newDict"] == NEW_DICT
+    stable = results["again"] == results["newSource"]
+    restored_ok = results["restoredDict"] == results["oldDict"] and splice_kept_surroundings(
+        SAMPLE_SOURCE, results, "restored"
+    )
+    passed = old_ok and new_ok and stable and restored_ok
+    result.add_result(
+        "commandJsonDict round trip",
+        passed,
+        "new dict read back, repeated splice stable, old dict restored"
+        if passed
+        else f"Failed - old:{old_ok}, new:{new_ok}, stable:{stable}, restored:{restored_ok}",
+    )
+    return passed
+
+
+def test_generated_command_round_trip(result: TestResult, test_dir: Path) -> bool:
+    \"\"\"Test 3: A generated command file round trips through its own commandJsonDict\"\"\"
+    print_test("Test 3: Generated command file round trip")
+    commands_dir = Path(__file__).parent.parent / "src" / "${packName}" / "commands"
+    source = (commands_dir / "newCmd.py").read_text()
+    source_file = test_dir / "newCmd.py"
+    source_file.write_text(source)
+    results, error = run_engine(source_file, {}, [])
+    if not results:
+        result.add_result("Generated command round trip", False, f"Failed - engine error: {error}")
+        return False
+
+    restored_ok = results["restoredDict"] == results["oldDict"] and splice_kept_surroundings(
+        source, results, "restored"
+    )
+    passed = bool(results["oldDict"]) and restored_ok
+    result.add_result(
+        "Generated command round trip",
+        passed,
+        "newCmd.py commandJsonDict rewritten in place"
+        if passed
+        else f"Failed - dict found:{bool(results['oldDict'])}, restored:{restored_ok}",
+    )
+    return passed
+
+
+def test_function_removal(result: TestResult, test_dir: Path) -> bool:
+    \"\"\"Test 4: Removing a function cuts only that function\"\"\"
+    print_test("Test 4: Function removal")
+    source_file = test_dir / "testSplice.py"
+    source_file.write_text(SAMPLE_SOURCE)
+    results, error = run_engine(source_file, {}, ["beta", "missing"])
+    if not results:
+        result.add_result("Function removal", False, f"Failed - engine error: {error}")
+        return False
+
+    cut_source = results["cutSource"]
+    beta_start = SAMPLE_SOURCE.index("\\n\\n\\n@staticmethod")
+    beta_end = SAMPLE_SOURCE.index("\\n\\n\\ndef gamma")
+    # the commandJsonDict is written out again, everything after it is compared
+    expected_tail = SAMPLE_SOURCE[results["end"] : beta_start] + SAMPLE_SOURCE[beta_end:]
+    source_ok = cut_source.startswith(SAMPLE_SOURCE[: results["start"]]) and cut_source.endswith(expected_tail)
+    passed = results["removed"] == ["beta"] and source_ok
+    result.add_result(
+        "Function removal",
+        passed,
+        "beta and its decorator removed, alpha and gamma unchanged"
+        if passed
+        else f"Failed - removed:{results['removed']}, source matches:{source_ok}",
+    )
+    return passed
+
+
+def main():
+    \"\"\"Run all tests\"\"\"
+    print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+    print(f"{Colors.BLUE}commandJsonDict Round Trip Test Suite{Colors.NC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+
+    result = TestResult()
+
+    tests = [
+        test_splice_keeps_source,
+        test_splice_round_trip,
+        test_generated_command_round_trip,
+        test_function_removal,
+    ]
+
+    with tempfile.TemporaryDirectory() as test_dir:
+        for test_func in tests:
+            try:
+                test_func(result, Path(test_dir))
+            except Exception as e:
+                result.add_result(test_func.__name__, False, f"exception: {e}")
+
+    success = result.print_summary()
+
+    if success:
+        print(f"{Colors.GREEN}All tests passed! The commandJsonDict engine is working correctly.{Colors.NC}")
+        sys.exit(0)
+    else:
+        print(f"{Colors.RED}Some tests failed. Please check the implementation.{Colors.NC}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+"""))
@@ -0,0 +1,324 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+test_optionStore_roundtrip_template = Template(dedent("""#!/usr/bin/env python3
+\"\"\"
+Test script for the .cmdrc OptionStore of ${packName} (src/${packName}/classes/optSwitches.py)
+
+This test suite validates that:
+
+1. Option changes are written to .cmdrc when the process exits, without an
+   explicit flush
+2. Two processes editing .cmdrc at the same time keep both edits
+3. Pending edits are replayed when another process rewrites the file, and the
+   flush merges them into its current content
+
+Test 2 uses the project's .cmdrc and removes its test entries at the end, the
+other tests use a .cmdrc in a temporary directory.
+\"\"\"
+
+import time
+import tempfile
+import os
+import sys
+import json
+import shlex
+import subprocess
+from pathlib import Path
+from textwrap import dedent
+from typing import Tuple
+
+
+class Colors:
+    \"\"\"ANSI color codes for terminal output\"\"\"
+
+    RED = "\\033[0;31m"
+    GREEN = "\\033[0;32m"
+    YELLOW = "\\033[1;33m"
+    BLUE = "\\033[0;34m"
+    MAGENTA = "\\033[35m"
+    NC = "\\033[0m"  # No Color
+
+
+class TestResult:
+    \"\"\"Class to track test results\"\"\"
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.tests = []
+
+    def add_result(self, test_name: str, passed: bool, message: str = ""):
+        self.tests.append((test_name, passed, message))
+        if passed:
+            self.passed += 1
+            print_pass(f"{test_name}: {message}")
+        else:
+            self.failed += 1
+            print_fail(f"{test_name}: {message}")
+
+    def print_summary(self):
+        total = self.passed + self.failed
+        print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+        print(f"{Colors.BLUE}TEST SUMMARY{Colors.NC}")
+        print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+        print(f"Total tests: {total}")
+        print(f"{Colors.GREEN}Passed: {self.passed}{Colors.NC}")
+        print(f"{Colors.RED}Failed: {self.failed}{Colors.NC}")
+
+        if self.failed > 0:
+            print(f"{Colors.RED}FAILED TESTS:{Colors.NC}")
+            for test_name, passed, message in self.tests:
+                if not passed:
+                    print(f"  - {test_name}: {message}")
+
+        success_rate = (self.passed / total * 100) if total > 0 else 0
+        print(f"Success rate: {success_rate:.1f}%")
+        return self.failed == 0
+
+
+def print_test(message: str):
+    \"\"\"Print test status message\"\"\"
+    print(f"{Colors.BLUE}[TEST]{Colors.NC} {message}")
+
+
+def print_pass(message: str):
+    \"\"\"Print pass message\"\"\"
+    print(f"{Colors.GREEN}[PASS]{Colors.NC} {message}")
+
+
+def print_fail(message: str):
+    \"\"\"Print fail message\"\"\"
+    print(f"{Colors.RED}[FAIL]{Colors.NC} {message}")
+
+
+def print_info(message: str):
+    \"\"\"Print info message\"\"\"
+    print(f"{Colors.YELLOW}[INFO]{Colors.NC} {message}")
+
+
+def python_command(code: str, *args: str) -> str:
+    \"\"\"Shell command running code with the project's Python in its virtual environment\"\"\"
+    project_dir = Path(__file__).parent.parent
+    python_cmd = f"python -c {shlex.quote(dedent(code))} " + " ".join(shlex.quote(str(arg)) for arg in args)
+    return f"cd {project_dir} && source env/${packName}/bin/activate && {python_cmd}"
+
+
+def run_python(code: str, *args: str) -> Tuple[int, str, str]:
+    \"\"\"Run code in a new process and return (returncode, stdout, stderr)\"\"\"
+    try:
+        result = subprocess.run(
+            python_command(code, *args),
+            shell=True,
+            text=True,
+            capture_output=True,
+            executable="/bin/bash",
+            timeout=60,
+        )
+        return result.returncode, result.stdout, result.stderr
+    except Exception as e:
+        return 1, "", str(e)
+
+
+def start_python(code: str, *args: str) -> subprocess.Popen:
+    \"\"\"Start code in a new process without waiting for it\"\"\"
+    return subprocess.Popen(
+        python_command(code, *args),
+        shell=True,
+        text=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        executable="/bin/bash",
+    )
+
+
+CMDRC_FILE = Path(__file__).parent.parent / "src" / "${packName}" / "commands" / ".cmdrc"
+TEST_CMDS = ["testStoreCmdA", "testStoreCmdB"]
+
+
+def read_cmdrc(file_name: Path) -> dict:
+    \"\"\"Return the content of a .cmdrc file, {} if it is missing or invalid\"\"\"
+    try:
+        return json.loads(file_name.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def stored_switch(file_name: Path, cmd_name: str, option_name: str):
+    \"\"\"Return the stored value of a command's switch option, None if it is not stored\"\"\"
+    cmd_options = read_cmdrc(file_name).get("commands", {}).get(cmd_name, {})
+    return cmd_options.get("option_switches", {}).get(option_name)
+
+
+def cleanup_test_options():
+    \"\"\"Remove the options stored for the test commands from the project's .cmdrc\"\"\"
+    print_info("Cleaning up stored test options...")
+    run_python(
+        \"\"\"
+        import sys
+        from ${packName}.classes.optSwitches import remove_command_options
+        for cmdName in sys.argv[1:]:
+            remove_command_options(cmdName)
+        \"\"\",
+        *TEST_CMDS,
+    )
+
+
+def test_flush_at_exit(result: TestResult, test_dir: Path) -> bool:
+    \"\"\"Test 1: An edit is written when the process exits\"\"\"
+    print_test("Test 1: Flush at exit")
+    cmdrc_file = test_dir / "exit.cmdrc"
+
+    returncode, stdout, stderr = run_python(
+        \"\"\"
+        import sys
+        from ${packName}.classes.optSwitches import OptionStore
+        store = OptionStore(sys.argv[1])
+        store.update(lambda data: data["option_switches"].update({"exitFlag": True}))
+        \"\"\",
+        cmdrc_file,
+    )
+    stored = read_cmdrc(cmdrc_file).get("option_switches", {}).get("exitFlag")
+
+    passed = returncode == 0 and stored is True
+    result.add_result(
+        "Flush at exit",
+        passed,
+        "pending edit written by the atexit flush" if passed else f"Failed - rc:{returncode}, stored:{stored} {stderr.strip()}",
+    )
+    return passed
+
+
+def test_two_processes(result: TestResult, test_dir: Path) -> bool:
+    \"\"\"Test 2: Two processes editing the project's .cmdrc keep both edits\"\"\"
+    print_test("Test 2: Two processes editing .cmdrc")
+    ready_file, go_file = test_dir / "ready", test_dir / "go"
+
+    # Process A keeps its edit pending until process B has written its own
+    process_a = start_python(
+        \"\"\"
+        import os, sys, time
+        from ${packName}.classes.optSwitches import toggle_command_option
+        toggle_command_option(sys.argv[1], "storeFlag", True)
+        open(sys.argv[2], "w").close()
+        deadline = time.time() + 30
+        while not os.path.exists(sys.argv[3]) and time.time() < deadline:
+            time.sleep(0.05)
+        \"\"\",
+        TEST_CMDS[0],
+        ready_file,
+        go_file,
+    )
+    deadline = time.time() + 30
+    while not ready_file.exists() and time.time() < deadline and process_a.poll() is None:
+        time.sleep(0.05)
+
+    returncode_b, stdout, stderr = run_python(
+        \"\"\"
+        import sys
+        from ${packName}.classes.optSwitches import toggle_command_option
+        toggle_command_option(sys.argv[1], "storeFlag", True)
+        \"\"\",
+        TEST_CMDS[1],
+    )
+    a_pending = stored_switch(CMDRC_FILE, TEST_CMDS[0], "storeFlag") is None
+    go_file.touch()
+    returncode_a = process_a.wait(timeout=60)
+
+    a_stored = stored_switch(CMDRC_FILE, TEST_CMDS[0], "storeFlag") is True
+    b_stored = stored_switch(CMDRC_FILE, TEST_CMDS[1], "storeFlag") is True
+
+    passed = returncode_a == 0 and returncode_b == 0 and a_pending and a_stored and b_stored
+    result.add_result(
+        "Two processes editing .cmdrc",
+        passed,
+        "both edits kept"
+        if passed
+        else f"Failed - rc_a:{returncode_a}, rc_b:{returncode_b}, a_pending_until_exit:{a_pending}, a_stored:{a_stored}, b_stored:{b_stored}",
+    )
+    return passed
+
+
+def test_edit_replay(result: TestResult, test_dir: Path) -> bool:
+    \"\"\"Test 3: Pending edits are replayed on a .cmdrc rewritten by another writer\"\"\"
+    print_test("Test 3: Edit replay")
+    cmdrc_file = test_dir / "replay.cmdrc"
+
+    returncode, stdout, stderr = run_python(
+        \"\"\"
+        import sys, json
+        from ${packName}.classes.optSwitches import OptionStore
+        from ${packName}.defs.storage import atomicWriteJson
+        store = OptionStore(sys.argv[1])
+        store.update(lambda data: data["option_switches"].update({"mine": True}))
+        # another writer replaces the file while the edit is pending
+        atomicWriteJson(sys.argv[1], {"option_switches": {"theirs": True}, "option_strings": {"name": "x"}, "commands": {}})
+        seen = store.data["option_switches"]
+        flushed = store.flush()
+        print(json.dumps({"seen": seen, "flushed": flushed}))
+        \"\"\",
+        cmdrc_file,
+    )
+    try:
+        checks = json.loads(stdout.strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        checks = {}
+    on_disk = read_cmdrc(cmdrc_file)
+
+    passed = (
+        returncode == 0
+        and checks.get("seen") == {"theirs": True, "mine": True}
+        and checks.get("flushed") is True
+        and on_disk.get("option_switches") == {"theirs": True, "mine": True}
+        and on_disk.get("option_strings") == {"name": "x"}
+    )
+    result.add_result(
+        "Edit replay",
+        passed,
+        "pending edit replayed on the new content and merged by the flush"
+        if passed
+        else f"Failed - rc:{returncode}, checks:{checks}, on disk:{on_disk} {stderr.strip()}",
+    )
+    return passed
+
+
+def main():
+    \"\"\"Run all tests\"\"\"
+    print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+    print(f"{Colors.BLUE}OptionStore Round Trip Test Suite{Colors.NC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+
+    result = TestResult()
+
+    cleanup_test_options()
+
+    tests = [
+        test_flush_at_exit,
+        test_two_processes,
+        test_edit_replay,
+    ]
+
+    with tempfile.TemporaryDirectory() as test_dir:
+        for test_func in tests:
+            try:
+                test_func(result, Path(test_dir))
+            except Exception as e:
+                result.add_result(test_func.__name__, False, f"exception: {e}")
+
+    cleanup_test_options()
+
+    success = result.print_summary()
+
+    if success:
+        print(f"{Colors.GREEN}All tests passed! The OptionStore is working correctly.{Colors.NC}")
+        sys.exit(0)
+    else:
+        print(f"{Colors.RED}Some tests failed. Please check the implementation.{Colors.NC}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+"""))
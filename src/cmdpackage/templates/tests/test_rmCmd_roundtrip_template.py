@@ -15,6 +15,7 @@ This test suite validates the rmCmd command functionality including:
 4. Removing individual swtc flags from all locations(.cmdrc, commands.json, source file)
 5. Verifying that the command file remains intact during selective removals
 6. Finally removing the entire command and verifying complete cleanup
+7. Removing an argument cuts only its function from a customized command file
 
 All operations are verified across:
 - commands.json
@@ -23,6 +24,7 @@ All operations are verified across:
 \"\"\"
 
 import os
+import ast
 import json
 import subprocess
 import sys
@@ -257,7 +259,7 @@ def cleanup_test_commands():
     \"\"\"Clean up any existing test commands\"\"\"
     print_info("Cleaning up any existing test commands...")
 
-    test_commands = ["rmTestCmd01", "rmTestCmd02", "testVerify"]
+    test_commands = ["rmTestCmd01", "rmTestCmd02", "rmTestCmd03", "testVerify"]
 
     # Remove test commands if they exist
     for cmd in test_commands:
@@ -630,6 +632,61 @@ def test_remove_entire_command(result: TestResult) -> bool:
         return False
 
 
+def function_sources(source: str) -> dict:
+    \"\"\"Return {name: source text} of the module level functions in source\"\"\"
+    tree = ast.parse(source)
+    return {
+        node.name: ast.get_source_segment(source, node)
+        for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+
+
+def test_remove_argument_function(result: TestResult) -> bool:
+    \"\"\"Test 7: Removing an argument removes only its function from the command file\"\"\"
+    print_test("Test 7: Remove only the argument's function")
+
+    input_text = "Function removal test command\\nFirst argument\\nSecond argument\\nThird argument\\n"
+    run_command("${packName} newCmd rmTestCmd03 keepA dropB keepC", input_text)
+    cmd_file = Path(__file__).parent.parent / "src" / "${packName}" / "commands" / "rmTestCmd03.py"
+    if not cmd_file.exists():
+        result.add_result("Remove argument function", False, "Failed to create rmTestCmd03")
+        return False
+
+    # Customize the functions that must survive, as a user would
+    source = cmd_file.read_text()
+    source = source.replace("def keepA(argParse):\\n", "def keepA(argParse):\\n    # custom code in keepA\\n")
+    source = source.replace("def keepC(argParse):\\n", "def keepC(argParse):\\n    # custom code in keepC\\n")
+    cmd_file.write_text(source)
+    before = function_sources(source)
+
+    returncode, stdout, stderr = run_command('echo "y" | ${packName} rmCmd rmTestCmd03 dropB')
+
+    after_source = cmd_file.read_text()
+    after = function_sources(after_source)
+    drop_removed = "dropB" not in after
+    others_kept = all(after.get(name) == before[name] for name in before if name != "dropB")
+    custom_kept = "# custom code in keepA" in after_source and "# custom code in keepC" in after_source
+    arguments = get_command_data("rmTestCmd03").get("arguments", {})
+    json_ok = "dropB" not in arguments and "keepA" in arguments and "keepC" in arguments
+
+    all_ok = drop_removed and others_kept and custom_kept and json_ok
+    if all_ok:
+        result.add_result(
+            "Remove argument function",
+            True,
+            "dropB removed, every other function unchanged",
+        )
+    else:
+        result.add_result(
+            "Remove argument function",
+            False,
+            f"Failed - dropB_removed:{drop_removed}, others_kept:{others_kept}, custom_kept:{custom_kept}, commands_json:{json_ok}",
+        )
+    run_command('echo "y" | ${packName} rmCmd rmTestCmd03')
+    return all_ok
+
+
 def main():
     \"\"\"Run all tests\"\"\"
     print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
@@ -650,6 +707,7 @@ def main():
         test_remove_remaining_items,
         test_template_system_cleanup,
         test_remove_entire_command,
+        test_remove_argument_function,
     ]
 
     for test_func in tests:
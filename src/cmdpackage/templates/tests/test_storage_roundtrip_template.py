@@ -0,0 +1,304 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+test_storage_roundtrip_template = Template(dedent("""#!/usr/bin/env python3
+\"\"\"
+Test script for the storage layer of ${packName} (src/${packName}/defs/storage.py)
+
+This test suite validates:
+
+1. atomicWriteText replaces a file, keeps its mode and leaves no temporary files
+2. jsonTransaction writes changed data, skips unchanged data and writes nothing
+   when its block raises
+3. fileLock is re-entrant within a process
+4. fileLock serializes read-modify-write cycles of concurrent processes
+
+Every test works on files in a temporary directory, the project is not changed.
+\"\"\"
+
+import tempfile
+import os
+import sys
+import json
+import shlex
+import subprocess
+from pathlib import Path
+from textwrap import dedent
+from typing import Tuple
+
+
+class Colors:
+    \"\"\"ANSI color codes for terminal output\"\"\"
+
+    RED = "\\033[0;31m"
+    GREEN = "\\033[0;32m"
+    YELLOW = "\\033[1;33m"
+    BLUE = "\\033[0;34m"
+    MAGENTA = "\\033[35m"
+    NC = "\\033[0m"  # No Color
+
+
+class TestResult:
+    \"\"\"Class to track test results\"\"\"
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.tests = []
+
+    def add_result(self, test_name: str, passed: bool, message: str = ""):
+        self.tests.append((test_name, passed, message))
+        if passed:
+            self.passed += 1
+            print_pass(f"{test_name}: {message}")
+        else:
+            self.failed += 1
+            print_fail(f"{test_name}: {message}")
+
+    def print_summary(self):
+        total = self.passed + self.failed
+        print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+        print(f"{Colors.BLUE}TEST SUMMARY{Colors.NC}")
+        print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+        print(f"Total tests: {total}")
+        print(f"{Colors.GREEN}Passed: {self.passed}{Colors.NC}")
+        print(f"{Colors.RED}Failed: {self.failed}{Colors.NC}")
+
+        if self.failed > 0:
+            print(f"{Colors.RED}FAILED TESTS:{Colors.NC}")
+            for test_name, passed, message in self.tests:
+                if not passed:
+                    print(f"  - {test_name}: {message}")
+
+        success_rate = (self.passed / total * 100) if total > 0 else 0
+        print(f"Success rate: {success_rate:.1f}%")
+        return self.failed == 0
+
+
+def print_test(message: str):
+    \"\"\"Print test status message\"\"\"
+    print(f"{Colors.BLUE}[TEST]{Colors.NC} {message}")
+
+
+def print_pass(message: str):
+    \"\"\"Print pass message\"\"\"
+    print(f"{Colors.GREEN}[PASS]{Colors.NC} {message}")
+
+
+def print_fail(message: str):
+    \"\"\"Print fail message\"\"\"
+    print(f"{Colors.RED}[FAIL]{Colors.NC} {message}")
+
+
+def print_info(message: str):
+    \"\"\"Print info message\"\"\"
+    print(f"{Colors.YELLOW}[INFO]{Colors.NC} {message}")
+
+
+def python_command(code: str, *args: str) -> str:
+    \"\"\"Shell command running code with the project's Python in its virtual environment\"\"\"
+    project_dir = Path(__file__).parent.parent
+    python_cmd = f"python -c {shlex.quote(dedent(code))} " + " ".join(shlex.quote(str(arg)) for arg in args)
+    return f"cd {project_dir} && source env/${packName}/bin/activate && {python_cmd}"
+
+
+def run_python(code: str, *args: str) -> Tuple[int, str, str]:
+    \"\"\"Run code in a new process and return (returncode, stdout, stderr)\"\"\"
+    try:
+        result = subprocess.run(
+            python_command(code, *args),
+            shell=True,
+            text=True,
+            capture_output=True,
+            executable="/bin/bash",
+            timeout=60,
+        )
+        return result.returncode, result.stdout, result.stderr
+    except Exception as e:
+        return 1, "", str(e)
+
+
+def start_python(code: str, *args: str) -> subprocess.Popen:
+    \"\"\"Start code in a new process without waiting for it\"\"\"
+    return subprocess.Popen(
+        python_command(code, *args),
+        shell=True,
+        text=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        executable="/bin/bash",
+    )
+
+
+def test_atomic_write_text(result: TestResult, test_dir: Path) -> bool:
+    \"\"\"Test 1: atomicWriteText replaces the file, keeps its mode and leaves no temporary files\"\"\"
+    print_test("Test 1: atomicWriteText")
+    file_name = test_dir / "atomic.txt"
+    file_name.write_text("old content")
+    os.chmod(file_name, 0o640)
+
+    returncode, stdout, stderr = run_python(
+        \"\"\"
+        import sys
+        from ${packName}.defs.storage import atomicWriteText
+        atomicWriteText(sys.argv[1], "new content")
+        \"\"\",
+        file_name,
+    )
+    content_ok = file_name.read_text() == "new content"
+    mode_ok = (file_name.stat().st_mode & 0o777) == 0o640
+    leftovers = [path.name for path in test_dir.iterdir() if path.name.endswith(".tmp")]
+
+    passed = returncode == 0 and content_ok and mode_ok and not leftovers
+    result.add_result(
+        "atomicWriteText",
+        passed,
+        "content replaced, mode kept, no temporary files"
+        if passed
+        else f"Failed - rc:{returncode}, content:{content_ok}, mode:{mode_ok}, leftovers:{leftovers} {stderr.strip()}",
+    )
+    return passed
+
+
+def test_json_transaction(result: TestResult, test_dir: Path) -> bool:
+    \"\"\"Test 2: jsonTransaction writes only changed data and nothing when the block raises\"\"\"
+    print_test("Test 2: jsonTransaction")
+    file_name = test_dir / "transaction.json"
+
+    returncode, stdout, stderr = run_python(
+        \"\"\"
+        import os, sys, json
+        from ${packName}.defs.storage import jsonTransaction
+        fileName = sys.argv[1]
+        with jsonTransaction(fileName, default={"count": 0}) as data:
+            data["count"] += 1
+        written = json.load(open(fileName)) == {"count": 1}
+        mtime = os.stat(fileName).st_mtime_ns
+        os.utime(fileName, ns=(mtime - 10**9, mtime - 10**9))
+        mtime = os.stat(fileName).st_mtime_ns
+        with jsonTransaction(fileName) as data:
+            pass
+        unchanged = os.stat(fileName).st_mtime_ns == mtime
+        try:
+            with jsonTransaction(fileName) as data:
+                data["count"] = 99
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        aborted = json.load(open(fileName)) == {"count": 1}
+        print(json.dumps({"written": written, "unchanged": unchanged, "aborted": aborted}))
+        \"\"\",
+        file_name,
+    )
+    try:
+        checks = json.loads(stdout.strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        checks = {}
+
+    passed = returncode == 0 and checks == {"written": True, "unchanged": True, "aborted": True}
+    result.add_result(
+        "jsonTransaction",
+        passed,
+        "changed data written, unchanged data and aborted blocks not written"
+        if passed
+        else f"Failed - rc:{returncode}, checks:{checks} {stderr.strip()}",
+    )
+    return passed
+
+
+def test_file_lock_reentrant(result: TestResult, test_dir: Path) -> bool:
+    \"\"\"Test 3: nested fileLock calls for the same file in one process do not deadlock\"\"\"
+    print_test("Test 3: fileLock re-entrant")
+    file_name = test_dir / "reentrant.json"
+
+    returncode, stdout, stderr = run_python(
+        \"\"\"
+        import sys
+        from ${packName}.defs.storage import fileLock, jsonTransaction
+        with fileLock(sys.argv[1]):
+            with jsonTransaction(sys.argv[1]) as data:
+                data["nested"] = True
+        print("done")
+        \"\"\",
+        file_name,
+    )
+    passed = returncode == 0 and "done" in stdout and json.loads(file_name.read_text()) == {"nested": True}
+    result.add_result(
+        "fileLock re-entrant",
+        passed,
+        "nested lock taken and released" if passed else f"Failed - rc:{returncode} {stderr.strip()}",
+    )
+    return passed
+
+
+def test_file_lock_processes(result: TestResult, test_dir: Path) -> bool:
+    \"\"\"Test 4: concurrent processes incrementing one counter lose no update\"\"\"
+    print_test("Test 4: fileLock across processes")
+    file_name = test_dir / "counter.json"
+    process_count, increments = 4, 25
+
+    workers = [
+        start_python(
+            \"\"\"
+            import sys
+            from ${packName}.defs.storage import jsonTransaction
+            for _ in range(int(sys.argv[2])):
+                with jsonTransaction(sys.argv[1], default={"count": 0}) as data:
+                    data["count"] += 1
+            \"\"\",
+            file_name,
+            increments,
+        )
+        for _ in range(process_count)
+    ]
+    returncodes = [worker.wait(timeout=120) for worker in workers]
+    count = json.loads(file_name.read_text()).get("count")
+
+    passed = returncodes == [0] * process_count and count == process_count * increments
+    result.add_result(
+        "fileLock across processes",
+        passed,
+        f"{process_count} processes counted to {count}"
+        if passed
+        else f"Failed - returncodes:{returncodes}, count:{count}, expected:{process_count * increments}",
+    )
+    return passed
+
+
+def main():
+    \"\"\"Run all tests\"\"\"
+    print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+    print(f"{Colors.BLUE}Storage Round Trip Test Suite{Colors.NC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+
+    result = TestResult()
+
+    tests = [
+        test_atomic_write_text,
+        test_json_transaction,
+        test_file_lock_reentrant,
+        test_file_lock_processes,
+    ]
+
+    with tempfile.TemporaryDirectory() as test_dir:
+        for test_func in tests:
+            try:
+                test_func(result, Path(test_dir))
+            except Exception as e:
+                result.add_result(test_func.__name__, False, f"exception: {e}")
+
+    success = result.print_summary()
+
+    if success:
+        print(f"{Colors.GREEN}All tests passed! The storage layer is working correctly.{Colors.NC}")
+        sys.exit(0)
+    else:
+        print(f"{Colors.RED}Some tests failed. Please check the implementation.{Colors.NC}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+"""))
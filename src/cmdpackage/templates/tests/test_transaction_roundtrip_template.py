@@ -0,0 +1,319 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from textwrap import dedent
+from string import Template
+
+test_transaction_roundtrip_template = Template(dedent("""#!/usr/bin/env python3
+\"\"\"
+Test script for CommandManager.transaction() of ${packName}
+
+This test suite validates that:
+
+1. A transaction whose block raises leaves commands.json, .cmdrc and the
+   command files unchanged on disk, and drops the staged changes from memory
+2. A transaction whose block completes writes all of its changes together
+
+A test command is created with newCmd and modCmd first and removed with rmCmd
+at the end.
+\"\"\"
+
+import os
+import sys
+import json
+import shlex
+import subprocess
+from pathlib import Path
+from textwrap import dedent
+from typing import Tuple
+
+
+class Colors:
+    \"\"\"ANSI color codes for terminal output\"\"\"
+
+    RED = "\\033[0;31m"
+    GREEN = "\\033[0;32m"
+    YELLOW = "\\033[1;33m"
+    BLUE = "\\033[0;34m"
+    MAGENTA = "\\033[35m"
+    NC = "\\033[0m"  # No Color
+
+
+class TestResult:
+    \"\"\"Class to track test results\"\"\"
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.tests = []
+
+    def add_result(self, test_name: str, passed: bool, message: str = ""):
+        self.tests.append((test_name, passed, message))
+        if passed:
+            self.passed += 1
+            print_pass(f"{test_name}: {message}")
+        else:
+            self.failed += 1
+            print_fail(f"{test_name}: {message}")
+
+    def print_summary(self):
+        total = self.passed + self.failed
+        print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+        print(f"{Colors.BLUE}TEST SUMMARY{Colors.NC}")
+        print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+        print(f"Total tests: {total}")
+        print(f"{Colors.GREEN}Passed: {self.passed}{Colors.NC}")
+        print(f"{Colors.RED}Failed: {self.failed}{Colors.NC}")
+
+        if self.failed > 0:
+            print(f"{Colors.RED}FAILED TESTS:{Colors.NC}")
+            for test_name, passed, message in self.tests:
+                if not passed:
+                    print(f"  - {test_name}: {message}")
+
+        success_rate = (self.passed / total * 100) if total > 0 else 0
+        print(f"Success rate: {success_rate:.1f}%")
+        return self.failed == 0
+
+
+def print_test(message: str):
+    \"\"\"Print test status message\"\"\"
+    print(f"{Colors.BLUE}[TEST]{Colors.NC} {message}")
+
+
+def print_pass(message: str):
+    \"\"\"Print pass message\"\"\"
+    print(f"{Colors.GREEN}[PASS]{Colors.NC} {message}")
+
+
+def print_fail(message: str):
+    \"\"\"Print fail message\"\"\"
+    print(f"{Colors.RED}[FAIL]{Colors.NC} {message}")
+
+
+def print_info(message: str):
+    \"\"\"Print info message\"\"\"
+    print(f"{Colors.YELLOW}[INFO]{Colors.NC} {message}")
+
+
+def python_command(code: str, *args: str) -> str:
+    \"\"\"Shell command running code with the project's Python in its virtual environment\"\"\"
+    project_dir = Path(__file__).parent.parent
+    python_cmd = f"python -c {shlex.quote(dedent(code))} " + " ".join(shlex.quote(str(arg)) for arg in args)
+    return f"cd {project_dir} && source env/${packName}/bin/activate && {python_cmd}"
+
+
+def run_python(code: str, *args: str) -> Tuple[int, str, str]:
+    \"\"\"Run code in a new process and return (returncode, stdout, stderr)\"\"\"
+    try:
+        result = subprocess.run(
+            python_command(code, *args),
+            shell=True,
+            text=True,
+            capture_output=True,
+            executable="/bin/bash",
+            timeout=60,
+        )
+        return result.returncode, result.stdout, result.stderr
+    except Exception as e:
+        return 1, "", str(e)
+
+
+def start_python(code: str, *args: str) -> subprocess.Popen:
+    \"\"\"Start code in a new process without waiting for it\"\"\"
+    return subprocess.Popen(
+        python_command(code, *args),
+        shell=True,
+        text=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        executable="/bin/bash",
+    )
+
+
+TEST_CMD = "testTxnCmd01"
+NEW_FILE_CMD = "testTxnCmd02"
+
+
+def run_command(cmd: str, input_text: str = "") -> Tuple[int, str, str]:
+    \"\"\"Run a ${packName} command line and return (returncode, stdout, stderr)\"\"\"
+    try:
+        project_dir = Path(__file__).parent.parent
+        result = subprocess.run(
+            f"cd {project_dir} && source env/${packName}/bin/activate && {cmd}",
+            shell=True,
+            input=input_text,
+            text=True,
+            capture_output=True,
+            executable="/bin/bash",
+            timeout=60,
+        )
+        return result.returncode, result.stdout, result.stderr
+    except Exception as e:
+        return 1, "", str(e)
+
+
+def commands_dir() -> Path:
+    \"\"\"Directory holding commands.json, .cmdrc and the command files\"\"\"
+    return Path(__file__).parent.parent / "src" / "${packName}" / "commands"
+
+
+def snapshot() -> dict:
+    \"\"\"Content of commands.json, .cmdrc and every command file\"\"\"
+    files = {}
+    for path in sorted(commands_dir().iterdir()):
+        if path.name in ("commands.json", ".cmdrc") or path.suffix == ".py":
+            files[path.name] = path.read_bytes()
+    return files
+
+
+def snapshot_changes(before: dict, after: dict) -> list:
+    \"\"\"Names of the files that were added, removed or changed\"\"\"
+    return sorted(name for name in before.keys() | after.keys() if before.get(name) != after.get(name))
+
+
+# Edits made inside the transaction by both tests: a new argument, option and
+# .cmdrc flag for TEST_CMD, a rewritten TEST_CMD file and a new command file.
+TRANSACTION_CODE = \"\"\"
+    import sys, json
+    from ${packName}.classes.CommandManager import command_manager
+    cmdName, newFileCmd, abort = sys.argv[1], sys.argv[2], sys.argv[3] == "abort"
+    try:
+        with command_manager.transaction():
+            command_manager.add_argument(cmdName, "txnArg", "Argument added in a transaction")
+            command_manager.add_option_switch(cmdName, "txnFlag", "Flag added in a transaction")
+            command_manager.add_cmdrc_flag(cmdName, "txnFlag", True, True)
+            command_manager.remove_cmdrc_flag(cmdName, "verbose")
+            source = command_manager.read_command_file(cmdName)
+            command_manager.write_command_file(cmdName, source + "# edited in a transaction" + chr(10))
+            command_manager.write_command_file(newFileCmd, "# new command file" + chr(10))
+            if abort:
+                raise RuntimeError("abort the transaction")
+    except RuntimeError:
+        pass
+    cmdData = command_manager.get_command_data(cmdName)
+    cmdrcData = command_manager.get_cmdrc_data()["commands"].get(cmdName, {})
+    print(json.dumps({
+        "txnArg": "txnArg" in cmdData.get("arguments", {}),
+        "txnFlag": "txnFlag" in cmdData.get("option_switches", {}),
+        "cmdrcTxnFlag": "txnFlag" in cmdrcData.get("option_switches", {}),
+        "cmdrcVerbose": "verbose" in cmdrcData.get("option_switches", {}),
+    }))
+\"\"\"
+
+
+def run_transaction(mode: str) -> Tuple[int, dict, str]:
+    \"\"\"Run TRANSACTION_CODE in a new process, mode is abort or commit\"\"\"
+    returncode, stdout, stderr = run_python(TRANSACTION_CODE, TEST_CMD, NEW_FILE_CMD, mode)
+    try:
+        state = json.loads(stdout.strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        state = {}
+    return returncode, state, stderr
+
+
+def cleanup_test_commands():
+    \"\"\"Remove the test commands and files left by an earlier run\"\"\"
+    print_info("Cleaning up any existing test commands...")
+    for cmd in (TEST_CMD, NEW_FILE_CMD):
+        run_command(f"${packName} rmCmd {cmd}", "y\\n")
+        cmd_file = commands_dir() / f"{cmd}.py"
+        if cmd_file.exists():
+            cmd_file.unlink()
+
+
+def test_create_command(result: TestResult) -> bool:
+    \"\"\"Test 1: Create the test command with an argument and a stored switch option\"\"\"
+    print_test("Test 1: Create test command")
+    run_command(f"${packName} newCmd {TEST_CMD} arg1", "Transaction test command\\nFirst argument\\n")
+    run_command(f"${packName} modCmd {TEST_CMD} -verbose", "Verbose output flag\\n")
+
+    cmdrc = json.loads((commands_dir() / ".cmdrc").read_text())
+    verbose_stored = "verbose" in cmdrc.get("commands", {}).get(TEST_CMD, {}).get("option_switches", {})
+    file_ok = (commands_dir() / f"{TEST_CMD}.py").exists()
+
+    passed = verbose_stored and file_ok
+    result.add_result(
+        "Create command",
+        passed,
+        f"{TEST_CMD} created" if passed else f"Failed - file:{file_ok}, verbose_stored:{verbose_stored}",
+    )
+    return passed
+
+
+def test_aborted_transaction(result: TestResult) -> bool:
+    \"\"\"Test 2: A transaction whose block raises changes nothing\"\"\"
+    print_test("Test 2: Aborted transaction")
+    before = snapshot()
+    returncode, state, stderr = run_transaction("abort")
+    changed = snapshot_changes(before, snapshot())
+    no_staged_state = state == {"txnArg": False, "txnFlag": False, "cmdrcTxnFlag": False, "cmdrcVerbose": True}
+
+    passed = returncode == 0 and not changed and no_staged_state
+    result.add_result(
+        "Aborted transaction",
+        passed,
+        "commands.json, .cmdrc and command files unchanged, staged changes dropped"
+        if passed
+        else f"Failed - rc:{returncode}, changed files:{changed}, state after abort:{state} {stderr.strip()}",
+    )
+    return passed
+
+
+def test_committed_transaction(result: TestResult) -> bool:
+    \"\"\"Test 3: A transaction whose block completes writes every change\"\"\"
+    print_test("Test 3: Committed transaction")
+    before = snapshot()
+    returncode, state, stderr = run_transaction("commit")
+    changed = snapshot_changes(before, snapshot())
+    expected_changes = sorted(["commands.json", ".cmdrc", f"{TEST_CMD}.py", f"{NEW_FILE_CMD}.py"])
+    all_written = state == {"txnArg": True, "txnFlag": True, "cmdrcTxnFlag": True, "cmdrcVerbose": False}
+
+    passed = returncode == 0 and changed == expected_changes and all_written
+    result.add_result(
+        "Committed transaction",
+        passed,
+        f"written together: {', '.join(changed)}"
+        if passed
+        else f"Failed - rc:{returncode}, changed files:{changed}, state after commit:{state} {stderr.strip()}",
+    )
+    return passed
+
+
+def main():
+    \"\"\"Run all tests\"\"\"
+    print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+    print(f"{Colors.BLUE}CommandManager Transaction Round Trip Test Suite{Colors.NC}")
+    print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
+
+    result = TestResult()
+
+    cleanup_test_commands()
+
+    tests = [
+        test_create_command,
+        test_aborted_transaction,
+        test_committed_transaction,
+    ]
+
+    for test_func in tests:
+        try:
+            if not test_func(result):
+                print_fail(f"Test {test_func.__name__} failed, continuing with remaining tests...")
+        except Exception as e:
+            result.add_result(test_func.__name__, False, f"exception: {e}")
+
+    cleanup_test_commands()
+
+    success = result.print_summary()
+
+    if success:
+        print(f"{Colors.GREEN}All tests passed! CommandManager transactions are working correctly.{Colors.NC}")
+        sys.exit(0)
+    else:
+        print(f"{Colors.RED}Some tests failed. Please check the implementation.{Colors.NC}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+"""))